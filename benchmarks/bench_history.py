@@ -0,0 +1,33 @@
+"""Cost of appending to a history buffer and consuming it into the state, as a long router loop does.
+
+Reports microseconds per update + consume at several history lengths. Appends share the buffer's item list, so
+what remains linear in the length is the single list copy each consumption hands the state:
+
+    python benchmarks/bench_history.py
+"""
+
+import json
+import time
+from typing import Dict
+
+from primeGraph.buffer.history import HistoryBuffer
+
+
+def per_append_us(length: int, appends: int = 1000) -> float:
+  buffer = HistoryBuffer("log", str)
+  buffer.set_value(["entry"] * length)
+  started = time.perf_counter()
+  for i in range(appends):
+    buffer.update("entry", f"exec-{i}")
+    buffer.consume_last_value()
+  return (time.perf_counter() - started) / appends * 1e6
+
+
+def main() -> Dict[str, float]:
+  results = {f"length_{length}": per_append_us(length) for length in (100, 10_000, 100_000)}
+  print(json.dumps(results, indent=2))
+  return results
+
+
+if __name__ == "__main__":
+  main()
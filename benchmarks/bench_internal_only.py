@@ -0,0 +1,115 @@
+"""Cost of the `internal_only` guard, per call and per node.
+
+Times the guard against the previous implementation (which called `inspect.stack()` on every call) at
+several stack depths, then reports the per-node overhead of the sync and async engines on a sequential
+chain of no-op nodes and how much of it the previous guard would add:
+
+    python benchmarks/bench_internal_only.py
+"""
+
+import inspect
+import json
+import logging
+import sys
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Tuple
+
+from primeGraph.bench import run_benchmark
+from primeGraph.graph.executable import Graph
+from primeGraph.utils.class_utils import internal_only
+
+CALLS = 500
+
+
+def stack_inspecting_guard(func: Callable[..., Any]) -> Callable[..., Any]:
+  """The guard as it was: builds the frame info (with source lines) of the whole stack on every call."""
+
+  @wraps(func)
+  def wrapper(*args: Any, **kwargs: Any) -> Any:
+    stack = inspect.stack()
+    caller_self = stack[1].frame.f_locals.get("self", None)
+    if caller_self is not None and caller_self is args[0]:
+      return func(*args, **kwargs)
+    raise RuntimeError(f"Method {func.__name__} can only be called internally")
+
+  return wrapper
+
+
+class Owner:
+  @internal_only
+  def guarded(self) -> None:
+    pass
+
+  @stack_inspecting_guard
+  def guarded_before(self) -> None:
+    pass
+
+  def call(self, method: Callable[[], None], depth: int) -> float:
+    """Call `method` CALLS times from `depth` frames down and return the microseconds per call."""
+    if depth > 0:
+      return self.call(method, depth - 1)
+    started = time.perf_counter()
+    for _ in range(CALLS):
+      method()
+    return (time.perf_counter() - started) / CALLS * 1e6
+
+
+def stack_depth() -> int:
+  frame, depth = sys._getframe(1), 0
+  while frame is not None:
+    frame, depth = frame.f_back, depth + 1  # type: ignore[assignment]
+  return depth
+
+
+def guarded_calls(engine: str) -> Tuple[float, int]:
+  """How many guarded methods the engine calls per node run, and the median stack depth of those calls."""
+  guard_code = Owner.guarded.__code__
+  depths: List[int] = []
+  originals: Dict[str, Any] = {}
+  for name, attribute in list(vars(Graph).items()):
+    if getattr(attribute, "__code__", None) is guard_code:
+      originals[name] = attribute
+
+      def counting(*args: Any, _method: Any = attribute.__wrapped__, **kwargs: Any) -> Any:
+        depths.append(stack_depth())
+        return _method(*args, **kwargs)
+
+      setattr(Graph, name, internal_only(counting))
+  try:
+    result = run_benchmark("sequential", engine, "noop", size=50, runs=1)
+  finally:
+    for name, attribute in originals.items():
+      setattr(Graph, name, attribute)
+  # the warm-up run and graph construction call them too
+  return len(depths) / 2 / result["nodes_per_run"], sorted(depths)[len(depths) // 2]
+
+
+def main() -> Dict[str, Any]:
+  owner = Owner()
+  guard = {
+    f"depth_{depth}": {
+      "us_per_call": owner.call(owner.guarded, depth),
+      "us_per_call_before": owner.call(owner.guarded_before, depth),
+    }
+    for depth in (10, 30, 60)
+  }
+  engines = {}
+  for engine in ("sync", "async"):
+    result = run_benchmark("sequential", engine, "noop", size=200, runs=5)
+    calls, depth = guarded_calls(engine)
+    saved = owner.call(owner.guarded_before, depth) - owner.call(owner.guarded, depth)
+    engines[engine] = {
+      "overhead_us_per_node": result["overhead_us_per_node"],
+      "guarded_calls_per_node": calls,
+      "guarded_call_depth": depth,
+      "saved_us_per_node": calls * saved,
+    }
+  results = {"guard": guard, "engines": engines}
+  print(json.dumps(results, indent=2))
+  return results
+
+
+if __name__ == "__main__":
+  logging.disable(logging.CRITICAL)
+  main()
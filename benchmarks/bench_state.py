@@ -0,0 +1,82 @@
+"""Cost of GraphState instantiation, attribute assignment and JSON round trips on large states.
+
+Builds a state class with many buffer fields (histories of dicts and lists, scalar last values) and
+reports microseconds per operation. Only the public `GraphState` API is used, so the script can be run
+against any revision:
+
+    python benchmarks/bench_state.py
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, List, Type
+
+from pydantic import create_model
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.models.state import GraphState
+
+
+def build_state_class(n_fields: int) -> Type[GraphState]:
+  fields: Dict[str, Any] = {}
+  for i in range(n_fields):
+    kind = i % 3
+    if kind == 0:
+      fields[f"history_{i}"] = (History[Dict[str, int]], ...)
+    elif kind == 1:
+      fields[f"rows_{i}"] = (LastValue[List[int]], ...)
+    else:
+      fields[f"value_{i}"] = (LastValue[str], ...)
+  return create_model(f"LargeState{n_fields}", __base__=GraphState, **fields)  # type: ignore[call-overload]
+
+
+def build_values(state_class: Type[GraphState], items: int) -> Dict[str, Any]:
+  values: Dict[str, Any] = {}
+  for name in state_class.model_fields:
+    if name.startswith("history_"):
+      values[name] = [{"step": i, "count": i * 2} for i in range(items)]
+    elif name.startswith("rows_"):
+      values[name] = list(range(items))
+    elif name.startswith("value_"):
+      values[name] = "x" * 32
+  return values
+
+
+def per_call_us(fn: Callable[[], Any], calls: int) -> float:
+  fn()  # warm up (and build any per-class caches)
+  started = time.perf_counter()
+  for _ in range(calls):
+    fn()
+  return (time.perf_counter() - started) / calls * 1e6
+
+
+def measure(n_fields: int, items: int, calls: int) -> Dict[str, float]:
+  state_class = build_state_class(n_fields)
+  values = build_values(state_class, items)
+  state = state_class(**values)
+  payload = state.model_dump_json()
+  field_names = [name for name in state_class.model_fields if name.startswith("value_")]
+
+  def assign_fields() -> None:
+    for name in field_names:
+      setattr(state, name, "y" * 32)
+
+  return {
+    "instantiate_us": per_call_us(lambda: state_class(**values), calls),
+    "validate_json_us": per_call_us(lambda: state_class.model_validate_json(payload), calls),
+    "setattr_us": per_call_us(assign_fields, calls) / len(field_names),
+  }
+
+
+def main() -> Dict[str, Dict[str, float]]:
+  results = {
+    "fields_30_items_10": measure(30, 10, calls=500),
+    "fields_300_items_10": measure(300, 10, calls=50),
+    "fields_30_items_1000": measure(30, 1000, calls=50),
+  }
+  print(json.dumps(results, indent=2))
+  return results
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,101 @@
+"""Per-node scheduling overhead of the sync engine.
+
+Runs a sequential chain and a wide parallel group of no-op nodes and reports the average wall time
+spent per node, plus a parallel group wider than the pool whose nodes sleep, which only finishes in
+(width / pool workers) rounds if the branches the pool cannot start right away still run at pool width.
+Only the public `Graph` API is used, so the script can be run against any revision:
+
+    python benchmarks/bench_worker_pool.py
+"""
+
+import functools
+import json
+import threading
+import time
+from typing import Callable, Dict
+
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+
+
+def build_sequential(n_nodes: int) -> Graph:
+  graph = Graph()
+  previous = START
+  for i in range(n_nodes):
+
+    def action() -> None:
+      pass
+
+    graph.node(name=f"node_{i}")(action)
+    graph.add_edge(previous, f"node_{i}")
+    previous = f"node_{i}"
+  graph.add_edge(previous, END)
+  return graph.compile()
+
+
+def build_parallel(width: int, sleep: float = 0) -> Graph:
+  graph = Graph()
+
+  @graph.node()
+  def fan_out() -> None:
+    pass
+
+  @graph.node()
+  def fan_in() -> None:
+    pass
+
+  graph.add_edge(START, "fan_out")
+  for i in range(width):
+
+    def action() -> None:
+      if sleep:
+        time.sleep(sleep)
+
+    graph.node(name=f"branch_{i}")(action)
+    graph.add_edge("fan_out", f"branch_{i}")
+    graph.add_edge(f"branch_{i}", "fan_in")
+  graph.add_edge("fan_in", END)
+  return graph.compile()
+
+
+_threads_started = 0
+_original_thread_start = threading.Thread.start
+
+
+def _counting_thread_start(self: threading.Thread) -> None:
+  global _threads_started  # noqa: PLW0603
+  _threads_started += 1
+  _original_thread_start(self)
+
+
+def measure(build: Callable[[int], Graph], size: int, n_nodes: int, runs: int) -> Dict[str, float]:
+  global _threads_started  # noqa: PLW0603
+  graph = build(size)
+  graph.start()  # warm up
+  _threads_started = 0
+  started = time.perf_counter()
+  for _ in range(runs):
+    graph.start()
+  elapsed = time.perf_counter() - started
+  return {
+    "us_per_node": elapsed / (runs * n_nodes) * 1e6,
+    "threads_started_per_run": _threads_started / runs,
+  }
+
+
+def main() -> Dict[str, Dict[str, float]]:
+  threading.Thread.start = _counting_thread_start  # type: ignore
+  results = {
+    "sequential_50": measure(build_sequential, 50, 50, runs=20),
+    "parallel_50": measure(build_parallel, 50, 52, runs=20),
+    "parallel_sleeping_100": measure(functools.partial(build_parallel, sleep=0.01), 100, 102, runs=5),
+  }
+  print(json.dumps(results, indent=2))
+  return results
+
+
+if __name__ == "__main__":
+  import logging
+
+  logging.disable(logging.CRITICAL)
+  main()
@@ -0,0 +1,47 @@
+"""Compare two JSON reports of `python -m primeGraph.bench` and gate on regressions.
+
+Prints the change in throughput and p99 chain latency of every benchmark present in both reports and
+exits with status 1 if any of them regressed by more than the tolerance, e.g. in CI:
+
+    git checkout main && python -m primeGraph.bench -o base.json
+    git checkout my-branch && python -m primeGraph.bench -o head.json
+    python benchmarks/compare_reports.py base.json head.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import sys
+
+from primeGraph.bench import find_regressions
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+  parser.add_argument("baseline")
+  parser.add_argument("report")
+  parser.add_argument("--tolerance", type=float, default=0.25)
+  args = parser.parse_args()
+  with open(args.baseline) as f:
+    baseline = json.load(f)
+  with open(args.report) as f:
+    report = json.load(f)
+
+  previous = {(r["scenario"], r["engine"], r["workload"], r["size"]): r for r in baseline["results"]}
+  print(f"{'benchmark':<32} {'nodes/s':>10} {'change':>8} {'p99 ms':>10} {'change':>8}")
+  for result in report["results"]:
+    before = previous.get((result["scenario"], result["engine"], result["workload"], result["size"]))
+    if before is None:
+      continue
+    name = f"{result['scenario']}/{result['engine']}/{result['workload']}"
+    throughput = result["nodes_per_sec"] / before["nodes_per_sec"] - 1
+    latency = result["p99_ms"] / before["p99_ms"] - 1
+    print(f"{name:<32} {result['nodes_per_sec']:>10.0f} {throughput:>+8.1%} {result['p99_ms']:>10.2f} {latency:>+8.1%}")
+
+  regressions = find_regressions(report, baseline, args.tolerance)
+  for regression in regressions:
+    print(f"regression: {regression}", file=sys.stderr)
+  return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,337 @@
+"""Benchmarks of the graph engines on synthetic graphs, reported as JSON.
+
+    python -m primeGraph.bench                      # every scenario, both engines, no-op and sleeping nodes
+    python -m primeGraph.bench --quick -o run.json  # small sizes, results also written to run.json
+    python -m primeGraph.bench --baseline base.json --tolerance 0.25
+
+Each result reports nodes/sec, the engine overhead per node (chain latency minus the time the nodes spend
+sleeping on the critical path, divided by the nodes run), p50/p99 chain latency, compile time, checkpoint
+save latency (with --checkpoints) and the peak RSS of the process so far. With --baseline, the exit status
+is 1 when a result's throughput or p99 latency is more than --tolerance worse than in the baseline file.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import resource
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from primeGraph.buffer.factory import LastValue
+from primeGraph.checkpoint.local_storage import LocalStorage
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.metrics import MetricsRegistry
+from primeGraph.models.state import GraphState
+
+SLEEP = 0.001  # duration of a node of the "sleep" workload
+
+
+class BenchState(GraphState):
+  iterations: LastValue[int]
+
+
+class Scenario(NamedTuple):
+  graph: Graph
+  critical_path: int  # nodes run one after the other on the longest path, for the sleep time per chain
+
+
+class Workload:
+  """Builds the node actions of a scenario: no-op nodes or nodes sleeping SLEEP seconds."""
+
+  def __init__(self, name: str, use_async: bool):
+    if name not in WORKLOADS:
+      raise ValueError(f"Unknown workload: {name}")
+    self.name = name
+    self.use_async = use_async
+
+  def add_node(self, graph: Graph, name: str, update: Optional[Callable[[Any], Dict[str, Any]]] = None) -> None:
+    """Add a node returning `update(state)` (no updates by default)."""
+    sleep = self.name == "sleep"
+
+    async def async_action(state: Any) -> Dict[str, Any]:
+      if sleep:
+        await asyncio.sleep(SLEEP)
+      return update(state) if update else {}
+
+    def sync_action(state: Any) -> Dict[str, Any]:
+      if sleep:
+        time.sleep(SLEEP)
+      return update(state) if update else {}
+
+    graph.node(name=name)(async_action if self.use_async else sync_action)
+
+
+def new_graph(checkpoints: bool, registry: Optional[MetricsRegistry] = None) -> Graph:
+  return Graph(
+    state=BenchState(iterations=0),  # type: ignore[arg-type]
+    checkpoint_storage=LocalStorage() if checkpoints else None,
+    metrics=registry,
+  )
+
+
+def build_sequential(graph: Graph, workload: Workload, size: int) -> Scenario:
+  """A chain of `size` nodes."""
+  previous = START
+  for i in range(size):
+    workload.add_node(graph, f"step_{i}")
+    graph.add_edge(previous, f"step_{i}")
+    previous = f"step_{i}"
+  graph.add_edge(previous, END)
+  return Scenario(graph.compile(), size)
+
+
+def build_parallel(graph: Graph, workload: Workload, size: int) -> Scenario:
+  """A fan-out into `size` parallel branches joined by a single node."""
+  workload.add_node(graph, "fan_out")
+  workload.add_node(graph, "fan_in")
+  graph.add_edge(START, "fan_out")
+  for i in range(size):
+    workload.add_node(graph, f"branch_{i}")
+    graph.add_edge("fan_out", f"branch_{i}")
+    graph.add_edge(f"branch_{i}", "fan_in")
+  graph.add_edge("fan_in", END)
+  return Scenario(graph.compile(), 3)
+
+
+def build_nested(graph: Graph, workload: Workload, size: int) -> Scenario:
+  """`size` parallel branches that each fan out again into two leaves before the join."""
+  workload.add_node(graph, "fan_out")
+  workload.add_node(graph, "fan_in")
+  graph.add_edge(START, "fan_out")
+  for i in range(size):
+    workload.add_node(graph, f"branch_{i}")
+    graph.add_edge("fan_out", f"branch_{i}")
+    for j in range(2):
+      workload.add_node(graph, f"leaf_{i}_{j}")
+      graph.add_edge(f"branch_{i}", f"leaf_{i}_{j}")
+      graph.add_edge(f"leaf_{i}_{j}", "fan_in")
+  graph.add_edge("fan_in", END)
+  return Scenario(graph.compile(), 4)
+
+
+def build_router_loop(graph: Graph, workload: Workload, size: int) -> Scenario:
+  """A node looping back through a router `size` times."""
+  workload.add_node(graph, "increment", lambda state: {"iterations": state.iterations + 1})
+
+  @graph.node()
+  def check(state: BenchState) -> str:
+    if state.iterations < size:  # type: ignore[operator]
+      return "increment"
+    return "finish"
+
+  workload.add_node(graph, "setup")
+  workload.add_node(graph, "finish")
+  graph.add_edge(START, "setup")
+  graph.add_edge("setup", "increment")
+  graph.add_router_edge("increment", "check")
+  graph.add_edge("finish", END)
+  return Scenario(graph.compile(), size + 2)
+
+
+def build_subgraphs(graph: Graph, workload: Workload, size: int) -> Scenario:
+  """A chain of `size` merged subgraphs of two nodes each."""
+  previous = START
+  for i in range(size):
+
+    def subgraph(i: int = i) -> Graph:
+      inner = Graph(state=graph.initial_state)
+      workload.add_node(inner, f"sub_{i}_a")
+      workload.add_node(inner, f"sub_{i}_b")
+      inner.add_edge(START, f"sub_{i}_a")
+      inner.add_edge(f"sub_{i}_a", f"sub_{i}_b")
+      inner.add_edge(f"sub_{i}_b", END)
+      return inner
+
+    graph.subgraph(name=f"subgraph_{i}")(subgraph)  # type: ignore[call-arg]
+    graph.add_edge(previous, f"subgraph_{i}")
+    previous = f"subgraph_{i}"
+  graph.add_edge(previous, END)
+  return Scenario(graph.compile(), 2 * size)
+
+
+def build_repeated(graph: Graph, workload: Workload, size: int) -> Scenario:
+  """A node repeated `size` times in parallel through a repeating edge."""
+  workload.add_node(graph, "setup")
+  workload.add_node(graph, "work")
+  workload.add_node(graph, "finish")
+  graph.add_edge(START, "setup")
+  graph.add_repeating_edge("setup", "work", "finish", repeat=size, parallel=True)
+  graph.add_edge("finish", END)
+  return Scenario(graph.compile(), 3)
+
+
+SCENARIOS: Dict[str, Callable[[Graph, Workload, int], Scenario]] = {
+  "sequential": build_sequential,
+  "parallel": build_parallel,
+  "nested": build_nested,
+  "router_loop": build_router_loop,
+  "subgraphs": build_subgraphs,
+  "repeated": build_repeated,
+}
+SIZES = {"sequential": 200, "parallel": 64, "nested": 16, "router_loop": 100, "subgraphs": 25, "repeated": 32}
+QUICK_SIZES = {"sequential": 20, "parallel": 8, "nested": 4, "router_loop": 10, "subgraphs": 4, "repeated": 4}
+ENGINES = ("sync", "async")
+WORKLOADS = ("noop", "sleep")
+
+
+def peak_rss_mb() -> float:
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # kilobytes on Linux, bytes on macOS
+  return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values: Sequence[float], quantile: float) -> float:
+  ordered = sorted(values)
+  return ordered[max(0, math.ceil(quantile * len(ordered)) - 1)]
+
+
+def run_chains(graph: Graph, engine: str, runs: int) -> List[float]:
+  """Run `runs` chains one after the other, each on a fresh context, and return their latencies in seconds."""
+
+  def timed_sync() -> float:
+    context = graph.new_context()
+    started = time.perf_counter()
+    graph.start(context=context)
+    return time.perf_counter() - started
+
+  if engine == "sync":
+    return [timed_sync() for _ in range(runs)]
+
+  async def run_all() -> List[float]:
+    latencies = []
+    for _ in range(runs):
+      context = graph.new_context()
+      started = time.perf_counter()
+      await graph.start_async(context=context)
+      latencies.append(time.perf_counter() - started)
+    return latencies
+
+  return asyncio.run(run_all())
+
+
+def run_benchmark(  # noqa: PLR0913
+  scenario: str, engine: str, workload: str, size: int, runs: int, *, checkpoints: bool = False
+) -> Dict[str, Any]:
+  """Build one scenario, run it `runs` times and return its measurements."""
+  if engine not in ENGINES:
+    raise ValueError(f"Unknown engine: {engine}")
+  registry = MetricsRegistry()  # counts the nodes actually run, router loop iterations included
+  started = time.perf_counter()
+  built = SCENARIOS[scenario](new_graph(checkpoints, registry), Workload(workload, engine == "async"), size)
+  compile_ms = (time.perf_counter() - started) * 1e3
+
+  node_duration = registry.histogram("primegraph_node_duration_seconds", "", ("node",))
+
+  def nodes_run() -> int:
+    return sum(child.count for _, child in node_duration.children())
+
+  run_chains(built.graph, engine, 1)  # warm-up
+  warm_up_nodes = nodes_run()
+  latencies = run_chains(built.graph, engine, runs)
+  nodes = nodes_run() - warm_up_nodes
+  elapsed = sum(latencies)
+  sleeping = built.critical_path * SLEEP * runs if workload == "sleep" else 0.0
+  result = {
+    "scenario": scenario,
+    "engine": engine,
+    "workload": workload,
+    "size": size,
+    "runs": runs,
+    "nodes_per_run": nodes / runs,
+    "compile_ms": compile_ms,
+    "nodes_per_sec": nodes / elapsed,
+    "overhead_us_per_node": max(0.0, elapsed - sleeping) / nodes * 1e6,
+    "p50_ms": percentile(latencies, 0.5) * 1e3,
+    "p99_ms": percentile(latencies, 0.99) * 1e3,
+    "peak_rss_mb": peak_rss_mb(),
+  }
+  if checkpoints:
+    save = registry.histogram("primegraph_checkpoint_save_seconds", "", ("backend",)).labels("LocalStorage")
+    result["checkpoint_save_p50_us"] = save.percentiles([0.5])[0.5] * 1e6
+  return result
+
+
+def run_suite(  # noqa: PLR0913
+  *,
+  scenarios: Iterable[str] = SCENARIOS,
+  engines: Iterable[str] = ENGINES,
+  workloads: Iterable[str] = WORKLOADS,
+  sizes: Optional[Dict[str, int]] = None,
+  runs: int = 20,
+  checkpoints: bool = False,
+) -> Dict[str, Any]:
+  sizes = sizes or SIZES
+  results = [
+    run_benchmark(scenario, engine, workload, sizes[scenario], runs, checkpoints=checkpoints)
+    for scenario in scenarios
+    for engine in engines
+    for workload in workloads
+  ]
+  return {
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    "results": results,
+    "peak_rss_mb": peak_rss_mb(),
+  }
+
+
+def find_regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+  """Results whose throughput dropped or p99 latency grew by more than `tolerance` (0.25 = 25%)."""
+  previous = {(r["scenario"], r["engine"], r["workload"], r["size"]): r for r in baseline["results"]}
+  regressions = []
+  for result in report["results"]:
+    before = previous.get((result["scenario"], result["engine"], result["workload"], result["size"]))
+    if before is None:
+      continue
+    name = f"{result['scenario']}/{result['engine']}/{result['workload']}"
+    if result["nodes_per_sec"] < before["nodes_per_sec"] * (1 - tolerance):
+      regressions.append(f"{name}: {result['nodes_per_sec']:.0f} nodes/s, was {before['nodes_per_sec']:.0f}")
+    if result["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+      regressions.append(f"{name}: p99 {result['p99_ms']:.2f} ms, was {before['p99_ms']:.2f} ms")
+  return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+  parser = argparse.ArgumentParser(prog="python -m primeGraph.bench", description=__doc__.split("\n")[0])
+  parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="repeatable, default: all")
+  parser.add_argument("--engine", action="append", choices=ENGINES, help="repeatable, default: both")
+  parser.add_argument("--workload", action="append", choices=WORKLOADS, help="repeatable, default: both")
+  parser.add_argument("--runs", type=int, default=20, help="chains run per benchmark (after one warm-up)")
+  parser.add_argument("--quick", action="store_true", help="small graphs, e.g. for CI smoke runs")
+  parser.add_argument("--checkpoints", action="store_true", help="save checkpoints to a LocalStorage")
+  parser.add_argument("-o", "--output", help="also write the JSON report to this file")
+  parser.add_argument("--baseline", help="JSON report to compare against")
+  parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression against the baseline")
+  args = parser.parse_args(argv)
+
+  logging.disable(logging.CRITICAL)  # the engines log every step at DEBUG level
+  report = run_suite(
+    scenarios=args.scenario or SCENARIOS,
+    engines=args.engine or ENGINES,
+    workloads=args.workload or WORKLOADS,
+    sizes=QUICK_SIZES if args.quick else SIZES,
+    runs=args.runs,
+    checkpoints=args.checkpoints,
+  )
+  output = json.dumps(report, indent=2)
+  print(output)
+  if args.output:
+    with open(args.output, "w") as f:
+      f.write(output)
+
+  if args.baseline:
+    with open(args.baseline) as f:
+      regressions = find_regressions(report, json.load(f), args.tolerance)
+    for regression in regressions:
+      print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
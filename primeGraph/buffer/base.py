@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from threading import Lock
-from typing import Any, Dict, get_args, get_origin
+from typing import Any, Dict
+
+from primeGraph.buffer.validation import ValidationMode, compile_validator
 
 
 class BaseBuffer(ABC):
@@ -8,11 +10,16 @@ class BaseBuffer(ABC):
 
   Buffers are used to store the state of a field across executions.
   This helps isolating the different parts of the state, making updates easier and quicker during concurrent executions.
+
+  `validation` sets how deeply updates are type checked (see `compile_validator`). The checks are compiled once
+  per buffer and run before the buffer lock is taken, so a large update does not block other writers.
   """
 
-  def __init__(self, field_name: str, field_type: type):
+  def __init__(self, field_name: str, field_type: type, validation: ValidationMode = "full"):
     self.field_name = field_name
     self.field_type = field_type
+    self.validation = validation
+    self._validate = compile_validator(field_type, validation) if field_type is not None else None
     self.value: Any = None
     self.last_value: Any = None
     self.value_history: Dict[str, Any] = {}
@@ -48,35 +55,5 @@ class BaseBuffer(ABC):
 
   def _enforce_type(self, new_value: Any) -> None:
     """Enforce the type of the buffer value."""
-    if self.field_type is None or new_value is None:
-      return
-
-    def validate_dict_contents(value: dict, key_type: type, value_type: type) -> None:
-      for k, v in value.items():
-        if not isinstance(k, key_type):
-          raise TypeError(f"Dict key must be {key_type}, got {type(k)}")
-        validate_value(v, value_type)
-
-    def validate_list_contents(value: list, item_type: type) -> None:
-      for item in value:
-        validate_value(item, item_type)
-
-    def validate_value(value: Any, expected_type: type) -> None:
-      origin = get_origin(expected_type)
-      if origin is None:
-        if not isinstance(value, expected_type):
-          raise TypeError(f"Value must be {expected_type}, got {type(value)}")
-        return
-
-      if origin is dict:
-        if not isinstance(value, dict):
-          raise TypeError(f"Value must be dict, got {type(value)}")
-        key_type, value_type = get_args(expected_type)
-        validate_dict_contents(value, key_type, value_type)
-      elif origin is list:
-        if not isinstance(value, list):
-          raise TypeError(f"Value must be list, got {type(value)}")
-        item_type = get_args(expected_type)[0]
-        validate_list_contents(value, item_type)
-
-    validate_value(new_value, self.field_type)
+    if new_value is not None and self._validate is not None:
+      self._validate(new_value)
@@ -5,8 +5,10 @@ from pydantic_core import CoreSchema, core_schema
 
 from primeGraph.buffer.base import BaseBuffer
 from primeGraph.buffer.history import HistoryBuffer
+from primeGraph.buffer.history_types import HistoryView
 from primeGraph.buffer.incremental import IncrementalBuffer
 from primeGraph.buffer.last_value import LastValueBuffer
+from primeGraph.buffer.validation import ValidationMode
 
 T = TypeVar("T")
 
@@ -48,15 +50,27 @@ class History(BufferTypeMarker[T]):
     handler: GetCoreSchemaHandler,
   ) -> CoreSchema:
     origin = get_origin(source_type)
-    if origin is None:
-      return core_schema.list_schema(core_schema.any_schema())
-
     args = get_args(source_type)
-    if not args:
-      return core_schema.list_schema(core_schema.any_schema())
+    if origin is None or not args:
+      return _history_schema(core_schema.list_schema(core_schema.any_schema()))
 
     inner_schema = handler.generate_schema(args[0])
-    return core_schema.list_schema(items_schema=inner_schema, strict=True)
+    return _history_schema(core_schema.list_schema(items_schema=inner_schema, strict=True))
+
+
+def _history_schema(list_schema: CoreSchema) -> CoreSchema:
+  """Validate and serialize history snapshots (`HistoryView`) assigned to the state as plain lists."""
+  return core_schema.no_info_before_validator_function(
+    _history_as_list,
+    list_schema,
+    serialization=core_schema.wrap_serializer_function_ser_schema(
+      lambda value, serialize: serialize(_history_as_list(value)), schema=list_schema
+    ),
+  )
+
+
+def _history_as_list(value: Any) -> Any:
+  return value.copy() if isinstance(value, HistoryView) else value
 
 
 class Incremental(BufferTypeMarker[T]):
@@ -80,13 +94,17 @@ class LastValue(BufferTypeMarker[T]):
       return core_schema.any_schema()
 
     inner_schema = handler.generate_schema(args[0])
+    if get_origin(args[0]) is list:
+      # a history snapshot stored as a list value is copied into a plain list
+      return core_schema.no_info_before_validator_function(_history_as_list, inner_schema)
     return inner_schema
 
 
 # Buffer Factory
 class BufferFactory:
   @staticmethod
-  def create_buffer(field_name: str, annotation: Type) -> BaseBuffer:
+  def create_buffer(field_name: str, annotation: Type, validation: ValidationMode = "full") -> BaseBuffer:
+    """Create the buffer of a state field, with its type checks compiled for the `validation` mode."""
     # Get the origin type for generic types
     origin = get_origin(annotation) or annotation
 
@@ -102,7 +120,7 @@ class BufferFactory:
     # Get the inner type from the generic's args
     inner_type = get_args(annotation)[0] if get_args(annotation) else Any
 
-    buffer = buffer_type(field_name, inner_type)  # type: ignore
+    buffer = buffer_type(field_name, inner_type, validation)  # type: ignore
 
     # Set initial value if available
     if hasattr(annotation, "initial_value"):
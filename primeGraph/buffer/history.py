@@ -1,36 +1,96 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
 from primeGraph.buffer.base import BaseBuffer
+from primeGraph.buffer.history_types import HistoryList, HistoryView, detach_history
+from primeGraph.buffer.validation import ValidationMode, compile_items_validator
 
 
 class HistoryBuffer(BaseBuffer):
-  """Buffer that stores the history of a field."""
+  """Buffer that stores the history of a field.
 
-  def __init__(self, field_name: str, field_type: type):
-    super().__init__(field_name, field_type)
-    self.value: List[Any] = []
-    self.last_value: List[Any] = []
+  Values are appended in place to a list that only ever grows, and `value` and the per-execution history are
+  `HistoryView` snapshots of it, so updates do not copy the history. Each of them gets its own view, so that mutating
+  one (which copies it) never changes the others. Each consumption hands the state a new `HistoryList`, a single
+  list copy of the value, so that lists taken from the state earlier never change.
+  """
+
+  def __init__(self, field_name: str, field_type: type, validation: ValidationMode = "full"):
+    super().__init__(field_name, field_type, validation)
+    self._items: List[Any] = []
+    self.value: Any = HistoryView._share(self._items)
+    self.last_value: Any = HistoryView()
+    self._consumed: Optional[HistoryList] = None  # list last handed to the state
+    self._consumed_items: Optional[List[Any]] = None  # item list it was taken from
+    self._validate_items = (
+      compile_items_validator(field_type, validation, skip_none=True) if field_type is not None else None
+    )
 
   def update(self, new_value: Any, execution_id: str) -> None:
+    new_value = detach_history(new_value)
+    self._enforce_type(new_value)
     with self._lock:
-      self._enforce_type(new_value)
-
       if new_value:
-        self.value = [*self.value, new_value]
-        self.last_value = self.value
-        self.add_history(self.value, execution_id)
-        self._ready_for_consumption = True
+        self._append([new_value], execution_id)
+
+  def extend(self, new_values: List[Any], execution_id: str) -> None:
+    """Append several values, in order, as one update. Unlike `update`, falsy values are kept."""
+    self._enforce_item_types(new_values)
+    with self._lock:
+      if new_values:
+        self._append(new_values, execution_id)
 
   def get(self) -> Any:
     with self._lock:
-      return self.value
+      value = self.value
+      # a view of its own, so that editing it never changes the buffer's value
+      return HistoryView._share(value._items, len(value)) if isinstance(value, HistoryView) else value
 
   def set_value(self, value: Any) -> None:
+    if self._is_current(value) or (isinstance(value, HistoryView) and value._items is self._items):
+      # the list the state was last handed or a snapshot of this buffer, both already checked
+      with self._lock:
+        self.value = HistoryView._share(self._items, len(value))
+        self.last_value = HistoryView._share(self._items, len(value))
+      return
+    if not isinstance(value, (list, HistoryView)):  # make sure the value is a list
+      raise ValueError(f"History buffer must be initialized set with a list, got {type(value)}")
+    items = list(value)
+    self._enforce_item_types(items)  # make sure all items are of the correct type
     with self._lock:
-      if isinstance(value, list):  # make sure the value is a list
-        for item in value:
-          self._enforce_type(item)  # make sure all items are of the correct type
-        self.value = value
-        self.last_value = value
-      else:
-        raise ValueError(f"History buffer must be initialized set with a list, got {type(value)}")
+      self._items = items
+      self.value = HistoryView._share(items)
+      self.last_value = HistoryView._share(items)
+      self._consumed = self._consumed_items = None
+
+  def consume_last_value(self) -> Any:
+    with self._lock:
+      view = self.last_value
+      self.last_value = HistoryView()
+      self._ready_for_consumption = False
+      # a new list every time: lists handed out before (and read from the state by nodes) never change
+      consumed = self._consumed = HistoryList(view._visible() if isinstance(view, HistoryView) else view)
+      self._consumed_items = view._items if isinstance(view, HistoryView) else None
+    return consumed
+
+  def _is_current(self, value: Any) -> bool:
+    """Whether `value` is the unedited list the state was last handed, taken from the current item list."""
+    consumed = self._consumed
+    return consumed is not None and value is consumed and not consumed._edited and self._consumed_items is self._items
+
+  def _append(self, values: List[Any], execution_id: str) -> None:
+    """Append to the shared item list, with the lock held, and publish a view of the result."""
+    items = self._items
+    value = self.value
+    if not (isinstance(value, HistoryView) and value._items is items and len(value) == len(items)):
+      # the value no longer ends the shared list (it was set from outside or rolled back to an older
+      # snapshot): the history forks onto a new list so the views already handed out keep their items
+      items = self._items = list(value or [])
+    items.extend(values)
+    self.value = HistoryView._share(items)
+    self.last_value = HistoryView._share(items)
+    self.add_history(HistoryView._share(items), execution_id)
+    self._ready_for_consumption = True
+
+  def _enforce_item_types(self, values: List[Any]) -> None:
+    if self._validate_items is not None:
+      self._validate_items(values)
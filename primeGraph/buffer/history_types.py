@@ -0,0 +1,156 @@
+from collections.abc import MutableSequence
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+
+class HistoryView(MutableSequence):
+  """List-like snapshot of a history buffer (its value and the per-execution history).
+
+  A view shares the append-only item list of its buffer and only sees the items that existed when it was taken,
+  so appending to a history and taking a snapshot of it costs O(1) whatever its length. Mutating a view
+  first copies the items it sees (copy on write), leaving the buffer and every other view untouched.
+  """
+
+  __slots__ = ("_items", "_length", "_owned")
+
+  def __init__(self, items: Iterable[Any] = ()):
+    self._items: List[Any] = list(items)
+    self._length = len(self._items)
+    self._owned = True
+
+  @classmethod
+  def _share(cls, items: List[Any], length: Optional[int] = None) -> "HistoryView":
+    """View of the first `length` (by default all) items of an append-only list, without copying it."""
+    view = cls.__new__(cls)
+    view._items = items
+    view._length = len(items) if length is None else length
+    view._owned = False
+    return view
+
+  def _own(self) -> None:
+    if not self._owned:
+      self._items = self._items[: self._length]
+      self._owned = True
+
+  def _visible(self) -> List[Any]:
+    """The items of the view as a list (the shared list itself when nothing has been appended to it since)."""
+    return self._items if len(self._items) == self._length else self._items[: self._length]
+
+  def __len__(self) -> int:
+    return self._length
+
+  def __getitem__(self, index: Any) -> Any:
+    if isinstance(index, slice):
+      return self._visible()[index]
+    if index < 0:
+      index += self._length
+    if not 0 <= index < self._length:
+      raise IndexError("list index out of range")
+    return self._items[index]
+
+  def __iter__(self) -> Iterator[Any]:
+    return islice(self._items, self._length)
+
+  def __setitem__(self, index: Any, value: Any) -> None:
+    self._own()
+    self._items[index] = value
+    self._length = len(self._items)
+
+  def __delitem__(self, index: Any) -> None:
+    self._own()
+    del self._items[index]
+    self._length = len(self._items)
+
+  def insert(self, index: int, value: Any) -> None:
+    self._own()
+    self._items.insert(index, value)
+    self._length += 1
+
+  def append(self, value: Any) -> None:
+    self._own()
+    self._items.append(value)
+    self._length += 1
+
+  def extend(self, values: Iterable[Any]) -> None:
+    self._own()
+    self._items.extend(values)
+    self._length = len(self._items)
+
+  def sort(self, *, key: Optional[Callable[[Any], Any]] = None, reverse: bool = False) -> None:
+    self._own()
+    self._items.sort(key=key, reverse=reverse)
+
+  def copy(self) -> List[Any]:
+    return self._items[: self._length]
+
+  def __eq__(self, other: object) -> bool:
+    if isinstance(other, HistoryView):
+      other = other._visible()
+    if not isinstance(other, list):
+      return NotImplemented
+    return self._visible() == other
+
+  __hash__ = None  # type: ignore[assignment]
+
+  def __add__(self, other: Iterable[Any]) -> List[Any]:
+    return [*self, *other]
+
+  def __radd__(self, other: Iterable[Any]) -> List[Any]:
+    return [*other, *self]
+
+  def __repr__(self) -> str:
+    return repr(self._visible())
+
+  def __reduce__(self) -> Any:
+    return (HistoryView, (self.copy(),))
+
+
+class HistoryList(list):
+  """The list a History field holds on the state.
+
+  Changing it marks it as edited. When the state is written back to the buffers (e.g. on resume), the buffer adopts
+  the unedited list it last handed out in O(1), without copying or re-checking its items. Copies and pickles are
+  plain lists.
+  """
+
+  __slots__ = ("_edited",)
+
+  def __init__(self, items: Iterable[Any] = ()):
+    super().__init__(items)
+    self._edited = False
+
+  def __reduce__(self) -> Any:
+    return (list, (list(self),))
+
+
+def _marks_edited(name: str) -> Callable[..., Any]:
+  method = getattr(list, name)
+
+  def edit(self: HistoryList, *args: Any, **kwargs: Any) -> Any:
+    self._edited = True
+    return method(self, *args, **kwargs)
+
+  edit.__name__ = name
+  return edit
+
+
+for _name in (
+  "__setitem__",
+  "__delitem__",
+  "__iadd__",
+  "__imul__",
+  "append",
+  "extend",
+  "insert",
+  "pop",
+  "remove",
+  "clear",
+  "sort",
+  "reverse",
+):
+  setattr(HistoryList, _name, _marks_edited(_name))
+
+
+def detach_history(value: Any) -> Any:
+  """A plain list copy of a history list or snapshot, so that storing it elsewhere never aliases the history."""
+  return list(value) if isinstance(value, (HistoryList, HistoryView)) else value
@@ -1,19 +1,20 @@
 from typing import Any, Union
 
 from primeGraph.buffer.base import BaseBuffer
+from primeGraph.buffer.validation import ValidationMode
 
 
 class IncrementalBuffer(BaseBuffer):
   """Buffer that stores the incremental value of a field."""
 
-  def __init__(self, field_name: str, field_type: type):
-    super().__init__(field_name, field_type)
+  def __init__(self, field_name: str, field_type: type, validation: ValidationMode = "full"):
+    super().__init__(field_name, field_type, validation)
     self.value: Union[int, float] = 0
     self.last_value: Union[int, float] = 0
 
   def update(self, new_value: Any, execution_id: str) -> None:
+    self._enforce_type(new_value)
     with self._lock:
-      self._enforce_type(new_value)
       self.value = self.value + new_value
       self.last_value = self.value
       self.add_history(self.value, execution_id)
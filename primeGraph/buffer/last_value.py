@@ -1,18 +1,20 @@
 from typing import Any
 
 from primeGraph.buffer.base import BaseBuffer
+from primeGraph.buffer.history_types import detach_history
+from primeGraph.buffer.validation import ValidationMode
 
 
 class LastValueBuffer(BaseBuffer):
   """Buffer that stores the last value of a field."""
 
-  def __init__(self, field_name: str, field_type: type):
-    super().__init__(field_name, field_type)
+  def __init__(self, field_name: str, field_type: type, validation: ValidationMode = "full"):
+    super().__init__(field_name, field_type, validation)
 
   def update(self, new_value: Any, execution_id: str) -> None:
+    new_value = detach_history(new_value)  # a History field's list keeps growing after it is stored here
+    self._enforce_type(new_value)
     with self._lock:
-      self._enforce_type(new_value)
-
       self.value = new_value
       self.last_value = new_value
       self.add_history(new_value, execution_id)
@@ -0,0 +1,102 @@
+import itertools
+from typing import Any, Callable, Literal, Optional, get_args, get_origin
+
+from primeGraph.buffer.history_types import HistoryView
+
+ValidationMode = Literal["full", "shallow", "sampled", "off"]
+VALIDATION_MODES = ("full", "shallow", "sampled", "off")
+SAMPLE_SIZE = 32  # elements checked per list or dict in "sampled" mode
+
+Validator = Callable[[Any], None]
+
+
+def compile_validator(expected_type: Any, mode: ValidationMode = "full") -> Optional[Validator]:
+  """Build the type check of a value against `expected_type`, or None when there is nothing to check.
+
+  "full" checks every element of lists and dicts, recursively. "shallow" only checks the value itself (a list
+  is a list, an int is an int). "sampled" checks up to SAMPLE_SIZE elements spread over each list or dict,
+  including the last one. "off" checks nothing. Generics other than List and Dict (Optional, Union...) and
+  Any are not checked.
+  """
+  if mode not in VALIDATION_MODES:
+    raise ValueError(f"Unknown validation mode: {mode}")
+  if mode == "off" or expected_type is Any:
+    return None
+
+  origin = get_origin(expected_type)
+  if origin is None:
+
+    def validate_instance(value: Any) -> None:
+      if not isinstance(value, expected_type):
+        raise TypeError(f"Value must be {expected_type}, got {type(value)}")
+
+    return validate_instance
+
+  if origin is dict:
+    key_type, value_type = get_args(expected_type)
+    validate_item = compile_validator(value_type, mode)
+
+    def validate_dict(value: Any) -> None:
+      if not isinstance(value, dict):
+        raise TypeError(f"Value must be dict, got {type(value)}")
+      if mode == "shallow":
+        return
+      items = value.items()
+      if mode == "sampled" and len(value) > SAMPLE_SIZE:
+        step = len(value) // SAMPLE_SIZE
+        items = [*itertools.islice(items, 0, None, step), next(reversed(value.items()))]  # type: ignore[assignment]
+      for k, v in items:
+        if not isinstance(k, key_type):
+          raise TypeError(f"Dict key must be {key_type}, got {type(k)}")
+        if validate_item is not None:
+          validate_item(v)
+
+    return validate_dict
+
+  if origin is list:
+    validate_items = compile_items_validator(get_args(expected_type)[0], mode)
+
+    def validate_list(value: Any) -> None:
+      if not isinstance(value, (list, HistoryView)):
+        raise TypeError(f"Value must be list, got {type(value)}")
+      if validate_items is not None:
+        validate_items(value)
+
+    return validate_list
+
+  return None
+
+
+def compile_items_validator(
+  item_type: Any, mode: ValidationMode = "full", skip_none: bool = False
+) -> Optional[Validator]:
+  """Build the check of the items of a list against `item_type` (see `compile_validator` for the modes).
+
+  With `skip_none`, None items are accepted whatever `item_type` is.
+  """
+  if mode == "shallow":
+    return None
+  validate_item = compile_validator(item_type, mode)
+  if validate_item is None:
+    return None
+
+  def sample(items: Any) -> Any:
+    if mode == "sampled" and len(items) > SAMPLE_SIZE:
+      return [*items[:: len(items) // SAMPLE_SIZE], items[-1]]
+    return items
+
+  if get_origin(item_type) is None:
+    # plain classes are checked inline, without a call per item
+    def validate_plain_items(items: Any) -> None:
+      for item in sample(items):
+        if not isinstance(item, item_type) and not (skip_none and item is None):
+          raise TypeError(f"Value must be {item_type}, got {type(item)}")
+
+    return validate_plain_items
+
+  def validate_items(items: Any) -> None:
+    for item in sample(items):
+      if not (skip_none and item is None):
+        validate_item(item)
+
+  return validate_items
@@ -6,6 +6,7 @@ from typing import List, Optional
 
 from primeGraph.checkpoint.base import CheckpointData, StorageBackend
 from primeGraph.checkpoint.serialization import serialize_model
+from primeGraph.graph.tracing import trace_span
 from primeGraph.models.checkpoint import Checkpoint
 from primeGraph.models.state import GraphState
 
@@ -28,8 +29,9 @@ class LocalStorage(StorageBackend):
     # Convert state class to string representation
     state_class_str = f"{state_instance.__class__.__module__}.{state_instance.__class__.__name__}"
 
-    serialized_data = serialize_model(state_instance)
-    with self._lock:
+    with trace_span("serialize", "checkpoint"):
+      serialized_data = serialize_model(state_instance)
+    with trace_span("write", "checkpoint"), self._lock:
       self._storage[checkpoint_data.chain_id][checkpoint_id] = Checkpoint(
         checkpoint_id=checkpoint_id,
         chain_id=checkpoint_data.chain_id,
@@ -11,6 +11,7 @@ from psycopg2.pool import ThreadedConnectionPool
 
 from primeGraph.checkpoint.base import CheckpointData, StorageBackend
 from primeGraph.checkpoint.serialization import serialize_model
+from primeGraph.graph.tracing import trace_span
 from primeGraph.models.checkpoint import Checkpoint
 from primeGraph.models.state import GraphState
 from primeGraph.types import ChainStatus
@@ -79,7 +80,8 @@ class PostgreSQLStorage(StorageBackend):
     self._enforce_same_model_version(state_instance, checkpoint_data.chain_id)
 
     state_class_str = f"{state_instance.__class__.__module__}.{state_instance.__class__.__name__}"
-    serialized_data = serialize_model(state_instance)
+    with trace_span("serialize", "checkpoint"):
+      serialized_data = serialize_model(state_instance)
 
     sql = """
         INSERT INTO checkpoints (
@@ -100,7 +102,7 @@ class PostgreSQLStorage(StorageBackend):
     for attempt in range(self.retry_attempts):
       conn = self.pool.getconn()
       try:
-        with conn.cursor() as cur:
+        with trace_span("write", "checkpoint", attempt=attempt), conn.cursor() as cur:
           # Add advisory lock to prevent concurrent updates
           cur.execute("SELECT pg_advisory_xact_lock(%s)", (hash(checkpoint_id),))
 
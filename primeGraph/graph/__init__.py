@@ -1,3 +1,33 @@
+from primeGraph.graph.cache import CachePolicy, CacheStats
+from primeGraph.graph.cancellation import CancellationToken, ChainCancelledError, DeadlineExceededError
+from primeGraph.graph.context import ChainResult, ExecutionContext, NodeContext, NodeEvent
 from primeGraph.graph.executable import Graph
+from primeGraph.graph.hedging import HedgePolicy, HedgeStats
+from primeGraph.graph.mapping import MapSpec
+from primeGraph.graph.metrics import MetricsRegistry
+from primeGraph.graph.speculation import SpeculationStats
+from primeGraph.graph.state_view import StateView
+from primeGraph.graph.tracing import TraceEvent, Tracer
+from primeGraph.graph.worker_pool import WorkerPool
 
-__all__ = ["Graph"]
+__all__ = [
+  "CachePolicy",
+  "CacheStats",
+  "CancellationToken",
+  "ChainCancelledError",
+  "ChainResult",
+  "DeadlineExceededError",
+  "ExecutionContext",
+  "Graph",
+  "HedgePolicy",
+  "HedgeStats",
+  "MapSpec",
+  "MetricsRegistry",
+  "NodeContext",
+  "NodeEvent",
+  "SpeculationStats",
+  "StateView",
+  "TraceEvent",
+  "Tracer",
+  "WorkerPool",
+]
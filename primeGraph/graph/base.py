@@ -1,15 +1,42 @@
 import ast
+import copy
+import hashlib
 import inspect
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Coroutine, Dict, List, Literal, NamedTuple, Optional, Self, Set, Tuple, Union
+from typing import (
+  Any,
+  Callable,
+  Coroutine,
+  Dict,
+  FrozenSet,
+  Iterable,
+  List,
+  Literal,
+  NamedTuple,
+  Optional,
+  Self,
+  Set,
+  Tuple,
+  Union,
+)
 
 from pydantic import BaseModel
 
 from primeGraph.constants import END, START
+from primeGraph.graph.cache import CachePolicy
+from primeGraph.graph.hedging import HedgePolicy
+from primeGraph.graph.mapping import MapSpec
 
 TUPLE_LENGTH = 2
 MIN_VALID_NODES = 3  # START + END + at least one custom node
+EXECUTION_PATH_CACHE_SIZE = 128
+
+# Path analysis only depends on the graph topology, so graphs with the same topology share it
+_execution_path_cache: "OrderedDict[str, Tuple[Dict[str, Dict[str, List[str]]], List[Any]]]" = OrderedDict()
+_execution_path_cache_lock = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -34,6 +61,15 @@ class Node(NamedTuple):
   is_subgraph: bool = False
   subgraph: Optional["BaseGraph"] = None
   router_paths: Optional[Dict[str, List[str]]] = None
+  executor: Literal["thread", "process"] = "thread"
+  max_concurrency: Optional[int] = None
+  rate_limit: Optional[str] = None
+  accepts_context: bool = False  # the action declares a `context` parameter (see NodeContext)
+  cache: Optional[CachePolicy] = None
+  reads: Optional[FrozenSet[str]] = None  # declared state fields the node reads (None: undeclared)
+  writes: Optional[FrozenSet[str]] = None  # declared state fields the node may return
+  hedge: Optional[HedgePolicy] = None
+  map: Optional[MapSpec] = None
 
 
 class BaseGraph:
@@ -54,6 +90,14 @@ class BaseGraph:
 
     self.edge_counter: Dict[Tuple[str, str], int] = {}  # Track edge counts between node pairs
 
+    # Integer-indexed node table built on compile, so engines resolve nodes without searching
+    self.node_table: List[Node] = []
+    self.node_index: Dict[str, int] = {}
+
+    # Edge DAG over node ids (successor lists and in-degrees), used by the dataflow scheduler
+    self.node_successors: List[List[int]] = []
+    self.node_in_degree: List[int] = []
+
   @property
   def _all_nodes(self) -> List[str]:
     return list(self.nodes.keys())
@@ -87,23 +131,69 @@ class BaseGraph:
       print("Graph not compiled. Compiling now..")
       self.compile()
 
-  def node(
+  def node(  # noqa: PLR0913
     self,
     name: Optional[str] = None,
     metadata: Optional[Dict[str, Any]] = None,
     interrupt: Union[Literal["before", "after"], None] = None,
+    *,
+    executor: Literal["thread", "process"] = "thread",
+    max_concurrency: Optional[int] = None,
+    rate_limit: Optional[str] = None,
+    cache: Optional[CachePolicy] = None,
+    reads: Optional[Iterable[str]] = None,
+    writes: Optional[Iterable[str]] = None,
+    hedge: Optional[HedgePolicy] = None,
+    map: Optional[MapSpec] = None,
   ) -> Callable[..., None]:
     """Decorator to add a node to the graph
 
+    Node functions that declare a `context` parameter get a `NodeContext` (chain id, node name and the
+    cancellation token of the chain or parallel group they run in).
+
     Args:
         name: Optional name for the node. If None, uses the function name
         metadata: Optional metadata dictionary
+        executor: "thread" runs sync actions on the shared thread pool. "process" runs them in a process
+            pool (for CPU-bound work); the action must be a module-level sync function, it gets a copy of
+            the state and its returned dict is applied as usual.
+        max_concurrency: Optional cap on how many executions of this node (including its repeated copies)
+            run at once. Executions above the cap wait for a free slot.
+        rate_limit: Optional name of a process-wide rate limiter (see `register_rate_limiter`) every
+            execution of this node takes a token from, across all graphs and chains.
+        cache: Optional memoization policy. The node's returned updates are stored under a hash of the
+            policy's key fields and replayed (through the buffers) for later calls with the same inputs.
+        reads: Optional state fields the node reads. The node then gets a read-only view of just these
+            fields, and they key its cache when the cache policy names no key fields.
+        writes: Optional state fields the node may return. Other fields are rejected at runtime, and
+            LastValue fields written by parallel branches are rejected at compile time.
+        hedge: Optional hedging policy for tail latency. A call still running after the policy's delay is
+            duplicated, the first attempt to succeed wins and the other is cancelled. Thread nodes only.
+        map: Optional fan-out over a list field. The function takes an `item` parameter and is called once
+            per item of `map.over`; the results are appended to the History field `map.into` in item order.
     """
 
     def decorator(func: Callable[..., None]) -> Callable[..., None]:  # noqa: ARG001, RUF100
       if self.is_compiled:
         raise ValueError("Cannot add nodes after compiling the graph")
 
+      if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown node executor: {executor}")
+      if executor == "process" and (
+        inspect.iscoroutinefunction(func) or "<locals>" in getattr(func, "__qualname__", "<locals>")
+      ):
+        raise ValueError(f"Process node '{func.__name__}' must be a module-level sync function so it can be pickled")
+      if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+      if hedge is not None and executor == "process":
+        raise ValueError(f"Process node '{func.__name__}' cannot be hedged")
+      if map is not None and executor == "process":
+        raise ValueError(f"Process node '{func.__name__}' cannot be a map node")
+      if map is not None and map.chunk_size < 1:
+        raise ValueError("map chunk_size must be at least 1")
+      if map is not None and map.max_concurrency is not None and map.max_concurrency < 1:
+        raise ValueError("map max_concurrency must be at least 1")
+
       # Checking for reserved node names
       node_name = name if name is not None else func.__name__
       if node_name in [START, END]:
@@ -115,14 +205,19 @@ class BaseGraph:
       # Create metadata as a dictionary attribute instead of using __metadata__
       func.metadata = {"interrupt": interrupt}  # type: ignore
 
+      sig = inspect.signature(func)
+      accepts_context = "context" in sig.parameters
+      if accepts_context and executor == "process":
+        raise ValueError(f"Process node '{func.__name__}' cannot take a 'context' parameter")
+      if map is not None and "item" not in sig.parameters:
+        raise ValueError(f"Map node '{func.__name__}' must accept an 'item' parameter")
+
       # Check if function accepts state parameter when graph has state
-      if hasattr(self, "_has_state") and self._has_state:
-        sig = inspect.signature(func)
-        if "state" not in sig.parameters:
-          raise ValueError(
-            f"Node function '{func.__name__}' must accept 'state' parameter when graph has state. "
-            f"Update your function definition to: def {func.__name__}(state) -> Dict"
-          )
+      if hasattr(self, "_has_state") and self._has_state and "state" not in sig.parameters:
+        raise ValueError(
+          f"Node function '{func.__name__}' must accept 'state' parameter when graph has state. "
+          f"Update your function definition to: def {func.__name__}(state) -> Dict"
+        )
 
       # Create event emitter closure
       async def emit_event(event_type: str, data: Any = None) -> None:
@@ -150,6 +245,15 @@ class BaseGraph:
         None,
         interrupt,
         emit_event=emit_event,
+        executor=executor,
+        max_concurrency=max_concurrency,
+        rate_limit=rate_limit,
+        accepts_context=accepts_context,
+        cache=cache,
+        reads=frozenset(reads) if reads is not None else None,
+        writes=frozenset(writes) if writes is not None else None,
+        hedge=hedge,
+        map=map,
       )
       return func
 
@@ -282,6 +386,15 @@ class BaseGraph:
           emit_event=node.emit_event,
           is_subgraph=node.is_subgraph,
           subgraph=node.subgraph,
+          executor=node.executor,
+          max_concurrency=node.max_concurrency,
+          rate_limit=node.rate_limit,
+          accepts_context=node.accepts_context,
+          cache=node.cache,
+          reads=node.reads,
+          writes=node.writes,
+          hedge=node.hedge,
+          map=node.map,
         )
 
     # Copy and adjust edges
@@ -563,14 +676,57 @@ class BaseGraph:
 
     return clean_plan(plan)  # type: ignore
 
+  def _get_topology_fingerprint(self) -> str:
+    """Stable hash of everything path analysis depends on: nodes, router routes and edges."""
+    nodes = sorted(
+      (name, node.is_router, tuple(sorted(node.possible_routes or ())), node.is_subgraph)
+      for name, node in self.nodes.items()
+    )
+    edges = sorted((edge.start_node, edge.end_node) for edge in self.edges)
+    return hashlib.sha1(repr((nodes, edges)).encode()).hexdigest()
+
+  def _is_acyclic(self) -> bool:
+    """Whether the edge graph has no cycles (Kahn's algorithm over the compiled node tables)."""
+    remaining = list(self.node_in_degree)
+    ready = [node_id for node_id, degree in enumerate(remaining) if degree == 0]
+    visited = 0
+    while ready:
+      node_id = ready.pop()
+      visited += 1
+      for successor in self.node_successors[node_id]:
+        remaining[successor] -= 1
+        if remaining[successor] == 0:
+          ready.append(successor)
+    return visited == len(remaining)
+
   def compile(self) -> Self:
     """Compiles the graph by validating and organizing execution paths."""
     self.validate()
 
-    # Analyze router paths before creating execution paths
-    self.router_paths = self._analyze_router_paths()
-
-    self.detailed_execution_path = self._find_execution_paths()
+    self.node_table = list(self.nodes.values())
+    self.node_index = {node.name: node_id for node_id, node in enumerate(self.node_table)}
+    self.node_successors = [[] for _ in self.node_table]
+    self.node_in_degree = [0] * len(self.node_table)
+    for edge in sorted(self.edges, key=lambda edge: (self.node_index[edge.start_node], self.node_index[edge.end_node])):
+      self.node_successors[self.node_index[edge.start_node]].append(self.node_index[edge.end_node])
+      self.node_in_degree[self.node_index[edge.end_node]] += 1
+
+    # Path analysis runs once per topology; every run and resume reuses the compiled paths
+    self.topology_fingerprint = self._get_topology_fingerprint()
+    with _execution_path_cache_lock:
+      cached_paths = _execution_path_cache.get(self.topology_fingerprint)
+      if cached_paths is not None:
+        _execution_path_cache.move_to_end(self.topology_fingerprint)
+    if cached_paths is None:
+      # Analyze router paths before creating execution paths
+      cached_paths = (self._analyze_router_paths(), self._find_execution_paths())
+      with _execution_path_cache_lock:
+        _execution_path_cache[self.topology_fingerprint] = cached_paths
+        if len(_execution_path_cache) > EXECUTION_PATH_CACHE_SIZE:
+          _execution_path_cache.popitem(last=False)
+
+    # Copies are owned by this graph and never mutated in place afterwards
+    self.router_paths, self.detailed_execution_path = copy.deepcopy(cached_paths)
 
     def extract_execution_plan(current_item: Any) -> Any:
       if isinstance(current_item, list):
@@ -900,13 +1056,15 @@ class BaseGraph:
 
     return result
 
-  def add_repeating_edge(
+  def add_repeating_edge(  # noqa: PLR0913
     self,
     start_node: str,
     repeat_node: str,
     end_node: str,
     repeat: int = 1,
     parallel: bool = False,
+    *,
+    max_concurrency: Optional[int] = None,
   ) -> Self:
     """Add a repeating edge that creates multiple instances of the same node.
 
@@ -916,9 +1074,12 @@ class BaseGraph:
         end_node: Ending node name
         repeat: Number of times to repeat the node
         parallel: Whether to run repetitions in parallel
+        max_concurrency: Optional cap on how many repetitions of this group run at once
     """
     if repeat < 1:
       raise ValueError("Repeat count must be at least 1")
+    if max_concurrency is not None and max_concurrency < 1:
+      raise ValueError("max_concurrency must be at least 1")
 
     if start_node not in self.nodes or end_node not in self.nodes or repeat_node not in self.nodes:
       raise ValueError("All nodes must exist in the graph")
@@ -962,10 +1123,16 @@ class BaseGraph:
 
       return wrapped_action
 
+    def repeat_action(node_name: str) -> Callable[..., Any]:
+      # process actions are shipped to workers by reference, so they cannot be wrapped in a closure
+      if original_node.executor == "process":
+        return original_node.action
+      return create_node_action(node_name, original_node.action)
+
     # Create a new version of the original node with updated metadata
     self.nodes[repeat_node] = Node(
       name=repeat_node,
-      action=create_node_action(repeat_node, original_node.action),  # type: ignore
+      action=repeat_action(repeat_node),
       metadata={
         **(original_node.metadata or {}),
         "is_repeat": True,
@@ -973,6 +1140,7 @@ class BaseGraph:
         "repeat_index": 1,
         "original_node": repeat_node,
         "parallel": parallel,
+        "group_max_concurrency": max_concurrency,
       },
       is_async=original_node.is_async,
       is_router=original_node.is_router,
@@ -981,6 +1149,15 @@ class BaseGraph:
       emit_event=original_node.emit_event,
       is_subgraph=original_node.is_subgraph,
       subgraph=original_node.subgraph,
+      executor=original_node.executor,
+      max_concurrency=original_node.max_concurrency,
+      rate_limit=original_node.rate_limit,
+      accepts_context=original_node.accepts_context,
+      cache=original_node.cache,
+      reads=original_node.reads,
+      writes=original_node.writes,
+      hedge=original_node.hedge,
+      map=original_node.map,
     )
 
     repeated_nodes = [repeat_node]
@@ -991,7 +1168,7 @@ class BaseGraph:
 
       self.nodes[repeat_node_name] = Node(
         name=repeat_node_name,
-        action=create_node_action(repeat_node_name, original_node.action),  # type: ignore
+        action=repeat_action(repeat_node_name),
         metadata={
           **(original_node.metadata or {}),
           "is_repeat": True,
@@ -999,6 +1176,7 @@ class BaseGraph:
           "repeat_index": i + 2,
           "original_node": repeat_node,
           "parallel": parallel,
+          "group_max_concurrency": max_concurrency,
         },
         is_async=original_node.is_async,
         is_router=original_node.is_router,
@@ -1007,6 +1185,15 @@ class BaseGraph:
         emit_event=original_node.emit_event,
         is_subgraph=original_node.is_subgraph,
         subgraph=original_node.subgraph,
+        executor=original_node.executor,
+        max_concurrency=original_node.max_concurrency,
+        rate_limit=original_node.rate_limit,
+        accepts_context=original_node.accepts_context,
+        cache=original_node.cache,
+        reads=original_node.reads,
+        writes=original_node.writes,
+        hedge=original_node.hedge,
+        map=original_node.map,
       )
       repeated_nodes.append(repeat_node_name)
 
@@ -1028,25 +1215,46 @@ class BaseGraph:
 
     return self
 
-  def add_router_edge(self, start_node: str, router_node: str) -> Self:
+  def add_router_edge(
+    self,
+    start_node: str,
+    router_node: str,
+    *,
+    speculate: int = 0,
+    route_hints: Optional[Dict[str, float]] = None,
+  ) -> Self:
     """Add a router edge that can direct flow to different paths based on router node return value.
 
     Args:
         start_node: Starting node name
         router_node: Node that will determine the routing
+        speculate: Number of likely routes whose first node starts (in plan mode) while the router is still
+            running. The chosen route's result is committed through the buffers once the router returns; the
+            others are cancelled and their results discarded. Only plain thread/async nodes without
+            interrupts, concurrency caps or rate limits are started speculatively, and they must not depend
+            on writes made concurrently with the router.
+        route_hints: Optional prior weights of the routes (as if each had been chosen that many times),
+            combined with the observed route frequencies to pick the routes to speculate on.
     """
     if not all(node in self.nodes for node in [start_node, router_node]):
       raise ValueError("All nodes must exist in the graph")
+    if speculate < 0:
+      raise ValueError("speculate must not be negative")
 
     # Update router node metadata
     router_metadata = self.nodes[router_node].metadata or {}
     router_metadata.update({"is_router": True})
+    if speculate:
+      router_metadata.update({"speculate": speculate, "route_hints": dict(route_hints or {})})
 
     # Get all possible return values from the router function
     return_values = self._get_return_values(self.nodes[router_node].action)
 
     if not return_values:
       raise ValueError(f"Router node '{router_node}' must return string literals indicating next nodes")
+    unknown_hints = set(route_hints or {}) - return_values
+    if unknown_hints:
+      raise ValueError(f"Route hints of '{router_node}' name unknown routes: {', '.join(sorted(unknown_hints))}")
 
     # Create new Node instance with updated metadata and possible routes
     self.nodes[router_node] = self.nodes[router_node]._replace(
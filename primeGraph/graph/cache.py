@@ -0,0 +1,86 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class CachePolicy(NamedTuple):
+  """Memoization of a node's returned updates, enabled with `@graph.node(cache=CachePolicy(...))`.
+
+  The node must be a pure function of `key_fields`: a chain whose key fields hash the same as an earlier
+  call gets the stored updates applied through the buffers instead of running the node.
+  """
+
+  key_fields: Optional[Tuple[str, ...]] = None  # state fields the node reads. None keys on the whole state
+  max_size: int = 128  # least recently used entries are evicted beyond this
+  ttl: Optional[float] = None  # seconds an entry stays valid. None never expires
+
+
+class CacheStats(NamedTuple):
+  hits: int
+  misses: int
+  evictions: int
+  size: int
+
+
+class NodeCache:
+  """Thread-safe LRU/TTL store of one node's results, shared by every chain of the graph."""
+
+  def __init__(self, policy: CachePolicy):
+    if policy.max_size < 1:
+      raise ValueError("Cache max_size must be at least 1")
+    if policy.ttl is not None and policy.ttl <= 0:
+      raise ValueError("Cache ttl must be positive")
+    self.policy = policy
+    self._include = set(policy.key_fields) if policy.key_fields is not None else None
+    self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  def key(self, state: Optional[BaseModel]) -> str:
+    """Stable hash of the key fields of `state`."""
+    if state is None:
+      return ""
+    values = state.model_dump(include=self._include)
+    encoded = json.dumps(values, sort_keys=True, default=repr, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+  def get(self, key: str) -> Tuple[bool, Any]:
+    """Return (hit, result). Results are copies, so chains never share mutable values through the cache."""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None and (self.policy.ttl is None or time.monotonic() - entry[0] < self.policy.ttl):
+        self._entries.move_to_end(key)
+        self._hits += 1
+        result = entry[1]
+      else:
+        if entry is not None:
+          del self._entries[key]
+          self._evictions += 1
+        self._misses += 1
+        return False, None
+    return True, copy.deepcopy(result)
+
+  def put(self, key: str, result: Any) -> None:
+    result = copy.deepcopy(result)
+    with self._lock:
+      self._entries[key] = (time.monotonic(), result)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.policy.max_size:
+        self._entries.popitem(last=False)
+        self._evictions += 1
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
+
+  def stats(self) -> CacheStats:
+    with self._lock:
+      return CacheStats(self._hits, self._misses, self._evictions, len(self._entries))
@@ -0,0 +1,97 @@
+import asyncio
+import contextlib
+import threading
+import weakref
+from typing import Callable, List, Optional, Type
+
+
+class ChainCancelledError(Exception):
+  """Raised by `CancellationToken.raise_if_cancelled` once the work it guards was cancelled."""
+
+
+class DeadlineExceededError(ChainCancelledError):
+  """The chain's deadline budget (see `Graph.start(deadline=...)`) ran out."""
+
+
+class CancellationToken:
+  """Cooperative cancellation flag shared by the nodes of a chain or of one parallel group.
+
+  Engines cancel a group's token as soon as one of its branches fails (and a chain's token when the chain
+  fails or times out). Cancelling a token cancels its children. Threads cannot be interrupted, so long-running
+  sync nodes should poll `cancelled` / `raise_if_cancelled()` or sleep with `wait()` (`wait_async()` in
+  coroutines).
+  """
+
+  def __init__(self, parent: Optional["CancellationToken"] = None):
+    self._event = threading.Event()
+    self._lock = threading.Lock()
+    self._children: "weakref.WeakSet[CancellationToken]" = weakref.WeakSet()
+    self._waiters: List[Callable[[], None]] = []  # wake up the `wait_async` calls in progress
+    self.reason: Optional[str] = None
+    self._error: Type[ChainCancelledError] = ChainCancelledError
+    if parent is not None:
+      parent._adopt(self)
+
+  def _adopt(self, child: "CancellationToken") -> None:
+    with self._lock:
+      if not self._event.is_set():
+        self._children.add(child)
+        return
+    child.cancel(self.reason, self._error)
+
+  def child(self) -> "CancellationToken":
+    """A token cancelled together with this one, that can also be cancelled on its own."""
+    return CancellationToken(self)
+
+  def cancel(self, reason: Optional[str] = None, error: Type[ChainCancelledError] = ChainCancelledError) -> None:
+    """Cancel the token and its children. `raise_if_cancelled` then raises `error`."""
+    with self._lock:
+      if self._event.is_set():
+        return
+      self.reason = reason or "cancelled"
+      self._error = error
+      self._event.set()
+      children = list(self._children)
+      self._children.clear()
+      waiters, self._waiters = self._waiters, []
+    for wake in waiters:
+      wake()
+    for child in children:
+      child.cancel(self.reason, error)
+
+  @property
+  def cancelled(self) -> bool:
+    return self._event.is_set()
+
+  def raise_if_cancelled(self) -> None:
+    if self._event.is_set():
+      raise self._error(self.reason)
+
+  def wait(self, timeout: Optional[float] = None) -> bool:
+    """Sleep up to `timeout` seconds, waking up early on cancellation. Returns whether the token is cancelled."""
+    return self._event.wait(timeout)
+
+  async def wait_async(self, timeout: Optional[float] = None) -> bool:
+    """`wait` without blocking the event loop. The token may be cancelled from any thread."""
+    loop = asyncio.get_running_loop()
+    woken: asyncio.Future = loop.create_future()
+
+    def settle() -> None:
+      if not woken.done():
+        woken.set_result(None)
+
+    def wake() -> None:
+      with contextlib.suppress(RuntimeError):  # the loop is closed, nobody is waiting anymore
+        loop.call_soon_threadsafe(settle)
+
+    with self._lock:
+      if self._event.is_set():
+        return True
+      self._waiters.append(wake)
+    try:
+      await asyncio.wait({woken}, timeout=timeout)
+    finally:
+      with self._lock:
+        if wake in self._waiters:
+          self._waiters.remove(wake)
+    return self._event.is_set()
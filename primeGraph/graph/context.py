@@ -0,0 +1,93 @@
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Set
+
+from primeGraph.buffer.base import BaseBuffer
+from primeGraph.graph.cancellation import CancellationToken
+from primeGraph.graph.tracing import Tracer
+from primeGraph.models.state import GraphState
+from primeGraph.types import ChainStatus
+
+
+class NodeContext(NamedTuple):
+  """Passed to node functions that declare a `context` parameter."""
+
+  chain_id: str
+  node: str
+  cancellation: CancellationToken  # cancelled when a sibling branch or the chain fails
+  deadline: Optional[float] = None  # time.monotonic() the chain's budget runs out, if it has one
+
+  @property
+  def remaining(self) -> Optional[float]:
+    """Seconds left in the chain's budget (never negative), e.g. to size the node's own I/O timeouts."""
+    if self.deadline is None:
+      return None
+    return max(0.0, self.deadline - time.monotonic())
+
+
+class NodeEvent(NamedTuple):
+  """A node of a chain finished. Emitted to the chain's event sink (see `Graph.stream` / `Graph.astream`)."""
+
+  chain_id: str
+  node: str
+  updates: Dict[str, Any]  # field -> value the node pushed into the buffers ({} for routers)
+  started_at: float  # wall-clock time.time() of the node start
+  duration: float  # seconds the node took, excluding concurrency and rate limit waits
+  route: Optional[str] = None  # node chosen by a router
+
+
+@dataclass
+class ExecutionContext:
+  """Per-chain mutable execution state.
+
+  A compiled `Graph` only holds the topology and the cached plans; everything a single chain run
+  mutates lives here. Any number of contexts can execute concurrently against the same graph.
+  """
+
+  chain_id: str = field(default_factory=lambda: f"chain_{uuid.uuid4()}")
+  state: Optional[GraphState] = None
+  buffers: Dict[str, BaseBuffer] = field(default_factory=dict)
+  chain_status: ChainStatus = ChainStatus.IDLE
+
+  # Execution management
+  next_execution_node: Optional[str] = None
+  last_executed_node: Optional[str] = None
+  start_from: Optional[str] = None
+  executed_nodes: Set[str] = field(default_factory=set)
+  # first node of the path a router just chose; set until the scheduler has moved to it
+  pending_route: Optional[str] = None
+
+  # Router variant of the compiled plan this chain is currently following
+  detailed_execution_path: List[Any] = field(default_factory=list)
+  execution_plan: List[Any] = field(default_factory=list)
+  route_choices: Dict[str, str] = field(default_factory=dict)
+  # staged speculative runs of route nodes their router picked, committed when the scheduler reaches them
+  speculations: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+  # Cancelled when the chain fails or times out. Replaced with a fresh token on every execute
+  cancellation: CancellationToken = field(default_factory=CancellationToken, repr=False)
+  # time.monotonic() the current run's deadline budget runs out, and whether the chain then pauses or fails
+  deadline: Optional[float] = None
+  on_deadline: Literal["fail", "pause"] = "fail"
+
+  # Called with a NodeEvent after each node's updates reach the buffers. Must be thread-safe for sync engines
+  event_sink: Optional[Callable[[NodeEvent], None]] = field(default=None, repr=False)
+  # records the chain's spans when set (see `Tracer`)
+  tracer: Optional[Tracer] = field(default=None, repr=False)
+
+
+class ChainResult(NamedTuple):
+  """Outcome of one chain of a batch run (`Graph.start_many` / `Graph.astart_many`)."""
+
+  position: int  # index of the chain's initial state in the batch input
+  context: ExecutionContext
+  error: Optional[BaseException] = None
+
+  @property
+  def chain_id(self) -> str:
+    return self.context.chain_id
+
+  @property
+  def state(self) -> Optional[GraphState]:
+    return self.context.state
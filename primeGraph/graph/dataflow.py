@@ -0,0 +1,39 @@
+from typing import Collection, List, Optional
+
+
+class DataflowFrontier:
+  """In-degree bookkeeping for one dataflow run over a compiled graph.
+
+  A node becomes ready once every incoming edge is resolved. It runs if at least one of those edges
+  is live; otherwise it is dead and resolves its own outgoing edges as dead (dead-path elimination),
+  so branches a router did not take never block the nodes they join into.
+  """
+
+  def __init__(self, successors: List[List[int]], in_degree: List[int], end_id: int):
+    self._successors = successors
+    self._remaining = list(in_degree)
+    self._live = [False] * len(in_degree)
+    self._end_id = end_id
+
+  def resolve(self, node_id: int, live_successors: Optional[Collection[int]] = None) -> List[int]:
+    """Mark a node as finished and return the nodes that became ready to run.
+
+    Args:
+        node_id: id of the finished node
+        live_successors: successors whose edge is taken (a router's chosen route). None means all of them.
+    """
+    ready: List[int] = []
+    resolving = [(node_id, live_successors)]
+    while resolving:
+      current, live = resolving.pop()
+      for successor in self._successors[current]:
+        if live is None or successor in live:
+          self._live[successor] = True
+        self._remaining[successor] -= 1
+        if self._remaining[successor] or successor == self._end_id:
+          continue
+        if self._live[successor]:
+          ready.append(successor)
+        else:
+          resolving.append((successor, ()))
+    return ready
@@ -0,0 +1,72 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineTimer:
+  """A single daemon thread firing callbacks at time.monotonic() deadlines.
+
+  Chains with a deadline budget register one callback here (cancelling the chain's token) instead of
+  holding a thread or a timer of their own. Callbacks must be quick: they run on the timer thread.
+  """
+
+  def __init__(self) -> None:
+    self._heap: List[Tuple[float, int, Callable[[], None]]] = []
+    self._cancelled: Set[int] = set()
+    self._ids = itertools.count()
+    self._condition = threading.Condition()
+    self._thread: Optional[threading.Thread] = None
+
+  def schedule(self, when: float, callback: Callable[[], None]) -> int:
+    """Run `callback` once time.monotonic() reaches `when`. Returns a handle for `cancel`."""
+    with self._condition:
+      handle = next(self._ids)
+      heapq.heappush(self._heap, (when, handle, callback))
+      if self._thread is None:
+        self._thread = threading.Thread(target=self._run, name="primeGraph-deadlines", daemon=True)
+        self._thread.start()
+      self._condition.notify()
+    return handle
+
+  def cancel(self, handle: int) -> None:
+    with self._condition:
+      if any(entry[1] == handle for entry in self._heap):
+        self._cancelled.add(handle)
+
+  def _run(self) -> None:
+    while True:
+      with self._condition:
+        while not self._heap:
+          self._condition.wait()
+        when, handle, callback = self._heap[0]
+        delay = when - time.monotonic()
+        if delay > 0:
+          self._condition.wait(delay)
+          continue
+        heapq.heappop(self._heap)
+        if handle in self._cancelled:
+          self._cancelled.discard(handle)
+          continue
+      try:
+        callback()
+      except Exception:
+        logger.exception("Deadline callback failed")
+
+
+_deadline_timer: Optional[DeadlineTimer] = None
+_deadline_timer_lock = threading.Lock()
+
+
+def get_deadline_timer() -> DeadlineTimer:
+  """Process-wide timer shared by every chain with a deadline."""
+  global _deadline_timer  # noqa: PLW0603
+  if _deadline_timer is None:
+    with _deadline_timer_lock:
+      if _deadline_timer is None:
+        _deadline_timer = DeadlineTimer()
+  return _deadline_timer
@@ -1,16 +1,59 @@
 import asyncio
 import concurrent.futures
+import copy
+import functools
+import heapq
 import inspect
 import logging
+import math
+import queue
+import threading
+import time
 import uuid
-from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Set, Tuple, Union
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+  Any,
+  AsyncIterator,
+  Callable,
+  ContextManager,
+  Dict,
+  Iterable,
+  Iterator,
+  List,
+  Literal,
+  Mapping,
+  NamedTuple,
+  Optional,
+  Set,
+  Tuple,
+  Union,
+)
 
 from pydantic import BaseModel
 
 from primeGraph.buffer.base import BaseBuffer
 from primeGraph.buffer.factory import BufferFactory
+from primeGraph.buffer.history import HistoryBuffer
+from primeGraph.buffer.last_value import LastValueBuffer
+from primeGraph.buffer.validation import VALIDATION_MODES, ValidationMode
 from primeGraph.checkpoint.base import CheckpointData, StorageBackend
-from primeGraph.graph.base import BaseGraph
+from primeGraph.constants import END, START
+from primeGraph.graph.base import BaseGraph, Node
+from primeGraph.graph.cache import CacheStats, NodeCache
+from primeGraph.graph.cancellation import CancellationToken, ChainCancelledError, DeadlineExceededError
+from primeGraph.graph.context import ChainResult, ExecutionContext, NodeContext, NodeEvent
+from primeGraph.graph.dataflow import DataflowFrontier
+from primeGraph.graph.deadline import get_deadline_timer
+from primeGraph.graph.hedging import HedgeStats, NodeHedger
+from primeGraph.graph.limits import ConcurrencyLimiter, SlotTimeoutError, acquire_all, hold, hold_async, release_all
+from primeGraph.graph.mapping import MapSpec, chunk_ranges
+from primeGraph.graph.metrics import MetricsRegistry, get_engine_metrics, get_metrics_registry
+from primeGraph.graph.rate_limit import TokenBucket, get_rate_limiter
+from primeGraph.graph.speculation import RouteStatistics, Speculation, SpeculationStats
+from primeGraph.graph.state_view import StateView
+from primeGraph.graph.tracing import NO_SPAN, Tracer, activate
+from primeGraph.graph.worker_pool import WorkerPool, get_default_worker_pool
 from primeGraph.models.checkpoint import Checkpoint
 from primeGraph.models.state import GraphState
 from primeGraph.types import ChainStatus
@@ -23,54 +66,383 @@ logger = logging.getLogger(__name__)
 # Silence graphviz debug logs
 logging.getLogger("graphviz").setLevel(logging.WARNING)
 
+ExecutionMode = Literal["plan", "dataflow"]
+
+
+@dataclass(frozen=True)
+class NodeTask:
+  """A single node in the executable plan, carrying its identity in the compiled node table."""
+
+  node_id: int
+  node_name: str
+  action: Callable
+
 
 class ExecutableNode(NamedTuple):
   node_name: str
-  task_list: List[Union[Callable, "ExecutableNode"]]
+  task_list: List[Union[NodeTask, "ExecutableNode"]]
   node_list: List[str]
   execution_type: Literal["sequential", "parallel"]
   interrupt: Union[Literal["before", "after"], None] = None
 
 
+def _call_action(action: Callable, state: Optional[GraphState]) -> Any:
+  """Entry point of process workers: run a node action on the state copy shipped with the call."""
+  return action(state=state) if state is not None else action()
+
+
+def _context_attribute(name: str) -> Any:
+  """Expose an attribute of the graph's default execution context on the graph itself."""
+
+  def getter(self: "Graph") -> Any:
+    return getattr(self.context, name)
+
+  def setter(self: "Graph", value: Any) -> None:
+    setattr(self.context, name, value)
+
+  return property(getter, setter, doc=f"`{name}` of the default execution context")
+
+
 class Graph(BaseGraph):
-  def __init__(
+  # Per-chain attributes live on an ExecutionContext. These aliases target the default context used by
+  # start/resume/execute when no context is given.
+  state = _context_attribute("state")
+  buffers = _context_attribute("buffers")
+  chain_id = _context_attribute("chain_id")
+  chain_status = _context_attribute("chain_status")
+  next_execution_node = _context_attribute("next_execution_node")
+  last_executed_node = _context_attribute("last_executed_node")
+  start_from = _context_attribute("start_from")
+  executed_nodes = _context_attribute("executed_nodes")
+  detailed_execution_path = _context_attribute("detailed_execution_path")
+  execution_plan = _context_attribute("execution_plan")
+
+  def __init__(  # noqa: PLR0913
     self,
     state: Union[GraphState, None] = None,
     checkpoint_storage: Optional[StorageBackend] = None,
     chain_id: Optional[str] = None,
     execution_timeout: Union[int, float] = 60 * 5,
+    *,
+    worker_pool: Optional[WorkerPool] = None,
+    execution_mode: ExecutionMode = "plan",
+    metrics: Optional[MetricsRegistry] = None,
+    buffer_validation: ValidationMode = "full",
   ):
+    """
+    Args:
+        execution_mode: "plan" runs the compiled execution plan level by level (supports router loops and
+            interrupts). "dataflow" dispatches every node as soon as all of its predecessors are done; it
+            requires an acyclic graph without interrupts.
+        metrics: registry the engines record node, chain and checkpoint latencies into (by default the
+            process-wide one, see `get_metrics_registry`).
+        buffer_validation: how deeply node updates are type checked against the state fields: "full" (every
+            element of lists and dicts), "sampled" (a sample of the elements), "shallow" (the value itself)
+            or "off".
+    """
+    if execution_mode not in ("plan", "dataflow"):
+      raise ValueError(f"Unknown execution mode: {execution_mode}")
+    if buffer_validation not in VALIDATION_MODES:
+      raise ValueError(f"Unknown buffer validation mode: {buffer_validation}")
+    self.buffer_validation = buffer_validation
+
+    # Default execution context, used when no context is passed to the execution methods
+    self.context = ExecutionContext(chain_id=chain_id) if chain_id else ExecutionContext()
+
     super().__init__(state)
 
-    # State management
-    self.initial_state = state
-    self.state: Union[GraphState, None] = state
+    # Long-lived pool shared by every execution of this graph (and, by default, every other graph)
+    self.worker_pool = worker_pool if worker_pool is not None else get_default_worker_pool()
+    self.metrics = metrics if metrics is not None else get_metrics_registry()
+    self._metrics = get_engine_metrics(self.metrics)
+    self._metrics.watch_pool(self.worker_pool)
+
+    # State management: new contexts start from a copy taken now, never from the default context's state
+    self.initial_state = copy.deepcopy(state)
     self.state_schema = self._get_schema(state)
-    self.buffers: Dict[str, BaseBuffer] = {}
     if self.state_schema:
-      self._assign_buffers()
-      self._update_buffers_from_state()
+      self.context.buffers = self._assign_buffers()
+      self._update_buffers_from_state(self.context)
 
     # Chain management
-    self.chain_id = chain_id if chain_id else f"chain_{uuid.uuid4()}"
     self.checkpoint_storage = checkpoint_storage
-    self.chain_status = ChainStatus.IDLE
 
     # Execution management
-    self.next_execution_node: Optional[str] = None
     self.execution_timeout = execution_timeout
-    self.start_from: Optional[str] = None
-    self.executed_nodes: Set[str] = set()
-    self.blocking_execution_ids: List[
-      str
-    ] = []  # when router are ran this is used to prevent residual recursive scheduling
+    self.execution_mode = execution_mode
+
+    # Compiled plan caches, shared by every run and resume of this graph
+    self._compiled_execution_path: List[Any] = []
+    self._executable_plan_cache: Dict[int, Tuple[List[Any], List[ExecutableNode], Dict[str, int]]] = {}
+    self._route_variants: Dict[Tuple[Tuple[str, str], ...], List[Any]] = {}
+
+    # Concurrency caps and rate limiters of each node (indexed like node_table), shared by every chain
+    self._node_limiters: List[Tuple[ConcurrencyLimiter, ...]] = []
+    self._node_rate_limiters: List[Optional[TokenBucket]] = []
+
+    # Result caches of cached nodes, by original node name and by node name (repeated copies share one)
+    self._caches: Dict[str, NodeCache] = {}
+    self._node_caches: Dict[str, NodeCache] = {}
+
+    # Observed route frequencies of routers that speculate on their routes
+    self._route_stats: Dict[str, RouteStatistics] = {}
+
+    # Hedge delays and counters of hedged nodes, by original node name and by node name
+    self._hedgers: Dict[str, NodeHedger] = {}
+    self._node_hedgers: Dict[str, NodeHedger] = {}
+
+  def compile(self) -> "Graph":
+    super().compile()
+    self._compiled_execution_path = self.detailed_execution_path
+    limiters: Dict[str, ConcurrencyLimiter] = {}
+    self._node_limiters = [self._get_node_limiters(node, limiters) for node in self.node_table]
+    self._node_rate_limiters = [
+      get_rate_limiter(node.rate_limit) if node.rate_limit else None for node in self.node_table
+    ]
+    self._validate_field_declarations()
+    self._build_node_caches()
+    self._build_route_statistics()
+    self._build_hedgers()
+    self._executable_plan_cache = {}
+    self._route_variants = {}
+    self.context.route_choices = {}
+    if self.execution_mode == "dataflow":
+      self._validate_dataflow()
+    return self
+
+  @staticmethod
+  def _get_node_limiters(node: Node, limiters: Dict[str, ConcurrencyLimiter]) -> Tuple[ConcurrencyLimiter, ...]:
+    """Limiters a node must hold to run: its own cap (shared with its repeated copies) and its repeat group's."""
+    metadata = node.metadata or {}
+    limits = []
+    if node.max_concurrency:
+      limits.append((f"node:{metadata.get('original_node', node.name)}", node.max_concurrency))
+    if metadata.get("group_max_concurrency"):
+      limits.append((f"group:{metadata['repeat_group']}", metadata["group_max_concurrency"]))
+
+    # acquired in key order by every engine, so two nodes sharing limiters cannot deadlock
+    for key, limit in sorted(limits):
+      if key not in limiters:
+        limiters[key] = ConcurrencyLimiter(limit)
+    return tuple(limiters[key] for key, _ in sorted(limits))
+
+  def _validate_field_declarations(self) -> None:
+    """Check declared reads/writes name state fields, and that no two nodes able to run at the same time
+    both declare writes to a LastValue field (whichever finished last would silently win)."""
+    state_fields = set(type(self.initial_state).model_fields) if self.initial_state is not None else set()
+    for node in self.node_table:
+      unknown = (node.reads or frozenset()) | (node.writes or frozenset())
+      unknown = unknown - state_fields
+      if unknown:
+        raise ValueError(f"Node '{node.name}' declares unknown state fields: {', '.join(sorted(unknown))}")
+      if node.map is not None and node.map.over not in state_fields:
+        raise ValueError(f"Map node '{node.name}' maps over unknown state field '{node.map.over}'")
+      if node.map is not None and not isinstance(self.context.buffers.get(node.map.into), HistoryBuffer):
+        raise ValueError(f"Map node '{node.name}' must collect into a History field, got '{node.map.into}'")
+
+    last_value_fields = {name for name, buffer in self.context.buffers.items() if isinstance(buffer, LastValueBuffer)}
+    writes = {node.name: node.writes & last_value_fields for node in self.node_table if node.writes}
+    writers = [name for name, fields in writes.items() if fields]
+    for pair in self._concurrent_pairs(writers):
+      first, second = sorted(pair)
+      shared = writes[first] & writes[second]
+      if shared:
+        raise ValueError(
+          f"Nodes '{first}' and '{second}' can run in parallel and both write LastValue field(s) "
+          f"{', '.join(sorted(shared))}. Use a History or Incremental field, or order the nodes"
+        )
+
+  def _concurrent_pairs(self, node_names: List[str]) -> Iterator[Tuple[str, str]]:
+    """Pairs of the given nodes that the configured engine may run at the same time."""
+    if len(node_names) < 2:  # noqa: PLR2004
+      return
+    if self.execution_mode == "dataflow":
+      # the graph is acyclic: nodes run concurrently unless one is a descendant of the other
+      descendants = {name: self._descendants(self.node_index[name]) for name in node_names}
+      for i, first in enumerate(node_names):
+        for second in node_names[i + 1 :]:
+          if self.node_index[second] not in descendants[first] and self.node_index[first] not in descendants[second]:
+            yield first, second
+      return
 
-  def _assign_buffers(self) -> None:
+    selected = set(node_names)
+
+    def names(item: Union[NodeTask, ExecutableNode]) -> Set[str]:
+      if isinstance(item, NodeTask):
+        return {item.node_name} & selected
+      return set().union(*(names(task) for task in item.task_list))
+
+    def walk(item: Union[NodeTask, ExecutableNode]) -> Iterator[Tuple[str, str]]:
+      if isinstance(item, NodeTask):
+        return
+      if item.execution_type == "parallel":
+        branches = [names(task) for task in item.task_list]
+        for i, first_branch in enumerate(branches):
+          for second_branch in branches[i + 1 :]:
+            for first in first_branch:
+              for second in second_branch:
+                yield first, second
+      for task in item.task_list:
+        yield from walk(task)
+
+    for executable_node in self._convert_execution_plan():
+      yield from walk(executable_node)
+
+  def _descendants(self, node_id: int) -> Set[int]:
+    seen: Set[int] = set()
+    stack = list(self.node_successors[node_id])
+    while stack:
+      successor = stack.pop()
+      if successor not in seen:
+        seen.add(successor)
+        stack.extend(self.node_successors[successor])
+    return seen
+
+  def _build_node_caches(self) -> None:
+    state_fields = set(type(self.initial_state).model_fields) if self.initial_state is not None else set()
+    self._caches = {}
+    self._node_caches = {}
+    for node in self.node_table:
+      if node.cache is None:
+        continue
+      unknown = set(node.cache.key_fields or ()) - state_fields
+      if unknown:
+        raise ValueError(f"Cache key fields of node '{node.name}' are not state fields: {', '.join(sorted(unknown))}")
+      original_node = (node.metadata or {}).get("original_node", node.name)
+      if original_node not in self._caches:
+        policy = node.cache
+        if policy.key_fields is None and node.reads is not None:
+          policy = policy._replace(key_fields=tuple(sorted(node.reads)))
+        self._caches[original_node] = NodeCache(policy)
+      self._node_caches[node.name] = self._caches[original_node]
+
+  def _build_route_statistics(self) -> None:
+    self._route_stats = {}
+    for router in self.node_table:
+      metadata = router.metadata or {}
+      width = metadata.get("speculate") if router.is_router else None
+      if not width:
+        continue
+      candidates = [route for route in router.possible_routes or () if self._can_speculate(self.nodes[route])]
+      if candidates:
+        self._route_stats[router.name] = RouteStatistics(candidates, width, metadata.get("route_hints"))
+
+  def _build_hedgers(self) -> None:
+    self._hedgers = {}
+    self._node_hedgers = {}
+    for node in self.node_table:
+      if node.hedge is None:
+        continue
+      original_node = (node.metadata or {}).get("original_node", node.name)
+      if original_node not in self._hedgers:
+        self._hedgers[original_node] = NodeHedger(node.hedge)
+      self._node_hedgers[node.name] = self._hedgers[original_node]
+
+  def hedge_stats(self) -> Dict[str, HedgeStats]:
+    """Hedge rate and win rate counters of every hedged node (repeated copies are counted under the original)."""
+    return {node_name: hedger.stats() for node_name, hedger in self._hedgers.items()}
+
+  def _can_speculate(self, node: Node) -> bool:
+    """Whether a route node can be started early and thrown away without bypassing an engine guarantee."""
+    return not (
+      node.is_router
+      or node.is_subgraph
+      or node.interrupt
+      or node.executor != "thread"
+      or node.rate_limit
+      or self._node_limiters[self.node_index[node.name]]
+    )
+
+  def speculation_stats(self) -> Dict[str, SpeculationStats]:
+    """Route frequencies and speculation hit/miss counters of every speculative router."""
+    return {router: stats.stats() for router, stats in self._route_stats.items()}
+
+  def _speculate(
+    self, router: Node, token: CancellationToken, start: Callable[[Node, CancellationToken], Any]
+  ) -> Dict[str, Speculation]:
+    """Start the likely routes of a router with `start(node, token)`, each under its own cancellation token."""
+    stats = self._route_stats.get(router.name)
+    if stats is None:
+      return {}
+    speculations = {}
+    for route in stats.likely_routes():
+      route_token = token.child()
+      started_at = time.perf_counter()
+      speculations[route] = Speculation(start(self.nodes[route], route_token), route_token, started_at)
+    return speculations
+
+  def _settle_speculations(
+    self, ctx: ExecutionContext, router: Node, speculations: Dict[str, Speculation], route: Optional[str]
+  ) -> None:
+    """Stage the speculative run of the route the router picked and cancel the others.
+
+    `route` is None when the router failed, in which case every speculative run is discarded.
+    """
+    if not speculations:
+      return
+    if route is not None:
+      self._route_stats[router.name].record(route, speculations)
+    for name, speculation in speculations.items():
+      if name == route:
+        ctx.speculations[name] = speculation
+      else:
+        self._discard_speculation(speculation)
+
+  def _create_speculation_task(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> asyncio.Task:
+    task = asyncio.ensure_future(self._run_action_async(ctx, node, token))
+    # discarded runs are never awaited: retrieve their outcome so failures are not reported as unhandled
+    task.add_done_callback(lambda done: done.cancelled() or done.exception())
+    return task
+
+  @staticmethod
+  def _discard_speculation(speculation: Speculation) -> None:
+    speculation.token.cancel("route not taken")
+    speculation.future.cancel()
+
+  def cache_stats(self) -> Dict[str, CacheStats]:
+    """Hit/miss counters of every cached node (repeated copies are counted under their original node)."""
+    return {node_name: cache.stats() for node_name, cache in self._caches.items()}
+
+  def clear_cache(self, node_name: Optional[str] = None) -> None:
+    """Drop the cached results of one node, or of every node."""
+    for name, cache in self._caches.items():
+      if node_name is None or name == node_name:
+        cache.clear()
+
+  def _validate_dataflow(self) -> None:
+    if not self._is_acyclic():
+      raise ValueError("Dataflow execution requires an acyclic graph. Use execution_mode='plan' for router loops")
+    interrupted = [node.name for node in self.node_table if node.interrupt]
+    if interrupted:
+      raise ValueError(f"Dataflow execution does not support interrupts (found on {', '.join(interrupted)})")
+    if self._route_stats:
+      raise ValueError("Speculative routers are only supported in execution_mode='plan'")
+
+  def new_context(
+    self, state: Union[GraphState, None] = None, chain_id: Optional[str] = None, tracer: Optional[Tracer] = None
+  ) -> ExecutionContext:
+    """Create an execution context for a new chain on this graph.
+
+    Args:
+        state: State for the chain. If None, a fresh copy of the graph's initial state is used
+        chain_id: Optional chain id. If None, a new one is generated
+        tracer: Optional tracer recording the chain's spans (see `Tracer`)
+    """
+    ctx = ExecutionContext(chain_id=chain_id) if chain_id else ExecutionContext()
+    ctx.tracer = tracer
+    ctx.detailed_execution_path = self._compiled_execution_path
+    if self.initial_state is not None:
+      ctx.state = state if state is not None else self._reset_state()  # type: ignore
+      ctx.buffers = self._assign_buffers()
+      self._update_buffers_from_state(ctx)
+    return ctx
+
+  def _assign_buffers(self) -> Dict[str, BaseBuffer]:
     if not self.state_schema:
       raise ValueError("No state schema found. Please set state.")
 
-    self.buffers = {
-      field_name: BufferFactory.create_buffer(field_name, field_type)
+    return {
+      field_name: BufferFactory.create_buffer(field_name, field_type, self.buffer_validation)
       for field_name, field_type in self.state_schema.items()
     }
 
@@ -96,9 +468,23 @@ class Graph(BaseGraph):
       return state.__annotations__
     return None
 
-  def _convert_execution_plan(self) -> List[Any]:
-    """Converts the execution plan to a list of functions that have concurrency flags"""
+  def _convert_execution_plan(self, ctx: Optional[ExecutionContext] = None) -> List[Any]:
+    """Converts the execution plan to a list of functions that have concurrency flags.
+
+    Plans are cached per detailed execution path object, which is never mutated in place, so the
+    conversion runs once per compiled path or router variant.
+    """
     self._force_compile()
+    ctx = ctx or self.context
+
+    cached = self._executable_plan_cache.get(id(ctx.detailed_execution_path))
+    if cached is not None and cached[0] is ctx.detailed_execution_path:
+      ctx.execution_plan = cached[1]
+      return ctx.execution_plan
+
+    def create_node_task(node_name: str) -> NodeTask:
+      node_id = self.node_index[node_name]
+      return NodeTask(node_id=node_id, node_name=node_name, action=self.node_table[node_id].action)
 
     def create_executable_node(
       exec_plan_item: Union[tuple, List[Any], None],
@@ -109,13 +495,13 @@ class Graph(BaseGraph):
         return ExecutableNode(
           node_name=node_name,
           node_list=[node_name],
-          task_list=[self.nodes[node_name].action],
+          task_list=[create_node_task(node_name)],
           execution_type="sequential",
           interrupt=self.nodes[node_name].interrupt,
         )
       # Handle lists (parallel or sequential groups)
       elif isinstance(exec_plan_item, list):
-        tasks: List[Union[Callable, ExecutableNode]] = []
+        tasks: List[Union[NodeTask, ExecutableNode]] = []
         node_names = []
         parent_names = []
 
@@ -123,7 +509,7 @@ class Graph(BaseGraph):
         for item in exec_plan_item:
           if isinstance(item, tuple):
             parent_node, node_name = item
-            tasks.append(self.nodes[node_name].action)
+            tasks.append(create_node_task(node_name))
             node_names.append(node_name)
             parent_names.append(parent_node)
           elif isinstance(item, list):
@@ -174,144 +560,220 @@ class Graph(BaseGraph):
       else:
         raise ValueError(f"Expected tuple or list, got {type(exec_plan_item)}")
 
-    if not self.detailed_execution_path or any(item is None for item in self.detailed_execution_path):
+    if not ctx.detailed_execution_path or any(item is None for item in ctx.detailed_execution_path):
       raise ValueError("No execution plan found. Please set detailed_execution_path.")
 
-    self.execution_plan = [create_executable_node(item) for item in self.detailed_execution_path]
+    def collect_positions(task: Union[NodeTask, ExecutableNode], position: int, positions: Dict[str, int]) -> None:
+      if isinstance(task, ExecutableNode):
+        for sub_task in task.task_list:
+          collect_positions(sub_task, position, positions)
+      else:
+        positions.setdefault(task.node_name, position)
+
+    ctx.execution_plan = [create_executable_node(item) for item in ctx.detailed_execution_path]
+    positions: Dict[str, int] = {}
+    for position, executable_node in enumerate(ctx.execution_plan):
+      collect_positions(executable_node, position, positions)
+    self._executable_plan_cache[id(ctx.detailed_execution_path)] = (
+      ctx.detailed_execution_path,
+      ctx.execution_plan,
+      positions,
+    )
+
+    return ctx.execution_plan
+
+  def _plan_position(self, ctx: ExecutionContext, node_name: Optional[str]) -> int:
+    """Index of the top-level plan step containing `node_name` (0 when unknown) in the context's plan."""
+    self._convert_execution_plan(ctx)
+    if node_name is None:
+      return 0
+    return self._executable_plan_cache[id(ctx.detailed_execution_path)][2].get(node_name, 0)
+
+  @staticmethod
+  def _validate_route(node: Node, result: Any) -> None:
+    if not result or not isinstance(result, str):
+      raise ValueError(f"Router node '{node.name}' must return a valid node name")
+
+    # Validate the returned route
+    possible_routes = node.possible_routes
+    if possible_routes is None or result not in possible_routes:
+      raise ValueError(f"Router node '{node.name}' returned invalid route: {result}")
+
+  def _route_to(self, ctx: ExecutionContext, router_node: str, route: str) -> None:
+    """Point the context at the path chosen by a router.
+
+    The running scheduler notices `pending_route`, unwinds the current step and continues from the
+    first node of the chosen path instead of recursing into a new execution.
+    """
+    chosen_path: List[str] = self.router_paths.get(router_node, {}).get(route, [])
+    if not chosen_path:
+      return
+
+    # Update execution plan to only include the chosen path
+    self._update_execution_plan(ctx, router_node, route)
 
-    return self.execution_plan
+    # Clear executed nodes if the chosen path - including the router node - contains previously executed nodes
+    if any(node in ctx.executed_nodes for node in chosen_path):
+      ctx.executed_nodes.clear()
+
+    ctx.start_from = chosen_path[0]
+    ctx.pending_route = chosen_path[0]
+    if ctx.tracer is not None:
+      ctx.tracer.instant(f"{router_node} -> {route}", "router", chain_id=ctx.chain_id, router=router_node, route=route)
 
   def _get_chain_status(self) -> ChainStatus:
-    return self.chain_status
+    return self.context.chain_status
 
-  def _clean_graph_variables(self, new_state: Union[BaseModel, None] = None) -> None:
+  def _clean_graph_variables(self, ctx: ExecutionContext, new_state: Union[BaseModel, None] = None) -> None:
     # One-off set up variables
-    self.next_execution_node = None
-    self.executed_nodes = set()
-    self.start_from = None
-    self.last_executed_node = None
-    self.chain_status = ChainStatus.IDLE
+    ctx.next_execution_node = None
+    ctx.executed_nodes = set()
+    ctx.start_from = None
+    ctx.last_executed_node = None
+    ctx.chain_status = ChainStatus.IDLE
 
     # reseting routes and execution paths back to compile state
-    self.blocking_execution_ids = []
-    self.router_paths = self._analyze_router_paths()
-    self.detailed_execution_path = self._find_execution_paths()
+    ctx.pending_route = None
+    ctx.route_choices = {}
+    for speculation in ctx.speculations.values():
+      self._discard_speculation(speculation)
+    ctx.speculations = {}
+    ctx.detailed_execution_path = self._compiled_execution_path
 
     # Re-assign buffers and reset state
     if self.state_schema:
-      self._assign_buffers()
+      ctx.buffers = self._assign_buffers()
 
     # Reset state to first assigned state (from graph init)
     self._reset_state(new_state)
 
-  def _update_chain_status(self, status: ChainStatus) -> None:
-    self.chain_status = status
+  def _update_chain_status(self, ctx: ExecutionContext, status: ChainStatus) -> None:
+    ctx.chain_status = status
     logger.debug(f"Chain status updated to: {status}")
 
   @internal_only
-  def _update_state_from_buffers(self) -> None:
-    for field_name, buffer in self.buffers.items():
-      if buffer._ready_for_consumption:
-        setattr(self.state, field_name, buffer.consume_last_value())
+  def _update_state_from_buffers(self, ctx: ExecutionContext) -> None:
+    with self._span(ctx, "merge buffers", "buffers"):
+      for field_name, buffer in ctx.buffers.items():
+        if buffer._ready_for_consumption:
+          setattr(ctx.state, field_name, buffer.consume_last_value())
 
   @internal_only
-  def _update_buffers_from_state(self) -> None:
-    for field_name, buffer in self.buffers.items():
-      buffer.set_value(getattr(self.state, field_name))
+  def _update_buffers_from_state(self, ctx: ExecutionContext) -> None:
+    for field_name, buffer in ctx.buffers.items():
+      buffer.set_value(getattr(ctx.state, field_name))
 
-  def _save_checkpoint(self, node_name: str) -> None:
-    if self.state and self.checkpoint_storage:
+  def _save_checkpoint(self, node_name: str, ctx: Optional[ExecutionContext] = None) -> None:
+    ctx = ctx or self.context
+    if ctx.state and self.checkpoint_storage:
       checkpoint_data = CheckpointData(
-        chain_id=self.chain_id,
-        chain_status=self.chain_status,
-        next_execution_node=self.next_execution_node,
-        executed_nodes=self.executed_nodes,
-      )
-      self.checkpoint_storage.save_checkpoint(
-        state_instance=self.state,
-        checkpoint_data=checkpoint_data,
+        chain_id=ctx.chain_id,
+        chain_status=ctx.chain_status,
+        next_execution_node=ctx.next_execution_node,
+        executed_nodes=ctx.executed_nodes,
       )
+      # storage backends record their serialization and write spans into the active tracer
+      started_at = time.perf_counter()
+      with self._span(ctx, "checkpoint", "checkpoint", node=node_name), activate(ctx.tracer):
+        self.checkpoint_storage.save_checkpoint(
+          state_instance=ctx.state,
+          checkpoint_data=checkpoint_data,
+        )
+      backend = type(self.checkpoint_storage).__name__
+      self._metrics.checkpoint_save.labels(backend).observe(time.perf_counter() - started_at)
     logger.debug(f"Checkpoint saved after node: {node_name}")
 
-  @internal_only
-  def _is_blocking_execution(self, execution_id: str) -> bool:
-    return execution_id in self.blocking_execution_ids
-
   @internal_only
   def _get_interrupt_status(self, node_name: str) -> Union[Literal["before", "after"], None]:
     return self.nodes[node_name].interrupt
 
   @internal_only
-  def _execute(self, start_from: Optional[str] = None, timeout: Union[int, float] = 60 * 5) -> None:
+  def _execute(
+    self, ctx: ExecutionContext, start_from: Optional[str] = None, timeout: Union[int, float] = 60 * 5
+  ) -> None:
     """Execute the graph with concurrent and sequential execution based on the execution plan.
 
     Args:
+        ctx: execution context of the chain being run
         start_from: node name to start execution from
         timeout: maximum execution time in seconds
     """
-    execution_id = f"exec_{uuid.uuid4().hex[:8]}"
+    if self.execution_mode == "dataflow":
+      self._execute_dataflow(ctx, timeout)
+      return
 
-    def execute_task(task: Callable, node_name: str) -> Any:
+    def execute_task(task: NodeTask, token: CancellationToken) -> Any:  # noqa: PLR0912
       """Execute a single task with proper state handling."""
+      node_name = task.node_name
+      node = self.node_table[task.node_id]
 
       # added this way to have access to class .self
       def run_task() -> Any:
         # prevent execution when in routing mode
-        if execution_id in self.blocking_execution_ids:
+        if ctx.pending_route is not None:
           return
+        token.raise_if_cancelled()  # the group failed while this node was queued
+
+        started_at = time.perf_counter()
+        result = self._run_action(ctx, node, token)
+        token.raise_if_cancelled()  # an abandoned run (timed out, past the deadline) must not write into the buffers
+        return self._apply_node_result(ctx, node, result, started_at)
+
+      # process and hedged nodes run off the branch driver and have their result applied here
+      runs_detached = node.executor == "process" or node_name in self._node_hedgers
+      if runs_detached and ctx.pending_route is not None:
+        return  # prevent execution when in routing mode
+      token.raise_if_cancelled()
+
+      # a router that speculated on this node and then picked it left the run staged: commit it instead
+      staged = ctx.speculations.pop(node_name, None)
+      if staged is not None and ctx.pending_route is not None:
+        self._discard_speculation(staged)
+        return  # prevent execution when in routing mode
+      speculations = (
+        self._speculate(node, token, functools.partial(self._start_action, ctx)) if node.is_router else {}
+      )
+      result: Any = None
+      try:
+        # waits here (in the branch driver, never in a pool worker) while the node's concurrency caps are full
+        with hold(self._node_limiters[task.node_id], self._time_left(ctx, timeout)):
+          if staged is not None:
+            future, started_at = staged.future, staged.started_at
+          else:
+            self._throttle(task.node_id, token)
+            started_at = time.perf_counter()
+            future = self._start_action(ctx, node, token) if runs_detached else self.worker_pool.submit(run_task)
+          try:
+            result = future.result(timeout=self._time_left(ctx, timeout))
+          except concurrent.futures.TimeoutError as e:
+            self._abandon_action(node, future)
+            if self._past_deadline(ctx):
+              raise DeadlineExceededError(f"Deadline exceeded in node {node_name}") from e
+            logger.error(f"Timeout in node {node_name}")
+            raise TimeoutError(f"Execution timeout in node {node_name}") from e
+      except SlotTimeoutError as e:
+        if self._past_deadline(ctx):
+          raise DeadlineExceededError(f"Deadline exceeded waiting for a concurrency slot of node {node_name}") from e
+        logger.error(f"Timeout waiting for a concurrency slot of node {node_name}")
+        raise TimeoutError(f"Execution timeout in node {node_name}") from e
+      finally:
+        self._settle_speculations(ctx, node, speculations, result)
 
-        result = task(state=self.state) if self._has_state else task()
-
-        # Handle router node results
-        if self.nodes[node_name].is_router:
-          if not result or not isinstance(result, str):
-            raise ValueError(f"Router node '{node_name}' must return a valid node name")
-
-          # Validate the returned route
-          possible_routes = self.nodes[node_name].possible_routes
-          if possible_routes is None or result not in possible_routes:
-            raise ValueError(f"Router node '{node_name}' returned invalid route: {result}")
-
-          # Get the path for this route
-          router_paths = self.router_paths.get(node_name, {})
-          chosen_path: List[str] = router_paths.get(result, [])
-
-          if chosen_path:
-            # Update execution plan to only include the chosen path
-            self._update_execution_plan(node_name, result)
-
-            # Clear executed nodes if the chosen path - including the router node -
-            # contains previously executed nodes
-            if any(node in self.executed_nodes for node in chosen_path):
-              self.executed_nodes.clear()
-
-            # Set start_from to the first node in the chosen path
-            self.start_from = chosen_path[0]
-
-            # store execution_id for later checks
-            self.blocking_execution_ids.append(execution_id)
-
-            self._execute(start_from=chosen_path[0])
-            return  # Exit this task
+      if runs_detached or staged is not None:
+        # detached and speculative results are applied in this thread, through the same buffer path
+        result = self._apply_node_result(ctx, node, result, started_at)
 
-        elif result and self._has_state:
-          for state_field_name, state_field_value in result.items():
-            self.buffers[state_field_name].update(state_field_value, node_name)
+      self._update_state_from_buffers(ctx)
+      # Only add to executed_nodes if it's not a router node
+      if not node.is_router:
+        ctx.executed_nodes.add(node_name)
         return result
 
-      with concurrent.futures.ThreadPoolExecutor() as executor:
-        future = executor.submit(run_task)
-        try:
-          result = future.result(timeout=timeout)
-          self._update_state_from_buffers()
-          # Only add to executed_nodes if it's not a router node
-          if not self.nodes[node_name].is_router:
-            self.executed_nodes.add(node_name)
-          return result
-        except concurrent.futures.TimeoutError as e:
-          future.cancel()
-          logger.error(f"Timeout in node {node_name}")
-          raise TimeoutError(f"Execution timeout in node {node_name}") from e
+      if result is not None:
+        self._route_to(ctx, node_name, result)
+        if ctx.pending_route is not None:
+          return  # the scheduler continues from the chosen path
+      return result
 
     def add_item_to_obj_store(obj_store: Union[List, Tuple], item: Any) -> Union[List, Tuple]:
       if isinstance(obj_store, list):
@@ -344,40 +806,60 @@ class Graph(BaseGraph):
     def execute_node(node: ExecutableNode, node_index: int) -> None:
       """Execute a single node or group of nodes with proper concurrency handling."""
 
-      def execute_tasks(tasks: Union[List, Tuple], node_index: int) -> None:  # noqa: PLR0911, PLR0912
-        """Recursively execute tasks respecting list (sequential) and tuple (parallel) structures"""
-        if self._is_blocking_execution(execution_id):
-          return  # Skip execution if we're restarting
+      def execute_tasks(  # noqa: PLR0911, PLR0912
+        tasks: Union[List, Tuple], node_index: int, token: CancellationToken
+      ) -> None:
+        """Recursively execute tasks respecting list (sequential) and tuple (parallel) structures.
+
+        `token` is the cancellation token of the enclosing parallel group (the chain's at the top level).
+        """
+        if ctx.pending_route is not None:
+          return  # Skip execution if a router is moving the chain elsewhere
 
         if isinstance(tasks, (list, tuple)):
           if isinstance(tasks, list):
             # Sequential execution
             for task in tasks:
-              if self._is_blocking_execution(execution_id):
-                return  # Exit early if restarting
-              execute_tasks(task, node_index)
-
-              # this avoids that tasks that turned into blocked_execution after execute_tasks execution
-              # are not saved as checkpoints
-              if not self._is_blocking_execution(execution_id):
+              if ctx.pending_route is not None:
+                return  # Exit early if rerouting
+              token.raise_if_cancelled()
+              execute_tasks(task, node_index, token)
+
+              # this avoids that tasks that triggered a reroute after execute_tasks execution
+              # are saved as checkpoints
+              if ctx.pending_route is None:
                 # TODO: when a router node choses a path, it's saving 1 addiotional checkpoint.
                 # Not big deal but should be fixed
-                self._save_checkpoint(self.execution_plan[node_index].node_name)
+                self._save_checkpoint(ctx.execution_plan[node_index].node_name, ctx)
           else:
-            # Parallel execution using concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-              futures = []
-              for task in tasks:
-                if self._is_blocking_execution(execution_id):
-                  return  # Exit early if restarting
-                futures.append(executor.submit(execute_tasks, task, node_index))
+            # Parallel execution on the shared worker pool
+            group = token.child()
+            failures: List[Exception] = []
+
+            def run_branch(branch: Any) -> None:
+              try:
+                execute_tasks(branch, node_index, group)
+              except ChainCancelledError:
+                raise
+              except Exception as e:
+                # Fail fast: siblings stop at their next cancellation check, including one the pool
+                # runs inline in this thread
+                failures.append(e)
+                group.cancel(f"sibling branch failed: {e!r}")
+                raise
+
+            self._metrics.group_width.observe(len(tasks))
+            with self._span(ctx, "parallel group", "group", branches=len(tasks)):
+              futures = self.worker_pool.run_branches([functools.partial(run_branch, task) for task in tasks])
 
               # Wait for all futures to complete
               for future in concurrent.futures.as_completed(futures):
-                if self._is_blocking_execution(execution_id):
-                  # Cancel remaining futures if restarting
+                if ctx.pending_route is not None:
+                  # Cancel remaining futures and let running branches stop at their next task,
+                  # so nothing from this step runs once the chain has moved on
                   for f in futures:
                     f.cancel()
+                  concurrent.futures.wait(futures, timeout=timeout)
                   return
                 try:
                   future.result(timeout=timeout)
@@ -385,128 +867,738 @@ class Graph(BaseGraph):
                   # Cancel remaining futures
                   for f in futures:
                     f.cancel()
-                  raise e
+                  # siblings stopped by the group's cancellation fail too: report the branch that failed first
+                  if failures and failures[0] is not e:
+                    raise failures[0] from None
+                  raise
 
-              self._save_checkpoint(self.execution_plan[node_index].node_name)
+            self._save_checkpoint(ctx.execution_plan[node_index].node_name, ctx)
         else:
           # Base case: execute individual task
-          node_name = next(
-            (name for name, node in self.nodes.items() if node.action == tasks),
-            str(tasks),  # fallback to str(tasks) if not found
-          )
+          node_name = tasks.node_name
 
           # Skip if node was already executed
-          if node_name in self.executed_nodes:
+          if node_name in ctx.executed_nodes:
             return
 
           # Handle before interrupts
           if (
             not isinstance(node_name, list)
             and self._get_interrupt_status(node_name) == "before"
-            and not self.start_from
+            and not ctx.start_from
           ):
-            self.next_execution_node = node_name
-            self._update_chain_status(ChainStatus.PAUSE)
+            ctx.next_execution_node = node_name
+            self._update_chain_status(ctx, ChainStatus.PAUSE)
             return
 
           # Skip nodes until we reach start_from
-          if self.start_from and self.start_from != node_name:
+          if ctx.start_from and ctx.start_from != node_name:
             return
 
           # Cleaning up once start_from is reached
-          if self.start_from == node_name:
-            self.start_from = None
-            self._update_chain_status(ChainStatus.RUNNING)
+          if ctx.start_from == node_name:
+            ctx.start_from = None
+            self._update_chain_status(ctx, ChainStatus.RUNNING)
 
           try:
             # Execute the task
-            result = execute_task(tasks, node_name)
-            self.last_executed_node = node_name
+            result = execute_task(tasks, token)
+            ctx.last_executed_node = node_name
 
             # Handle after interrupts
             if not isinstance(node_name, list) and self._get_interrupt_status(node_name) == "after":
-              if not self.start_from:
-                self.next_execution_node = self.execution_plan[node_index + 1].node_name
-                self._update_chain_status(ChainStatus.PAUSE)
+              if not ctx.start_from:
+                ctx.next_execution_node = ctx.execution_plan[node_index + 1].node_name
+                self._update_chain_status(ctx, ChainStatus.PAUSE)
                 return
               else:
-                self.start_from = None
-                self._update_chain_status(ChainStatus.RUNNING)
+                ctx.start_from = None
+                self._update_chain_status(ctx, ChainStatus.RUNNING)
 
             return result
 
           except concurrent.futures.TimeoutError as e:
             logger.error(f"Timeout in node {node_name}")
             raise TimeoutError(f"Execution timeout in node {node_name}") from e
+          except ChainCancelledError:
+            raise
           except Exception as e:
             logger.error(f"Error in node {node_name}: {e!s}")
             raise RuntimeError(f"Error in node {node_name}: {e!s}") from e
 
-      # Extract and execute tasks
-      if self._is_blocking_execution(execution_id):
-        return  # Skip any remaining executions from previous path
-
       tasks = extract_tasks_from_node(node)
-      execute_tasks(tasks, node_index)
-
-    self._convert_execution_plan()
-    self._update_chain_status(ChainStatus.RUNNING)
-    self.start_from = start_from
-    for node_index, node in enumerate(self.execution_plan):
-      # prevent execution when in routing mode
-      if self._is_blocking_execution(execution_id):
+      execute_tasks(tasks, node_index, ctx.cancellation)
+
+    self._update_chain_status(ctx, ChainStatus.RUNNING)
+    ctx.start_from = start_from
+    ctx.pending_route = None
+    node_index = self._plan_position(ctx, start_from)
+    while node_index < len(ctx.execution_plan) and ctx.chain_status == ChainStatus.RUNNING:
+      try:
+        execute_node(ctx.execution_plan[node_index], node_index)
+      except DeadlineExceededError:
+        if ctx.on_deadline != "pause":
+          raise
+        self._pause_at_deadline(ctx, ctx.execution_plan[node_index])
         return
 
-      if self.chain_status == ChainStatus.RUNNING:
-        execute_node(node, node_index)
+      if ctx.pending_route is not None:
+        # A router chose a path: move the program counter to it
+        node_index = self._plan_position(ctx, ctx.pending_route)
+        ctx.pending_route = None
       else:
-        return
+        node_index += 1
+
+  @staticmethod
+  def _time_left(ctx: ExecutionContext, timeout: float) -> float:
+    """`timeout`, cut short by what is left of the chain's deadline budget."""
+    if ctx.deadline is None:
+      return timeout
+    return max(0.0, min(timeout, ctx.deadline - time.monotonic()))
+
+  @staticmethod
+  def _past_deadline(ctx: ExecutionContext) -> bool:
+    return ctx.deadline is not None and time.monotonic() >= ctx.deadline
+
+  def _arm_deadline(self, ctx: ExecutionContext, deadline: Optional[float]) -> Optional[int]:
+    """Start the chain's deadline budget: the central timer cancels the chain's token when it runs out."""
+    ctx.deadline = None if deadline is None else time.monotonic() + deadline
+    if ctx.deadline is None:
+      return None
+    if ctx.on_deadline == "pause" and self.execution_mode == "dataflow":
+      raise ValueError("on_deadline='pause' requires execution_mode='plan'")
+    token = ctx.cancellation
+    return get_deadline_timer().schedule(ctx.deadline, lambda: token.cancel("deadline exceeded", DeadlineExceededError))
+
+  def _pause_at_deadline(self, ctx: ExecutionContext, step: ExecutableNode) -> None:
+    """Pause a chain whose budget ran out during plan step `step`. `resume` continues from the step's first
+    unfinished node; nodes that finished before the deadline are not run again."""
+    ctx.cancellation.cancel("deadline exceeded", DeadlineExceededError)
+    ctx.pending_route = None
+    ctx.next_execution_node = next((name for name in step.node_list if name not in ctx.executed_nodes), step.node_name)
+    self._update_chain_status(ctx, ChainStatus.PAUSE)
+    self._save_checkpoint(ctx.next_execution_node, ctx)
+    logger.info(f"Chain {ctx.chain_id} paused at its deadline before node {ctx.next_execution_node}")
+
+  @staticmethod
+  def _span(ctx: ExecutionContext, name: str, category: str, **args: Any) -> ContextManager[None]:
+    return ctx.tracer.span(name, category, **args) if ctx.tracer is not None else NO_SPAN
+
+  def _node_state(self, ctx: ExecutionContext, node: Node) -> Any:
+    """The state a node is called with: a read-only view of its declared reads, or the full state."""
+    if node.reads is not None and ctx.state is not None:
+      return StateView(ctx.state, node.reads)
+    return ctx.state
+
+  def _action_kwargs(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"state": self._node_state(ctx, node)} if self._has_state else {}
+    if node.accepts_context:
+      kwargs["context"] = NodeContext(ctx.chain_id, node.name, token, ctx.deadline)
+    return kwargs
+
+  def _start_action(
+    self, ctx: ExecutionContext, node: Node, token: Optional[CancellationToken] = None
+  ) -> concurrent.futures.Future:
+    """Start a node's action on the worker pool (or process pool). The future holds the raw result."""
+    if node.executor == "process":
+      return self._submit_process_action(ctx, node)
+    if node.name in self._node_hedgers:
+      return self._start_hedged(ctx, node, token or ctx.cancellation)
+    return self.worker_pool.submit(self._run_action, ctx, node, token or ctx.cancellation)
+
+  def _start_hedged(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> concurrent.futures.Future:
+    """Start a hedged sync node. A timer starts a second attempt if the first is still running after the hedge
+    delay; the returned future takes the first attempt to succeed (or the last error) and the other is cancelled.
+    """
+    hedger = self._node_hedgers[node.name]
+    outcome: concurrent.futures.Future = concurrent.futures.Future()
+    attempts: List[Tuple[concurrent.futures.Future, CancellationToken, float]] = []
+    lock = threading.RLock()  # attempts that finish immediately settle from inside launch()
+
+    def launch() -> None:
+      attempt_token = token.child()
+      future = self.worker_pool.submit(self._run_action, ctx, node, attempt_token)
+      attempts.append((future, attempt_token, time.perf_counter()))
+      future.add_done_callback(settle)
+
+    def hedge() -> None:
+      with lock:
+        if not outcome.done() and not token.cancelled:
+          launch()
+
+    def settle(done: concurrent.futures.Future) -> None:
+      with lock:
+        if outcome.done():
+          return
+        error = concurrent.futures.CancelledError() if done.cancelled() else done.exception()
+        if error is not None and any(not future.done() for future, _, _ in attempts):
+          return  # the other attempt may still succeed
+        timer.cancel()
+        if error is not None:
+          outcome.set_exception(error)
+        else:
+          winner = next(index for index, (future, _, _) in enumerate(attempts) if future is done)
+          hedger.record(time.perf_counter() - attempts[winner][2], len(attempts) > 1, winner > 0)
+          outcome.set_result(done.result())
+
+    def discard_losers(_: concurrent.futures.Future) -> None:
+      timer.cancel()
+      with lock:
+        for future, attempt_token, _started in attempts:
+          if not future.done():
+            attempt_token.cancel(f"hedged node '{node.name}' finished")
+            future.cancel()
+
+    delay = hedger.delay()
+    timer = threading.Timer(delay if delay is not None else 0.0, hedge)
+    timer.daemon = True
+    with lock:
+      launch()
+    if delay is not None and not outcome.done():
+      timer.start()
+    outcome.add_done_callback(discard_losers)
+    return outcome
+
+  def _run_action(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> Any:
+    """Run a sync node action in the calling thread, through the node's result cache if it has one."""
+    cache = self._node_caches.get(node.name)
+    if cache is None:
+      return self._call_action(ctx, node, token)
+    key = cache.key(ctx.state)
+    hit, result = cache.get(key)
+    if not hit:
+      result = self._call_action(ctx, node, token)
+      cache.put(key, result)
+    return result
+
+  def _call_action(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> Any:
+    with self._span(ctx, node.name, "action", chain_id=ctx.chain_id):
+      if node.map is not None:
+        return self._run_map(ctx, node, node.map, token)
+      return node.action(**self._action_kwargs(ctx, node, token))
+
+  def _run_map(self, ctx: ExecutionContext, node: Node, spec: MapSpec, token: CancellationToken) -> Dict[str, Any]:
+    """Call a map node's function for every item of its `over` field and collect the results in item order.
+
+    Chunks are pulled by up to `max_concurrency` branch workers (the calling thread is one of them, so a
+    saturated pool cannot deadlock). The first failing item cancels the remaining chunks.
+    """
+    items = list(getattr(ctx.state, spec.over))
+    if not items:
+      return {spec.into: []}
+    chunks = iter(chunk_ranges(len(items), spec.chunk_size))
+    results: List[Any] = [None] * len(items)
+    group = token.child()
+    kwargs = self._action_kwargs(ctx, node, group)
+    lock = threading.Lock()
+
+    def worker() -> None:
+      try:
+        while True:
+          with lock:
+            chunk = next(chunks, None)
+          if chunk is None:
+            return
+          for index in chunk:
+            group.raise_if_cancelled()
+            results[index] = node.action(item=items[index], **kwargs)
+      except Exception as e:
+        group.cancel(f"map node '{node.name}' failed: {e}")
+        raise
+
+    width = min(spec.max_concurrency or len(items), math.ceil(len(items) / spec.chunk_size))
+    futures = self.worker_pool.run_branches([worker] * width)
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+      # report the item that failed rather than workers stopped by the group's cancellation
+      raise next((e for e in errors if not isinstance(e, ChainCancelledError)), errors[0])  # type: ignore[misc]
+    return {spec.into: results}
+
+  async def _run_map_async(
+    self, ctx: ExecutionContext, node: Node, spec: MapSpec, token: CancellationToken
+  ) -> Dict[str, Any]:
+    """Async counterpart of `_run_map`. Chunks of a sync function run on the worker pool."""
+    items = list(getattr(ctx.state, spec.over))
+    if not items:
+      return {spec.into: []}
+    chunks = iter(chunk_ranges(len(items), spec.chunk_size))
+    results: List[Any] = [None] * len(items)
+    group = token.child()
+    kwargs = self._action_kwargs(ctx, node, group)
+    loop = asyncio.get_running_loop()
+
+    def run_chunk(chunk: range) -> None:
+      for index in chunk:
+        group.raise_if_cancelled()
+        results[index] = node.action(item=items[index], **kwargs)
+
+    async def worker() -> None:
+      for chunk in chunks:
+        if not inspect.iscoroutinefunction(node.action):
+          await loop.run_in_executor(self.worker_pool.executor, run_chunk, chunk)
+          continue
+        for index in chunk:
+          results[index] = await node.action(item=items[index], **kwargs)
+
+    width = min(spec.max_concurrency or len(items), math.ceil(len(items) / spec.chunk_size))
+    await self._run_group([worker() for _ in range(width)], group)
+    return {spec.into: results}
+
+  def _submit_process_action(self, ctx: ExecutionContext, node: Node) -> concurrent.futures.Future:
+    # the worker gets a pickled copy of the state; its returned dict is applied by the caller
+    cache = self._node_caches.get(node.name)
+    if cache is None:
+      return self.worker_pool.submit_process(_call_action, node.action, self._node_state(ctx, node))
+
+    key = cache.key(ctx.state)
+    hit, result = cache.get(key)
+    if hit:
+      future: concurrent.futures.Future = concurrent.futures.Future()
+      future.set_result(result)
+      return future
+
+    def store(done: concurrent.futures.Future) -> None:
+      if not done.cancelled() and done.exception() is None:
+        cache.put(key, done.result())
+
+    future = self.worker_pool.submit_process(_call_action, node.action, self._node_state(ctx, node))
+    future.add_done_callback(store)
+    return future
+
+  async def _run_action_async(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> Any:
+    """Run a node's action from the event loop (through its result cache, if any) and return its raw result."""
+    if node.name in self._node_hedgers:
+      return await self._run_hedged_async(ctx, node, token)
+    return await self._run_attempt_async(ctx, node, token)
+
+  async def _run_hedged_async(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> Any:
+    """Async counterpart of `_start_hedged`: attempts are tasks, and the loser is cancelled when one succeeds."""
+    hedger = self._node_hedgers[node.name]
+    attempts: Dict[asyncio.Task, Tuple[CancellationToken, float]] = {}
+
+    def launch() -> asyncio.Task:
+      attempt_token = token.child()
+      task = asyncio.ensure_future(self._run_attempt_async(ctx, node, attempt_token))
+      attempts[task] = (attempt_token, time.perf_counter())
+      return task
+
+    try:
+      first = launch()
+      delay = hedger.delay()
+      if delay is not None:
+        await asyncio.wait({first}, timeout=delay)
+        if not first.done():
+          launch()
+      pending = set(attempts)
+      while True:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        winner = next((task for task in done if not task.cancelled() and task.exception() is None), None)
+        if winner is not None:
+          hedger.record(time.perf_counter() - attempts[winner][1], len(attempts) > 1, winner is not first)
+          return winner.result()
+        if not pending:
+          return next(iter(done)).result()  # every attempt failed: raise the last error
+    finally:
+      for task, (attempt_token, _) in attempts.items():
+        if not task.done():
+          attempt_token.cancel(f"hedged node '{node.name}' finished")
+          task.cancel()
+
+  async def _run_attempt_async(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> Any:
+    if node.executor == "process":
+      future = self._submit_process_action(ctx, node)
+      try:
+        return await asyncio.wrap_future(future)
+      except asyncio.CancelledError:
+        # timed out or abandoned: stop the worker instead of leaving it running the call
+        self.worker_pool.kill_process(future)
+        raise
+    cache = self._node_caches.get(node.name)
+    if cache is None:
+      return await self._call_action_async(ctx, node, token)
+    key = cache.key(ctx.state)
+    hit, result = cache.get(key)
+    if not hit:
+      result = await self._call_action_async(ctx, node, token)
+      cache.put(key, result)
+    return result
+
+  async def _call_action_async(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> Any:
+    with self._span(ctx, node.name, "action", chain_id=ctx.chain_id):
+      return await self._call_node_async(ctx, node, token)
+
+  async def _call_node_async(self, ctx: ExecutionContext, node: Node, token: CancellationToken) -> Any:
+    if node.map is not None:
+      return await self._run_map_async(ctx, node, node.map, token)
+    kwargs = self._action_kwargs(ctx, node, token)
+    if inspect.iscoroutinefunction(node.action):
+      # Handle async functions
+      result = await node.action(**kwargs)
+      # Ensure we're getting the actual result, not a coroutine
+      if inspect.iscoroutine(result):
+        result = await result
+      return result
+    # Handle CPU-bound sync functions by running them on the shared worker pool
+    return await asyncio.get_running_loop().run_in_executor(
+      self.worker_pool.executor, functools.partial(node.action, **kwargs)
+    )
+
+  @staticmethod
+  async def _run_group(coroutines: List[Any], group: CancellationToken) -> None:
+    """Run the branches of a parallel group as tasks. On the first failure the remaining tasks are cancelled
+    (and the group's token, for sync nodes running in pool threads) before the error is re-raised."""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+      await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+      errors = [task.exception() for task in tasks if task.done() and not task.cancelled() and task.exception()]
+      if errors:
+        # report the branch that failed rather than siblings stopped by the group's cancellation
+        raise next((e for e in errors if not isinstance(e, ChainCancelledError)), errors[0])  # type: ignore[misc]
+    finally:
+      pending = [task for task in tasks if not task.done()]
+      if pending:
+        group.cancel("sibling branch failed")
+        for task in pending:
+          task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+  def _throttle(self, node_id: int, token: CancellationToken) -> None:
+    """Wait (in the calling branch driver, never a pool worker) for the node's rate limiter, if any."""
+    bucket = self._node_rate_limiters[node_id]
+    wait = bucket.reserve() if bucket else 0
+    if wait and token.wait(wait):
+      token.raise_if_cancelled()
+
+  async def _throttle_async(
+    self, ctx: ExecutionContext, node_id: int, token: CancellationToken, timeout: float
+  ) -> None:
+    """Async `_throttle`. The wait is bounded by `timeout` (see `_time_left`) and ends early on cancellation."""
+    bucket = self._node_rate_limiters[node_id]
+    wait = bucket.reserve() if bucket else 0
+    if not wait:
+      return
+    cancelled = await token.wait_async(min(wait, timeout))
+    if wait > timeout or self._past_deadline(ctx):
+      node_name = self.node_table[node_id].name
+      if self._past_deadline(ctx):
+        raise DeadlineExceededError(f"Deadline exceeded waiting for the rate limiter of node {node_name}")
+      raise asyncio.TimeoutError(f"Timeout waiting for the rate limiter of node {node_name}")
+    if cancelled:
+      token.raise_if_cancelled()
+
+  def _abandon_action(self, node: Node, future: concurrent.futures.Future) -> None:
+    """Give up on a node that timed out. Threads cannot be stopped, the worker process of a process node is."""
+    if node.executor == "process":
+      self.worker_pool.kill_process(future)
+    else:
+      future.cancel()
+
+  async def _run_dataflow_node_async(self, ctx: ExecutionContext, node_id: int, timeout: float) -> Any:
+    node = self.node_table[node_id]
+    async with hold_async(self._node_limiters[node_id]):
+      await self._throttle_async(ctx, node_id, ctx.cancellation, self._time_left(ctx, timeout))
+      started_at = time.perf_counter()
+      result = await self._run_action_async(ctx, node, ctx.cancellation)
+      return self._apply_node_result(ctx, node, result, started_at)
+
+  def _apply_node_result(self, ctx: ExecutionContext, node: Node, result: Any, started_at: float) -> Any:
+    """Validate a router's route or push a node's returned updates into the chain's buffers.
+
+    `started_at` is the time.perf_counter() of the node start, reported to the chain's event sink.
+    """
+    if node.is_router:
+      self._validate_route(node, result)
+    elif result and self._has_state:
+      if node.writes is not None and not node.writes.issuperset(result):
+        undeclared = ", ".join(sorted(set(result) - node.writes))
+        raise ValueError(f"Node '{node.name}' returned undeclared write(s): {undeclared}")
+      for state_field_name, state_field_value in result.items():
+        if node.map is not None and state_field_name == node.map.into:
+          ctx.buffers[state_field_name].extend(state_field_value, node.name)  # type: ignore[attr-defined]
+        else:
+          ctx.buffers[state_field_name].update(state_field_value, node.name)
+    if ctx.event_sink is not None:
+      ctx.event_sink(self._node_event(ctx, node, result, started_at))
+    # from scheduling (including queue, cache and process pool time) to the updates reaching the buffers
+    duration = time.perf_counter() - started_at
+    # repeated copies are measured under their original node, so the label set stays bounded
+    self._metrics.node_duration.labels((node.metadata or {}).get("original_node", node.name)).observe(duration)
+    if ctx.tracer is not None:
+      ctx.tracer.add_span(node.name, "node", started_at, duration, chain_id=ctx.chain_id)
+    return result
+
+  def _node_event(self, ctx: ExecutionContext, node: Node, result: Any, started_at: float) -> NodeEvent:
+    duration = time.perf_counter() - started_at
+    if node.is_router:
+      updates: Dict[str, Any] = {}
+      route = result
+    else:
+      updates = dict(result) if result and self._has_state else {}
+      route = None
+    return NodeEvent(ctx.chain_id, node.name, updates, time.time() - duration, duration, route)
+
+  def _complete_dataflow_node(
+    self, ctx: ExecutionContext, frontier: DataflowFrontier, node_id: int, result: Any
+  ) -> List[int]:
+    """Publish a finished node's writes and return the nodes it made ready."""
+    node = self.node_table[node_id]
+    self._update_state_from_buffers(ctx)
+    ctx.last_executed_node = node.name
+    if node.is_router:
+      live_successors: Optional[List[int]] = [self.node_index[result]]
+    else:
+      ctx.executed_nodes.add(node.name)
+      live_successors = None
+    self._save_checkpoint(node.name, ctx)
+    return frontier.resolve(node_id, live_successors)
+
+  def _dataflow_start(self, ctx: ExecutionContext) -> Tuple[DataflowFrontier, deque]:
+    self._force_compile()
+    self._update_chain_status(ctx, ChainStatus.RUNNING)
+    frontier = DataflowFrontier(self.node_successors, self.node_in_degree, self.node_index[END])
+    return frontier, deque(frontier.resolve(self.node_index[START]))
+
+  def _dataflow_timeout(self, ctx: ExecutionContext, running: Mapping[Any, int], pending: Iterable[int] = ()) -> None:
+    """Abandon the running nodes (keyed by future) of a timed out chain. Async tasks are cancelled by the caller.
+
+    `pending` are the nodes that were waiting to start (for a concurrency slot or the rate limiter), reported too.
+    """
+    running_nodes = [self.node_table[node_id] for node_id in [*running.values(), *pending]]
+    for future, node_id in running.items():
+      if isinstance(future, concurrent.futures.Future):
+        self._abandon_action(self.node_table[node_id], future)
+    names = ", ".join(node.name for node in running_nodes)
+    if self._past_deadline(ctx):
+      raise DeadlineExceededError(f"Deadline exceeded in node {names}")
+    logger.error(f"Timeout in node {names}")
+    raise TimeoutError(f"Execution timeout in node {names}")
+
+  @internal_only
+  def _execute_dataflow(self, ctx: ExecutionContext, timeout: Union[int, float]) -> None:  # noqa: PLR0912
+    """Execute the graph as a dataflow: every node is dispatched to the worker pool as soon as all of its
+    predecessors are done, independently of the rest of its level. Nodes already in `executed_nodes`
+    (e.g. restored from a checkpoint) are not run again.
+    """
+    frontier, ready = self._dataflow_start(ctx)
+    running: Dict[concurrent.futures.Future, int] = {}
+    waiting: List[int] = []  # ready nodes whose concurrency caps are full
+    delayed: List[Tuple[float, int]] = []  # heap of (start time, node id) for nodes throttled by a rate limiter
+    started_at: Dict[int, float] = {}
+
+    def start(node_id: int) -> None:
+      started_at[node_id] = time.perf_counter()
+      running[self._start_action(ctx, self.node_table[node_id])] = node_id
+
+    def dispatch(node_id: int) -> None:
+      bucket = self._node_rate_limiters[node_id]
+      wait = bucket.reserve() if bucket else 0
+      if wait:
+        heapq.heappush(delayed, (time.monotonic() + wait, node_id))
+      else:
+        start(node_id)
+
+    try:
+      while ready or running or waiting or delayed:
+        while ready:
+          node_id = ready.popleft()
+          if self.node_table[node_id].name in ctx.executed_nodes:
+            ready.extend(frontier.resolve(node_id))
+          elif acquire_all(self._node_limiters[node_id], blocking=False):
+            dispatch(node_id)
+          else:
+            waiting.append(node_id)
+        while delayed and delayed[0][0] <= time.monotonic():
+          start(heapq.heappop(delayed)[1])
+        if not running and not delayed:
+          if not waiting:
+            break  # the remaining ready nodes had already been executed
+          # every slot is held by other chains: wait for one instead of spinning
+          node_id = waiting.pop(0)
+          if not acquire_all(self._node_limiters[node_id], timeout=self._time_left(ctx, timeout)):
+            self._dataflow_timeout(ctx, {}, [node_id])
+          dispatch(node_id)
+          continue
+
+        # wake up for the next throttled node even if nothing completes before it
+        limit = self._time_left(ctx, timeout)
+        wait_timeout = min(limit, delayed[0][0] - time.monotonic()) if delayed else limit
+        if running:
+          done, _ = concurrent.futures.wait(
+            running, timeout=max(0.0, wait_timeout), return_when=concurrent.futures.FIRST_COMPLETED
+          )
+        else:
+          # only throttled nodes are pending: sleep until the first may start (waiting on no futures returns at once)
+          done = set()
+          if ctx.cancellation.wait(max(0.0, wait_timeout)) and not self._past_deadline(ctx):
+            ctx.cancellation.raise_if_cancelled()
+        if not done and (wait_timeout >= limit or self._past_deadline(ctx)):
+          self._dataflow_timeout(ctx, running, [node_id for _, node_id in delayed])
+
+        for future in done:
+          node_id = running.pop(future)
+          release_all(self._node_limiters[node_id])
+          ready.extend(waiting)
+          waiting.clear()
+          try:
+            result = self._apply_node_result(ctx, self.node_table[node_id], future.result(), started_at.pop(node_id))
+          except ChainCancelledError:
+            raise
+          except Exception as e:
+            node_name = self.node_table[node_id].name
+            logger.error(f"Error in node {node_name}: {e!s}")
+            raise RuntimeError(f"Error in node {node_name}: {e!s}") from e
+          ready.extend(self._complete_dataflow_node(ctx, frontier, node_id, result))
+    finally:
+      for future, node_id in running.items():
+        future.cancel()
+        release_all(self._node_limiters[node_id])
+      for _, node_id in delayed:
+        release_all(self._node_limiters[node_id])
+
+  @internal_only
+  async def _execute_dataflow_async(self, ctx: ExecutionContext, timeout: Union[int, float]) -> None:
+    """Async version of _execute_dataflow"""
+    frontier, ready = self._dataflow_start(ctx)
+    running: Dict[asyncio.Task, int] = {}
+    try:
+      while ready or running:
+        while ready:
+          node_id = ready.popleft()
+          node = self.node_table[node_id]
+          if node.name in ctx.executed_nodes:
+            ready.extend(frontier.resolve(node_id))
+          else:
+            running[asyncio.ensure_future(self._run_dataflow_node_async(ctx, node_id, timeout))] = node_id
+        if not running:
+          break
+
+        done, _ = await asyncio.wait(
+          running, timeout=self._time_left(ctx, timeout), return_when=asyncio.FIRST_COMPLETED
+        )
+        if not done:
+          self._dataflow_timeout(ctx, running)
+
+        for task in done:
+          node_id = running.pop(task)
+          try:
+            result = task.result()
+          except ChainCancelledError:
+            raise
+          except Exception as e:
+            node_name = self.node_table[node_id].name
+            logger.error(f"Error in node {node_name}: {e!s}")
+            raise RuntimeError(f"Error in node {node_name}: {e!s}") from e
+          ready.extend(self._complete_dataflow_node(ctx, frontier, node_id, result))
+    finally:
+      for task in running:
+        task.cancel()
 
   @internal_only
   def execute(
     self,
     start_from: Optional[str] = None,
     timeout: Union[int, float] = 60 * 5,
+    context: Optional[ExecutionContext] = None,
+    deadline: Optional[float] = None,
+    on_deadline: Literal["fail", "pause"] = "fail",
   ) -> None:
+    ctx = context or self.context
     if start_from is None:
-      self.executed_nodes.clear()
+      ctx.executed_nodes.clear()
     if not timeout:
       timeout = self.execution_timeout
 
-    self._execute(start_from, timeout)
-
-  def resume(self, start_from: Optional[str] = None) -> None:
-    if not self.next_execution_node and not start_from:
+    ctx.cancellation = CancellationToken()
+    ctx.on_deadline = on_deadline
+    deadline_handle = self._arm_deadline(ctx, deadline)
+    started_at = self._chain_started()
+    outcome = "failed"
+    try:
+      self._execute(ctx, start_from, timeout)
+      outcome = "paused" if ctx.chain_status == ChainStatus.PAUSE else "completed"
+    except BaseException as e:
+      # nodes still running (timed out, or in branches being abandoned) see the chain is over
+      if isinstance(e, DeadlineExceededError):
+        ctx.cancellation.cancel("deadline exceeded", DeadlineExceededError)
+        self._update_chain_status(ctx, ChainStatus.FAILED)
+      ctx.cancellation.cancel(f"chain failed: {e!r}")
+      raise
+    finally:
+      if deadline_handle is not None:
+        get_deadline_timer().cancel(deadline_handle)
+      self._chain_finished(started_at, outcome)
+
+  def _chain_started(self) -> float:
+    self._metrics.active_chains.inc()
+    return time.perf_counter()
+
+  def _chain_finished(self, started_at: float, outcome: str) -> None:
+    self._metrics.active_chains.dec()
+    self._metrics.chain_duration.labels(outcome).observe(time.perf_counter() - started_at)
+
+  def resume(
+    self,
+    start_from: Optional[str] = None,
+    context: Optional[ExecutionContext] = None,
+    deadline: Optional[float] = None,
+    on_deadline: Literal["fail", "pause"] = "fail",
+  ) -> None:
+    """Resume a paused chain. `deadline` gives the resumed run a new budget (see `start`)."""
+    ctx = context or self.context
+    if not ctx.next_execution_node and not start_from:
       logger.info("resume method should either specify a start_from node or be part of a chain call (execute)")
       raise ValueError("resume method should either specify a start_from node or be part of a chain call (execute)")
 
     # ensure that buffers are updated from state
-    self._update_buffers_from_state()
+    self._update_buffers_from_state(ctx)
 
     if start_from:
-      self.start_from = start_from
-      self.execute(start_from=start_from)
+      ctx.start_from = start_from
+      self.execute(start_from=start_from, context=ctx, deadline=deadline, on_deadline=on_deadline)
     else:
-      self.execute(start_from=self.next_execution_node)
+      self.execute(start_from=ctx.next_execution_node, context=ctx, deadline=deadline, on_deadline=on_deadline)
 
-  def start(self, chain_id: Optional[str] = None, timeout: Optional[Union[int, float]] = None) -> str:
-    """Start a new graph execution with a new chain id"""
+  def start(
+    self,
+    chain_id: Optional[str] = None,
+    timeout: Optional[Union[int, float]] = None,
+    context: Optional[ExecutionContext] = None,
+    deadline: Optional[float] = None,
+    on_deadline: Literal["fail", "pause"] = "fail",
+  ) -> str:
+    """Start a new graph execution with a new chain id.
+
+    Runs on the graph's default execution context unless `context` (see `new_context`) is given.
+
+    `timeout` bounds each node. `deadline` is a budget in seconds for the whole chain: nodes see what is left
+    of it as `NodeContext.remaining`, node waits are cut short by it, and the chain's cancellation token is
+    cancelled when it runs out. The chain then fails with `DeadlineExceededError` (status FAILED) or, with
+    `on_deadline="pause"` (plan mode only), pauses before its first unfinished node so it can be resumed.
+    """
+    ctx = context or self.context
     if chain_id:
-      self.chain_id = chain_id
+      ctx.chain_id = chain_id
     else:
-      self.chain_id = f"chain_{uuid.uuid4()}"
+      ctx.chain_id = f"chain_{uuid.uuid4()}"
 
-    if self.chain_status != ChainStatus.IDLE:
-      self._clean_graph_variables()
-    self.execute(timeout=timeout)
-    return self.chain_id
+    if ctx.chain_status != ChainStatus.IDLE:
+      self._clean_graph_variables(ctx)
+    self.execute(timeout=timeout, context=ctx, deadline=deadline, on_deadline=on_deadline)
+    return ctx.chain_id
 
-  def load_from_checkpoint(self, chain_id: str, checkpoint_id: Optional[str] = None) -> None:
+  def load_from_checkpoint(
+    self, chain_id: str, checkpoint_id: Optional[str] = None, context: Optional[ExecutionContext] = None
+  ) -> ExecutionContext:
     """Load graph state and execution variables from a checkpoint.
 
     Args:
         checkpoint_id: Optional specific checkpoint ID to load. If None, loads the last checkpoint.
+        context: Execution context to load into. If None, the graph's default context is used.
+
+    Returns:
+        The execution context the checkpoint was loaded into
     """
+    ctx = context or self.context
     if not self.checkpoint_storage:
       raise ValueError("Checkpoint storage must be configured to load from checkpoint")
 
@@ -517,43 +1609,51 @@ class Graph(BaseGraph):
         raise ValueError(f"No checkpoints found for chain {chain_id}")
 
     # Load checkpoint data
-    if self.state:
+    if ctx.state:
+      started_at = time.perf_counter()
       checkpoint: Checkpoint = self.checkpoint_storage.load_checkpoint(
-        state_instance=self.state,
+        state_instance=ctx.state,
         chain_id=chain_id,
         checkpoint_id=checkpoint_id,
       )
+      backend = type(self.checkpoint_storage).__name__
+      self._metrics.checkpoint_load.labels(backend).observe(time.perf_counter() - started_at)
 
     # Verify state class matches
-    current_state_class = f"{self.state.__class__.__module__}.{self.state.__class__.__name__}"
+    current_state_class = f"{ctx.state.__class__.__module__}.{ctx.state.__class__.__name__}"
     if current_state_class != checkpoint.state_class:
       raise ValueError(
         f"State class mismatch. Current: {current_state_class}, " f"Checkpoint: {checkpoint.state_class}"
       )
 
-    self._clean_graph_variables()
+    self._clean_graph_variables(ctx)
     # Update state from serialized data
     if self.initial_state:
-      self.state = self.initial_state.__class__.model_validate_json(checkpoint.data)
+      ctx.state = self.initial_state.__class__.model_validate_json(checkpoint.data)
 
     # Update buffers with current state values
-    for field_name, buffer in self.buffers.items():
-      buffer.set_value(getattr(self.state, field_name))
+    for field_name, buffer in ctx.buffers.items():
+      buffer.set_value(getattr(ctx.state, field_name))
 
     # Update execution variables
     if checkpoint:
-      self.chain_id = checkpoint.chain_id
-      self.chain_status = checkpoint.chain_status
-      self.next_execution_node = checkpoint.next_execution_node
+      ctx.chain_id = checkpoint.chain_id
+      ctx.chain_status = checkpoint.chain_status
+      ctx.next_execution_node = checkpoint.next_execution_node
       if checkpoint.executed_nodes:
-        self.executed_nodes = checkpoint.executed_nodes
+        ctx.executed_nodes = checkpoint.executed_nodes
 
-    logger.debug(f"Loaded checkpoint {checkpoint_id} for chain {self.chain_id}")
+    logger.debug(f"Loaded checkpoint {checkpoint_id} for chain {ctx.chain_id}")
+    return ctx
 
   @internal_only
-  async def _execute_async(self, start_from: Optional[str] = None, timeout: Union[int, float] = 60 * 5) -> None:
+  async def _execute_async(
+    self, ctx: ExecutionContext, start_from: Optional[str] = None, timeout: Union[int, float] = 60 * 5
+  ) -> None:
     """Async version of execute method"""
-    execution_id = f"exec_{uuid.uuid4().hex[:8]}"  # Add execution_id
+    if self.execution_mode == "dataflow":
+      await self._execute_dataflow_async(ctx, timeout)
+      return
 
     def add_item_to_obj_store(obj_store: Union[List, Tuple], item: Any) -> Union[List, Tuple]:
       if isinstance(obj_store, list):
@@ -583,201 +1683,182 @@ class Graph(BaseGraph):
 
       return tasks
 
-    async def execute_task(task: Callable, node_name: str) -> Any:
+    async def execute_task(task: NodeTask, token: CancellationToken) -> Any:
       """Execute a single task with proper state handling."""
+      node_name = task.node_name
+      node = self.node_table[task.node_id]
       logger.debug(f"Executing task in node: {node_name}")
 
+      # a router that speculated on this node and then picked it left the run staged: commit it instead
+      staged = ctx.speculations.pop(node_name, None)
+      speculations = (
+        self._speculate(node, token, functools.partial(self._create_speculation_task, ctx)) if node.is_router else {}
+      )
+      route: Optional[str] = None
+
       async def run_task() -> Any:
+        nonlocal route
         # prevent execution when in routing mode
-        if self._is_blocking_execution(execution_id):
+        if ctx.pending_route is not None:
+          if staged is not None:
+            self._discard_speculation(staged)
           return
 
-        if inspect.iscoroutinefunction(task):
-          # Handle async functions
-          result = await task(state=self.state) if self._has_state else await task()
-          # Ensure we're getting the actual result, not a coroutine
-          if inspect.iscoroutine(result):
-            result = await result
-        # Handle CPU-bound sync functions by running them in a thread
-        elif self._has_state:
-          result = await asyncio.to_thread(task, state=self.state)
+        token.raise_if_cancelled()
+        if staged is not None:
+          started_at, raw_result = staged.started_at, await staged.future
         else:
-          result = await asyncio.to_thread(task)
+          started_at = time.perf_counter()
+          raw_result = await self._run_action_async(ctx, node, token)
+        result = self._apply_node_result(ctx, node, raw_result, started_at)
 
         # Handle router node results
-        if self.nodes[node_name].is_router:
-          if not result or not isinstance(result, str):
-            raise ValueError(f"Router node '{node_name}' must return a valid node name")
-
-          # Validate the returned route
-          possible_routes = self.nodes[node_name].possible_routes
-          if possible_routes is None or result not in possible_routes:
-            raise ValueError(f"Router node '{node_name}' returned invalid route: {result}")
-
-          # Get the path for this route
-          router_paths = self.router_paths.get(node_name, {})
-          chosen_path = router_paths.get(result, [])
-
-          if chosen_path:
-            # Update execution plan to only include the chosen path
-            self._update_execution_plan(node_name, result)
-
-            # Clear executed nodes if the chosen path contains previously executed nodes
-            if any(node in self.executed_nodes for node in chosen_path):
-              self.executed_nodes.clear()
-
-            # Set start_from to the first node in the chosen path
-            self.start_from = chosen_path[0]
-
-            # store execution_id for later checks
-            self.blocking_execution_ids.append(execution_id)
-
-            await self._execute_async(start_from=chosen_path[0])
-            return  # Exit this task
-
-        # Update state from result
-        if result and self._has_state:
-          for state_field_name, state_field_value in result.items():
-            self.buffers[state_field_name].update(state_field_value, node_name)
+        if node.is_router:
+          route = result
+          self._route_to(ctx, node_name, result)
+          if ctx.pending_route is not None:
+            return  # the scheduler continues from the chosen path
         return result
 
       try:
-        result = await asyncio.wait_for(run_task(), timeout=timeout)
-        self._update_state_from_buffers()
+        # coroutines above the node's concurrency caps queue here instead of all running at once
+        async with hold_async(self._node_limiters[task.node_id], self._time_left(ctx, timeout)):
+          if staged is None:
+            await self._throttle_async(ctx, task.node_id, token, self._time_left(ctx, timeout))
+          result = await asyncio.wait_for(run_task(), timeout=self._time_left(ctx, timeout))
+        self._update_state_from_buffers(ctx)
         # Only add to executed_nodes if it's not a router node
-        if not self.nodes[node_name].is_router:
-          self.executed_nodes.add(node_name)
+        if not node.is_router:
+          ctx.executed_nodes.add(node_name)
         return result
       except asyncio.TimeoutError as e:
+        if self._past_deadline(ctx):
+          raise DeadlineExceededError(f"Deadline exceeded in node {node_name}") from e
         logger.error(f"Timeout in node {node_name}")
         raise TimeoutError(f"Execution timeout in node {node_name}") from e
+      finally:
+        self._settle_speculations(ctx, node, speculations, route)
 
-    async def execute_tasks(tasks: Union[List, Tuple], node_index: int) -> None:  # noqa: PLR0911, PLR0912
+    async def execute_tasks(  # noqa: PLR0911, PLR0912
+      tasks: Union[List, Tuple], node_index: int, token: CancellationToken
+    ) -> None:
       """Recursively execute tasks respecting list (sequential) and tuple (parallel) structures"""
-      if self._is_blocking_execution(execution_id):
-        return  # Skip execution if we're restarting
+      if ctx.pending_route is not None:
+        return  # Skip execution if a router is moving the chain elsewhere
 
       if isinstance(tasks, (list, tuple)):
         if isinstance(tasks, list):
           # Sequential execution
           for task in tasks:
-            if self.chain_status != ChainStatus.RUNNING:
+            if ctx.chain_status != ChainStatus.RUNNING or ctx.pending_route is not None:
               return
-            await execute_tasks(task, node_index)
-            self._save_checkpoint(self.execution_plan[node_index].node_name)
+            token.raise_if_cancelled()
+            await execute_tasks(task, node_index, token)
+            if ctx.pending_route is None:
+              self._save_checkpoint(ctx.execution_plan[node_index].node_name, ctx)
         else:
-          # Parallel execution using asyncio.gather
-          if self.chain_status != ChainStatus.RUNNING:
+          # Parallel execution, cancelling the whole group on the first failure
+          if ctx.chain_status != ChainStatus.RUNNING:
             return
 
           # Check if any task in the parallel group has a "before" interrupt
           for task in tasks:
-            if callable(task):
-              node_name = getattr(
-                task,
-                "__node_name__",
-                getattr(task, "__name__", str(task)),
-              )
-              if self._get_interrupt_status(node_name) == "before" and not self.start_from:
-                self.next_execution_node = node_name
-                self._update_chain_status(ChainStatus.PAUSE)
+            if isinstance(task, NodeTask):
+              node_name = task.node_name
+              if self._get_interrupt_status(node_name) == "before" and not ctx.start_from:
+                ctx.next_execution_node = node_name
+                self._update_chain_status(ctx, ChainStatus.PAUSE)
                 return
 
           # Create a list of coroutines for parallel execution
+          group = token.child()
           parallel_tasks = []
           for task in tasks:
-            # If it's a callable (actual task)
-            if callable(task):
-              node_name = getattr(
-                task,
-                "__node_name__",
-                getattr(task, "__name__", str(task)),
-              )
-              if node_name not in self.executed_nodes:
+            # If it's a node task (actual task)
+            if isinstance(task, NodeTask):
+              node_name = task.node_name
+              if node_name not in ctx.executed_nodes:
                 # Skip nodes until we reach start_from
-                if self.start_from and self.start_from != node_name:
+                if ctx.start_from and ctx.start_from != node_name:
                   continue
 
                 # Clean up start_from when reached
-                if self.start_from == node_name:
-                  self.start_from = None
-                  self._update_chain_status(ChainStatus.RUNNING)
+                if ctx.start_from == node_name:
+                  ctx.start_from = None
+                  self._update_chain_status(ctx, ChainStatus.RUNNING)
 
-                parallel_tasks.append(execute_task(task, node_name))
+                parallel_tasks.append(execute_task(task, group))
             # If it's a nested structure (list/tuple)
             elif isinstance(task, (list, tuple)):
-              parallel_tasks.append(execute_tasks(task, node_index))
+              parallel_tasks.append(execute_tasks(task, node_index, group))
 
           # Execute all tasks in parallel if we have any
           if parallel_tasks:
-            await asyncio.gather(*parallel_tasks)
+            self._metrics.group_width.observe(len(parallel_tasks))
+            with self._span(ctx, "parallel group", "group", branches=len(parallel_tasks)):
+              await self._run_group(parallel_tasks, group)
 
             # Check if any task in the parallel group has an "after" interrupt
             for task in tasks:
-              if callable(task):
-                node_name = getattr(
-                  task,
-                  "__node_name__",
-                  getattr(task, "__name__", str(task)),
-                )
+              if isinstance(task, NodeTask):
+                node_name = task.node_name
                 if self._get_interrupt_status(node_name) == "after":
-                  if not self.start_from:
-                    self.next_execution_node = self.execution_plan[node_index + 1].node_name
-                    self._update_chain_status(ChainStatus.PAUSE)
+                  if not ctx.start_from:
+                    ctx.next_execution_node = ctx.execution_plan[node_index + 1].node_name
+                    self._update_chain_status(ctx, ChainStatus.PAUSE)
                     return
                   else:
-                    self.start_from = None
-                    self._update_chain_status(ChainStatus.RUNNING)
+                    ctx.start_from = None
+                    self._update_chain_status(ctx, ChainStatus.RUNNING)
 
-            self._save_checkpoint(self.execution_plan[node_index].node_name)
+            self._save_checkpoint(ctx.execution_plan[node_index].node_name, ctx)
       else:
         # Base case: execute individual task
-        node_name = next(
-          (name for name, node in self.nodes.items() if node.action == tasks),
-          str(tasks),  # fallback to str(tasks) if not found
-        )
+        node_name = tasks.node_name
 
         # Skip if node was already executed
-        if node_name in self.executed_nodes:
+        if node_name in ctx.executed_nodes:
           return
 
         # Handle before interrupts
         if (
-          not isinstance(node_name, list) and self._get_interrupt_status(node_name) == "before" and not self.start_from
+          not isinstance(node_name, list) and self._get_interrupt_status(node_name) == "before" and not ctx.start_from
         ):
-          self.next_execution_node = node_name
-          self._update_chain_status(ChainStatus.PAUSE)
+          ctx.next_execution_node = node_name
+          self._update_chain_status(ctx, ChainStatus.PAUSE)
           return
 
         # Skip nodes until we reach start_from
-        if self.start_from and self.start_from != node_name:
+        if ctx.start_from and ctx.start_from != node_name:
           return
 
         # Cleaning up once start_from is reached
-        if self.start_from == node_name:
-          self.start_from = None
-          self._update_chain_status(ChainStatus.RUNNING)
+        if ctx.start_from == node_name:
+          ctx.start_from = None
+          self._update_chain_status(ctx, ChainStatus.RUNNING)
 
         try:
           # Execute the task
-          result = await execute_task(tasks, node_name)
-          self.last_executed_node = node_name
+          result = await execute_task(tasks, token)
+          ctx.last_executed_node = node_name
 
           # Handle after interrupts
           if not isinstance(node_name, list) and self._get_interrupt_status(node_name) == "after":
-            if not self.start_from:
-              self.next_execution_node = self.execution_plan[node_index + 1].node_name
-              self._update_chain_status(ChainStatus.PAUSE)
+            if not ctx.start_from:
+              ctx.next_execution_node = ctx.execution_plan[node_index + 1].node_name
+              self._update_chain_status(ctx, ChainStatus.PAUSE)
               return
             else:
-              self.start_from = None
-              self._update_chain_status(ChainStatus.RUNNING)
+              ctx.start_from = None
+              self._update_chain_status(ctx, ChainStatus.RUNNING)
 
           return result
 
         except asyncio.TimeoutError as e:
           logger.error(f"Timeout in node {node_name}")
           raise TimeoutError(f"Execution timeout in node {node_name}") from e
+        except ChainCancelledError:
+          raise
         except Exception as e:
           logger.error(f"Error in node {node_name}: {e!s}")
           raise RuntimeError(f"Error in node {node_name}: {e!s}") from e
@@ -785,66 +1866,278 @@ class Graph(BaseGraph):
     async def execute_node(node: ExecutableNode, node_index: int) -> None:
       """Execute a single node or group of nodes with proper concurrency handling."""
       tasks = extract_tasks_from_node(node)
-      await execute_tasks(tasks, node_index)
+      await execute_tasks(tasks, node_index, ctx.cancellation)
 
     # Initialize execution
-    self._convert_execution_plan()
-    self._update_chain_status(ChainStatus.RUNNING)
-    self.start_from = start_from
+    self._update_chain_status(ctx, ChainStatus.RUNNING)
+    ctx.start_from = start_from
+    ctx.pending_route = None
+    node_index = self._plan_position(ctx, start_from)
 
     # Execute nodes
-    for node_index, node in enumerate(self.execution_plan):
-      # prevent execution when in routing mode
-      if self._is_blocking_execution(execution_id):
+    while node_index < len(ctx.execution_plan) and ctx.chain_status == ChainStatus.RUNNING:
+      try:
+        await execute_node(ctx.execution_plan[node_index], node_index)
+      except DeadlineExceededError:
+        if ctx.on_deadline != "pause":
+          raise
+        self._pause_at_deadline(ctx, ctx.execution_plan[node_index])
         return
 
-      if self.chain_status == ChainStatus.RUNNING:
-        await execute_node(node, node_index)
+      if ctx.pending_route is not None:
+        # A router chose a path: move the program counter to it
+        node_index = self._plan_position(ctx, ctx.pending_route)
+        ctx.pending_route = None
       else:
-        return
+        node_index += 1
 
   @internal_only
   async def execute_async(
     self,
     start_from: Optional[str] = None,
     timeout: Union[int, float] = 60 * 5,
+    context: Optional[ExecutionContext] = None,
+    deadline: Optional[float] = None,
+    on_deadline: Literal["fail", "pause"] = "fail",
   ) -> None:
     """Async version of execute method"""
+    ctx = context or self.context
     if start_from is None:
-      self.executed_nodes.clear()
+      ctx.executed_nodes.clear()
     if not timeout:
       timeout = self.execution_timeout
 
-    await self._execute_async(start_from, timeout)
-
-  async def start_async(self, chain_id: Optional[str] = None, timeout: Optional[Union[int, float]] = None) -> str:
+    ctx.cancellation = CancellationToken()
+    ctx.on_deadline = on_deadline
+    deadline_handle = self._arm_deadline(ctx, deadline)
+    started_at = self._chain_started()
+    outcome = "failed"
+    try:
+      await self._execute_async(ctx, start_from, timeout)
+      outcome = "paused" if ctx.chain_status == ChainStatus.PAUSE else "completed"
+    except BaseException as e:
+      if isinstance(e, DeadlineExceededError):
+        ctx.cancellation.cancel("deadline exceeded", DeadlineExceededError)
+        self._update_chain_status(ctx, ChainStatus.FAILED)
+      ctx.cancellation.cancel(f"chain failed: {e!r}")
+      raise
+    finally:
+      if deadline_handle is not None:
+        get_deadline_timer().cancel(deadline_handle)
+      self._chain_finished(started_at, outcome)
+
+  async def start_async(
+    self,
+    chain_id: Optional[str] = None,
+    timeout: Optional[Union[int, float]] = None,
+    context: Optional[ExecutionContext] = None,
+    deadline: Optional[float] = None,
+    on_deadline: Literal["fail", "pause"] = "fail",
+  ) -> str:
     """Async version of start method"""
+    ctx = context or self.context
     if chain_id:
-      self.chain_id = chain_id
+      ctx.chain_id = chain_id
     else:
-      self.chain_id = f"chain_{uuid.uuid4()}"
+      ctx.chain_id = f"chain_{uuid.uuid4()}"
 
-    if self.chain_status != ChainStatus.IDLE:
-      self._clean_graph_variables()
-    await self.execute_async(timeout=timeout)
-    return self.chain_id
+    if ctx.chain_status != ChainStatus.IDLE:
+      self._clean_graph_variables(ctx)
+    await self.execute_async(timeout=timeout, context=ctx, deadline=deadline, on_deadline=on_deadline)
+    return ctx.chain_id
 
-  async def resume_async(self, start_from: Optional[str] = None) -> None:
+  async def resume_async(
+    self,
+    start_from: Optional[str] = None,
+    context: Optional[ExecutionContext] = None,
+    deadline: Optional[float] = None,
+    on_deadline: Literal["fail", "pause"] = "fail",
+  ) -> None:
     """Async version of resume method"""
-    if not self.next_execution_node and not start_from:
+    ctx = context or self.context
+    if not ctx.next_execution_node and not start_from:
       logger.info("resume method should either specify a start_from node or be part of a chain call (execute)")
       raise ValueError("resume method should either specify a start_from node or be part of a chain call (execute)")
 
-    self._update_buffers_from_state()
+    self._update_buffers_from_state(ctx)
 
     if start_from:
-      self.start_from = start_from
-      await self.execute_async(start_from=start_from)
+      ctx.start_from = start_from
+      await self.execute_async(start_from=start_from, context=ctx, deadline=deadline, on_deadline=on_deadline)
     else:
-      await self.execute_async(start_from=self.next_execution_node)
+      await self.execute_async(
+        start_from=ctx.next_execution_node, context=ctx, deadline=deadline, on_deadline=on_deadline
+      )
 
-  def _update_execution_plan(self, router_node: str, chosen_node: str) -> None:
-    """Update detailed execution plan to only include the chosen path from a router node."""
+  def stream(
+    self,
+    chain_id: Optional[str] = None,
+    timeout: Optional[Union[int, float]] = None,
+    context: Optional[ExecutionContext] = None,
+  ) -> Iterator[NodeEvent]:
+    """Start a new chain and yield a NodeEvent as each of its nodes finishes.
+
+    The chain runs on a background thread. The generator returns once the chain finishes or pauses
+    (check `chain_status`) and re-raises the chain's error, if any.
+    """
+    ctx = context or self.context
+    events: "queue.SimpleQueue[Optional[NodeEvent]]" = queue.SimpleQueue()
+    errors: List[BaseException] = []
+
+    def run() -> None:
+      try:
+        self.start(chain_id, timeout, context=ctx)
+      except BaseException as e:
+        errors.append(e)
+      finally:
+        events.put(None)
+
+    previous_sink, ctx.event_sink = ctx.event_sink, events.put
+    threading.Thread(target=run, name="primeGraph-stream", daemon=True).start()
+    try:
+      while (event := events.get()) is not None:
+        yield event
+      if errors:
+        raise errors[0]
+    finally:
+      ctx.event_sink = previous_sink
+
+  async def astream(
+    self,
+    chain_id: Optional[str] = None,
+    timeout: Optional[Union[int, float]] = None,
+    context: Optional[ExecutionContext] = None,
+  ) -> AsyncIterator[NodeEvent]:
+    """Async version of stream. The chain runs as a task of the current event loop."""
+    ctx = context or self.context
+    events: "asyncio.Queue[Optional[NodeEvent]]" = asyncio.Queue()
+    previous_sink, ctx.event_sink = ctx.event_sink, events.put_nowait
+    run = asyncio.ensure_future(self.start_async(chain_id, timeout, context=ctx))
+    run.add_done_callback(lambda _: events.put_nowait(None))
+    try:
+      while (event := await events.get()) is not None:
+        yield event
+      await run  # re-raises the chain's error
+    finally:
+      ctx.event_sink = previous_sink
+      run.cancel()
+
+  def _batch_limit(self, max_concurrency: Optional[int]) -> int:
+    limit = max_concurrency if max_concurrency is not None else self.worker_pool.max_workers
+    if limit < 1:
+      raise ValueError("max_concurrency must be at least 1")
+    return limit
+
+  def start_many(
+    self,
+    states: Iterable[Optional[GraphState]],
+    max_concurrency: Optional[int] = None,
+    return_exceptions: bool = False,
+    timeout: Optional[Union[int, float]] = None,
+  ) -> Iterator[ChainResult]:
+    """Run one chain per initial state, at most `max_concurrency` at a time, yielding results as chains finish.
+
+    Every chain gets its own execution context and shares the compiled plan. Chains are started lazily while
+    the generator is consumed, so `states` may be a long or unbounded iterable.
+
+    Args:
+        states: Initial state of each chain. None starts a chain from a copy of the graph's initial state
+        max_concurrency: Maximum number of chains running at once. Defaults to the worker pool size
+        return_exceptions: Yield failed chains as results carrying the error instead of raising it
+        timeout: Per-chain execution timeout. Defaults to the graph's execution timeout
+    """
+    self._force_compile()
+    limit = self._batch_limit(max_concurrency)
+    pending = enumerate(states)
+    running: Dict[concurrent.futures.Future, Tuple[int, ExecutionContext]] = {}
+    # chain drivers block on the worker pool, so they get threads of their own
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=limit, thread_name_prefix="primeGraph-chain")
+
+    def start_next() -> bool:
+      item = next(pending, None)
+      if item is None:
+        return False
+      index, state = item
+      ctx = self.new_context(state=state)
+      running[executor.submit(self.start, timeout=timeout, context=ctx)] = (index, ctx)
+      return True
+
+    try:
+      while len(running) < limit and start_next():
+        pass
+      while running:
+        done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+          index, ctx = running.pop(future)
+          error = future.exception()
+          if error is not None and not return_exceptions:
+            raise error
+          start_next()
+          yield ChainResult(index, ctx, error)
+    finally:
+      # chains already running finish in the background; queued ones are dropped
+      executor.shutdown(wait=False, cancel_futures=True)
+
+  async def astart_many(
+    self,
+    states: Iterable[Optional[GraphState]],
+    max_concurrency: Optional[int] = None,
+    return_exceptions: bool = False,
+    timeout: Optional[Union[int, float]] = None,
+  ) -> AsyncIterator[ChainResult]:
+    """Async version of start_many. Chains run as tasks of the current event loop."""
+    self._force_compile()
+    limit = self._batch_limit(max_concurrency)
+    pending = enumerate(states)
+    running: Dict[asyncio.Task, Tuple[int, ExecutionContext]] = {}
+
+    def start_next() -> bool:
+      item = next(pending, None)
+      if item is None:
+        return False
+      index, state = item
+      ctx = self.new_context(state=state)
+      running[asyncio.ensure_future(self.start_async(timeout=timeout, context=ctx))] = (index, ctx)
+      return True
+
+    try:
+      while len(running) < limit and start_next():
+        pass
+      while running:
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          index, ctx = running.pop(task)
+          error = task.exception()
+          if error is not None and not return_exceptions:
+            raise error
+          start_next()
+          yield ChainResult(index, ctx, error)
+    finally:
+      for task in running:
+        task.cancel()
+
+  def _update_execution_plan(self, ctx: ExecutionContext, router_node: str, chosen_node: str) -> None:
+    """Switch the detailed execution plan to the variant that only includes the chosen router paths.
+
+    Variants are derived from the compiled plan (never by re-running path analysis) and cached by the
+    set of route choices made so far, so router loops keep reusing the same plan objects.
+    """
+    route_choices = {**ctx.route_choices, router_node: chosen_node}
+    variant_key = tuple(route_choices.items())
+
+    variant = self._route_variants.get(variant_key)
+    if variant is None:
+      variant = list(self._compiled_execution_path)
+      for choice_router, choice_node in route_choices.items():
+        self._restrict_to_chosen_path(variant, choice_router, choice_node)
+      self._route_variants[variant_key] = variant
+
+    ctx.route_choices = route_choices
+    ctx.detailed_execution_path = variant
+
+  @staticmethod
+  def _restrict_to_chosen_path(path: List[Any], router_node: str, chosen_node: str) -> None:
+    """Restrict the group following a router in `path` to the branch containing the chosen node."""
 
     def _find_node_in_nested(node_name: str, path: List[Any]) -> bool:
       """Helper function to check if a node exists in a nested structure."""
@@ -865,43 +2158,29 @@ class Graph(BaseGraph):
           return i
       raise ValueError(f"Node {node_name} not found in detailed execution path")
 
-    def isolate_chosen_path(path: List[Any], chosen_node: str) -> Union[List[Any], Tuple[Any], None]:
-      """Find and isolate the path containing the chosen node."""
-      if isinstance(path, list):
-        for item in path:
-          if isinstance(item, list):
-            # For nested parallel paths
-            for subpath in item:
-              if isinstance(subpath, list):
-                result = isolate_chosen_path(subpath, chosen_node)
-                if result:
-                  return result
-              elif isinstance(subpath, tuple) and subpath[1] == chosen_node:
-                return subpath
-          elif isinstance(item, tuple) and item[1] == chosen_node:
-            return path
-      return None
-
     # Find indices in the detailed execution path
-    router_idx = _find_node_index(router_node, self.detailed_execution_path)
+    router_idx = _find_node_index(router_node, path)
 
     # Find the parallel paths group that comes after the router
-    if router_idx + 1 >= len(self.detailed_execution_path):
+    if router_idx + 1 >= len(path):
       return
 
-    parallel_paths = self.detailed_execution_path[router_idx + 1]
+    parallel_paths = path[router_idx + 1]
     if not isinstance(parallel_paths, list):
       return
 
     # Find the specific path containing the chosen node
     chosen_path = None
-    for path in parallel_paths:
-      if _find_node_in_nested(chosen_node, [path]):
-        chosen_path = path
+    for candidate in parallel_paths:
+      if _find_node_in_nested(chosen_node, [candidate]):
+        chosen_path = candidate
         break
 
     if not chosen_path:
+      # a route leaving a router loop can point past the group; the scheduler jumps straight to it
+      if any(_find_node_in_nested(chosen_node, [item]) for item in path[router_idx + 2 :]):
+        return
       raise ValueError(f"Chosen node {chosen_node} not found in any path after router")
 
     # Update the detailed execution path to only include the chosen path
-    self.detailed_execution_path[router_idx + 1] = [chosen_path]
+    path[router_idx + 1] = [chosen_path]
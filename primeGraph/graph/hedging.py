@@ -0,0 +1,73 @@
+import math
+import threading
+from collections import deque
+from typing import NamedTuple, Optional
+
+
+class HedgePolicy(NamedTuple):
+  """Duplicate a slow node call, enabled with `@graph.node(hedge=HedgePolicy(...))`.
+
+  If an attempt has not finished after the hedge delay a second one is started. The first successful attempt
+  wins, the other is cancelled and only the winner's result reaches the buffers, so the node must be safe to
+  run twice.
+  """
+
+  delay: Optional[float] = None  # seconds before the hedge is started
+  percentile: Optional[float] = None  # start the hedge at this percentile of the node's observed latency instead
+  min_samples: int = 20  # observed calls needed before the percentile is used (`delay`, or no hedging, until then)
+  window: int = 256  # most recent latencies the percentile is computed over
+
+
+class HedgeStats(NamedTuple):
+  calls: int  # completed calls of the node
+  hedged: int  # calls that started a hedge
+  hedge_wins: int  # hedged calls won by the hedge
+
+  @property
+  def hedge_rate(self) -> float:
+    return self.hedged / self.calls if self.calls else 0.0
+
+  @property
+  def win_rate(self) -> float:
+    return self.hedge_wins / self.hedged if self.hedged else 0.0
+
+
+class NodeHedger:
+  """Thread-safe hedge delay and counters of one node, shared by every chain of the graph."""
+
+  def __init__(self, policy: HedgePolicy):
+    if policy.delay is None and policy.percentile is None:
+      raise ValueError("Hedge policy needs a delay or a percentile")
+    if policy.delay is not None and policy.delay < 0:
+      raise ValueError("Hedge delay must not be negative")
+    if policy.percentile is not None and not 0 < policy.percentile < 100:  # noqa: PLR2004
+      raise ValueError("Hedge percentile must be between 0 and 100")
+    if policy.min_samples < 1 or policy.window < policy.min_samples:
+      raise ValueError("Hedge window must hold at least min_samples (>= 1) latencies")
+    self.policy = policy
+    self._latencies: "deque[float]" = deque(maxlen=policy.window)
+    self._lock = threading.Lock()
+    self._calls = 0
+    self._hedged = 0
+    self._hedge_wins = 0
+
+  def delay(self) -> Optional[float]:
+    """Seconds to wait for an attempt before hedging it, or None to not hedge this call."""
+    with self._lock:
+      if self.policy.percentile is None or len(self._latencies) < self.policy.min_samples:
+        return self.policy.delay
+      latencies = sorted(self._latencies)
+    rank = math.ceil(self.policy.percentile / 100 * len(latencies)) - 1
+    return latencies[max(rank, 0)]
+
+  def record(self, latency: float, hedged: bool, hedge_won: bool) -> None:
+    """Record a completed call. `latency` is the winning attempt's own duration."""
+    with self._lock:
+      self._latencies.append(latency)
+      self._calls += 1
+      self._hedged += hedged
+      self._hedge_wins += hedge_won
+
+  def stats(self) -> HedgeStats:
+    with self._lock:
+      return HedgeStats(self._calls, self._hedged, self._hedge_wins)
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, List, Optional, Sequence
+
+
+class ConcurrencyLimiter:
+  """Caps how many node executions sharing a limit run at once.
+
+  Sync engines wait on a thread semaphore. Async engines wait on an asyncio semaphore of their own event
+  loop, so the cap is enforced per engine: sync and async executions do not share slots.
+  """
+
+  def __init__(self, limit: int):
+    if limit < 1:
+      raise ValueError("Concurrency limit must be at least 1")
+    self.limit = limit
+    self._semaphore = threading.BoundedSemaphore(limit)
+    self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+      weakref.WeakKeyDictionary()
+    )
+    self._lock = threading.Lock()
+
+  def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+    if not blocking:
+      return self._semaphore.acquire(blocking=False)
+    return self._semaphore.acquire(timeout=timeout)
+
+  def release(self) -> None:
+    self._semaphore.release()
+
+  def async_semaphore(self) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    with self._lock:
+      semaphore = self._async_semaphores.get(loop)
+      if semaphore is None:
+        semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.limit)
+    return semaphore
+
+
+def acquire_all(limiters: Sequence[ConcurrencyLimiter], blocking: bool = True, timeout: Optional[float] = None) -> bool:
+  """Acquire every limiter (in the given order) or none of them, within `timeout` seconds in total."""
+  deadline = None if timeout is None else time.monotonic() + timeout
+  acquired: List[ConcurrencyLimiter] = []
+  for limiter in limiters:
+    if not limiter.acquire(blocking, _remaining(deadline)):
+      release_all(acquired)
+      return False
+    acquired.append(limiter)
+  return True
+
+
+def release_all(limiters: Sequence[ConcurrencyLimiter]) -> None:
+  for limiter in reversed(limiters):
+    limiter.release()
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+  return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+class SlotTimeoutError(TimeoutError):
+  """No concurrency slot freed up within the allowed wait."""
+
+
+@contextmanager
+def hold(limiters: Sequence[ConcurrencyLimiter], timeout: Optional[float] = None) -> Iterator[None]:
+  """Wait for a slot in every limiter, raising SlotTimeoutError if they do not free up within `timeout`."""
+  if not acquire_all(limiters, timeout=timeout):
+    raise SlotTimeoutError("Timed out waiting for a concurrency slot")
+  try:
+    yield
+  finally:
+    release_all(limiters)
+
+
+@asynccontextmanager
+async def hold_async(limiters: Sequence[ConcurrencyLimiter], timeout: Optional[float] = None) -> AsyncIterator[None]:
+  """Async version of `hold`."""
+  deadline = None if timeout is None else time.monotonic() + timeout
+  async with AsyncExitStack() as stack:
+    for limiter in limiters:
+      semaphore = limiter.async_semaphore()
+      try:
+        await asyncio.wait_for(semaphore.acquire(), _remaining(deadline))
+      except asyncio.TimeoutError as e:
+        raise SlotTimeoutError("Timed out waiting for a concurrency slot") from e
+      stack.callback(semaphore.release)
+    yield
@@ -0,0 +1,20 @@
+from typing import List, NamedTuple, Optional
+
+
+class MapSpec(NamedTuple):
+  """Fan a node out over a list field at run time, enabled with `@graph.node(map=MapSpec(...))`.
+
+  The node function is called once per item as `fn(state, item)` and its return values are appended to
+  the History field `into`, in item order. Items run in chunks on the worker threads; no per-item graph
+  nodes are created, so the fan-out width can depend on the data.
+  """
+
+  over: str  # list field of the state holding the items
+  into: str  # History field collecting one result per item
+  max_concurrency: Optional[int] = None  # chunks of one call running at once. None runs every chunk at once
+  chunk_size: int = 1  # items each worker task runs back to back
+
+
+def chunk_ranges(count: int, chunk_size: int) -> List[range]:
+  """Split `range(count)` into consecutive ranges of at most `chunk_size` indexes."""
+  return [range(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
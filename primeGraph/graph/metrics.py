@@ -0,0 +1,337 @@
+import bisect
+import math
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, cast
+
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+RESERVOIR_SIZE = 512  # most recent observations kept per thread for the percentiles
+
+M = TypeVar("M", bound="Metric")
+
+
+class Metric:
+  """Base of the registry's metrics.
+
+  Updates go to a cell owned by the updating thread, so the hot path takes no lock: a thread only ever writes
+  its own cell and readers add the cells up. A snapshot taken while other threads update can be off by the
+  updates in flight, as with any scraped metric.
+
+  A metric declared with `labelnames` is a family: `labels(*values)` returns (creating it on first use) the
+  child metric holding the values for one combination of label values.
+  """
+
+  kind = "untyped"
+
+  def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+    self.name = name
+    self.documentation = documentation
+    self.labelnames = tuple(labelnames)
+    self._children: Dict[Tuple[str, ...], Any] = {}
+    self._cells: Dict[int, Any] = {}
+    self._lock = threading.Lock()
+
+  def labels(self: M, *values: str) -> M:
+    child = self._children.get(values)
+    if child is None:
+      if len(values) != len(self.labelnames):
+        raise ValueError(f"Metric '{self.name}' expects labels {self.labelnames}, got {values}")
+      with self._lock:
+        child = self._children.setdefault(values, self._child())
+    return cast(M, child)
+
+  def children(self) -> List[Tuple[Dict[str, str], Any]]:
+    """(labels, metric) pairs holding the values: the children of a family, or the metric itself."""
+    if not self.labelnames:
+      return [({}, self)]
+    with self._lock:
+      items = list(self._children.items())
+    return [(dict(zip(self.labelnames, values, strict=True)), child) for values, child in items]
+
+  def _child(self: M) -> M:
+    raise NotImplementedError
+
+  def _cell(self) -> Any:
+    ident = threading.get_ident()
+    cell = self._cells.get(ident)
+    if cell is None:
+      # a thread reusing the ident of a finished one takes over its cell, so values are never lost
+      with self._lock:
+        cell = self._cells.setdefault(ident, self._new_cell())
+    return cell
+
+  def _all_cells(self) -> List[Any]:
+    with self._lock:
+      return list(self._cells.values())
+
+  def _new_cell(self) -> Any:
+    return [0.0]
+
+  def _samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+    """(name suffix, extra labels, value) lines of one child in the Prometheus text format."""
+    raise NotImplementedError
+
+
+class Counter(Metric):
+  kind = "counter"
+
+  def inc(self, amount: float = 1.0) -> None:
+    if amount < 0:
+      raise ValueError("Counters can only increase")
+    self._cell()[0] += amount
+
+  @property
+  def value(self) -> float:
+    return float(sum(cell[0] for cell in self._all_cells()))
+
+  def _child(self) -> "Counter":
+    return Counter(self.name, self.documentation)
+
+  def _samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+    yield "", {}, self.value
+
+
+class Gauge(Metric):
+  """A value that goes up and down. `set_function` makes it report a callback's value when read instead."""
+
+  kind = "gauge"
+
+  def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+    super().__init__(name, documentation, labelnames)
+    self._base = 0.0
+    self._function: Optional[Callable[[], float]] = None
+
+  def inc(self, amount: float = 1.0) -> None:
+    self._cell()[0] += amount
+
+  def dec(self, amount: float = 1.0) -> None:
+    self._cell()[0] -= amount
+
+  def set(self, value: float) -> None:
+    with self._lock:
+      for cell in self._cells.values():
+        cell[0] = 0.0
+      self._base = value
+
+  def set_function(self, function: Callable[[], float]) -> None:
+    self._function = function
+
+  @property
+  def value(self) -> float:
+    if self._function is not None:
+      return float(self._function())
+    return self._base + float(sum(cell[0] for cell in self._all_cells()))
+
+  def _child(self) -> "Gauge":
+    return Gauge(self.name, self.documentation)
+
+  def _samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+    yield "", {}, self.value
+
+
+class _HistogramCell:
+  __slots__ = ("counts", "observed", "samples", "total")
+
+  def __init__(self, buckets: int):
+    self.counts = [0] * (buckets + 1)  # the last one is +Inf
+    self.total = 0.0
+    self.observed = 0
+    self.samples: List[float] = []
+
+
+class Histogram(Metric):
+  """Observations counted into fixed buckets (exported as a Prometheus histogram), plus a window of the most
+  recent observations of each thread from which `percentiles` are computed.
+  """
+
+  kind = "histogram"
+
+  def __init__(
+    self,
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+  ):
+    super().__init__(name, documentation, labelnames)
+    self.buckets = tuple(sorted(buckets))
+    if not self.buckets or self.buckets[-1] == math.inf:
+      raise ValueError("Histogram buckets must be finite upper bounds (+Inf is implied)")
+
+  def observe(self, value: float) -> None:
+    cell = self._cell()
+    cell.counts[bisect.bisect_left(self.buckets, value)] += 1
+    cell.total += value
+    if len(cell.samples) < RESERVOIR_SIZE:
+      cell.samples.append(value)
+    else:
+      cell.samples[cell.observed % RESERVOIR_SIZE] = value
+    cell.observed += 1
+
+  @property
+  def count(self) -> int:
+    return sum(cell.observed for cell in self._all_cells())
+
+  @property
+  def sum(self) -> float:
+    return float(sum(cell.total for cell in self._all_cells()))
+
+  def percentiles(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[float, float]:
+    """Nearest-rank percentiles of the recent observations, e.g. {0.5: p50, 0.95: p95, 0.99: p99}."""
+    samples = sorted(value for cell in self._all_cells() for value in list(cell.samples))
+    if not samples:
+      return dict.fromkeys(quantiles, math.nan)
+    return {q: samples[max(0, math.ceil(q * len(samples)) - 1)] for q in quantiles}
+
+  def _child(self) -> "Histogram":
+    return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+  def _new_cell(self) -> _HistogramCell:
+    return _HistogramCell(len(self.buckets))
+
+  def _samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+    cells = self._all_cells()
+    cumulative = 0
+    for index, bound in enumerate((*self.buckets, math.inf)):
+      cumulative += sum(cell.counts[index] for cell in cells)
+      yield "_bucket", {"le": _format_value(bound)}, cumulative
+    yield "_sum", {}, sum(cell.total for cell in cells)
+    yield "_count", {}, sum(cell.observed for cell in cells)
+
+
+class MetricsRegistry:
+  """In-process metrics, rendered in the Prometheus text format by `render_prometheus`.
+
+  The `counter`, `gauge` and `histogram` methods return the registered metric of that name, creating it on
+  first use. Histogram percentiles are exported as a `<name>_quantile` gauge family next to the histogram.
+  """
+
+  def __init__(self) -> None:
+    self._metrics: Dict[str, Metric] = {}
+    self._lock = threading.Lock()
+
+  def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return self._register(Counter, name, documentation, labelnames)
+
+  def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return self._register(Gauge, name, documentation, labelnames)
+
+  def histogram(
+    self,
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+  ) -> Histogram:
+    return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+  def get(self, name: str) -> Optional[Metric]:
+    return self._metrics.get(name)
+
+  def render_prometheus(self) -> str:
+    with self._lock:
+      metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+    lines: List[str] = []
+    for metric in metrics:
+      lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+      lines.append(f"# TYPE {metric.name} {metric.kind}")
+      children = metric.children()
+      for labels, child in children:
+        for suffix, extra, value in child._samples():
+          lines.append(f"{metric.name}{suffix}{_format_labels({**labels, **extra})} {_format_value(value)}")
+      if isinstance(metric, Histogram):
+        lines.append(f"# HELP {metric.name}_quantile Percentiles of the recent observations of {metric.name}")
+        lines.append(f"# TYPE {metric.name}_quantile gauge")
+        for labels, child in children:
+          for quantile, value in child.percentiles().items():
+            quantile_labels = _format_labels({**labels, "quantile": _format_value(quantile)})
+            lines.append(f"{metric.name}_quantile{quantile_labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+  def _register(
+    self, cls: Callable[..., M], name: str, documentation: str, labelnames: Sequence[str], **kwargs: Any
+  ) -> M:
+    with self._lock:
+      metric = self._metrics.get(name)
+      if metric is None:
+        metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+      elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+        raise ValueError(f"Metric '{name}' is already registered as a {metric.kind} with labels {metric.labelnames}")
+    return metric  # type: ignore[return-value]
+
+
+def _format_value(value: float) -> str:
+  if math.isinf(value):
+    return "+Inf" if value > 0 else "-Inf"
+  if math.isnan(value):
+    return "NaN"
+  return str(int(value)) if float(value).is_integer() and abs(value) < 2**53 else repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+  return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+  if not labels:
+    return ""
+  return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape_label(value: str) -> str:
+  return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class EngineMetrics:
+  """The metrics recorded by the graph engines into a registry (see `Graph(metrics=...)`)."""
+
+  def __init__(self, registry: MetricsRegistry):
+    self.node_duration = registry.histogram(
+      "primegraph_node_duration_seconds",
+      "Time from a node being scheduled to its updates reaching the buffers",
+      ("node",),
+    )
+    self.chain_duration = registry.histogram(
+      "primegraph_chain_duration_seconds",
+      "Duration of chain runs (start or resume), by how the run ended",
+      ("status",),
+    )
+    self.active_chains = registry.gauge("primegraph_active_chains", "Chains currently running")
+    self.checkpoint_save = registry.histogram(
+      "primegraph_checkpoint_save_seconds", "Checkpoint save latency by storage backend", ("backend",)
+    )
+    self.checkpoint_load = registry.histogram(
+      "primegraph_checkpoint_load_seconds", "Checkpoint load latency by storage backend", ("backend",)
+    )
+    self.group_width = registry.histogram(
+      "primegraph_parallel_group_width", "Branches per parallel group", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+    )
+    self.queue_depth = registry.gauge(
+      "primegraph_worker_queue_depth", "Node actions waiting for a worker in the worker pools of the graphs"
+    )
+    self._pools: "weakref.WeakSet[Any]" = weakref.WeakSet()
+    self.queue_depth.set_function(lambda: sum(pool.queue_depth for pool in list(self._pools)))
+
+  def watch_pool(self, pool: Any) -> None:
+    """Count the queue of `pool` (a WorkerPool) in the queue depth gauge."""
+    self._pools.add(pool)
+
+
+_default_registry = MetricsRegistry()
+_engine_metrics: "weakref.WeakKeyDictionary[MetricsRegistry, EngineMetrics]" = weakref.WeakKeyDictionary()
+_engine_metrics_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+  """Process-wide registry used by every `Graph` that is not given its own."""
+  return _default_registry
+
+
+def get_engine_metrics(registry: MetricsRegistry) -> EngineMetrics:
+  """The engine metrics of `registry`, registered on first use and shared by every graph reporting to it."""
+  with _engine_metrics_lock:
+    metrics = _engine_metrics.get(registry)
+    if metrics is None:
+      metrics = _engine_metrics[registry] = EngineMetrics(registry)
+  return metrics
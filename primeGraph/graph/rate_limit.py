@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class RateLimiterStats(NamedTuple):
+  acquired: int
+  throttled: int
+  throttled_seconds: float
+
+
+class TokenBucket:
+  """Token bucket shared by every node (of every graph and chain) bound to the same limiter name.
+
+  Calls reserve a token up front and are told how long to wait for it, so waiters are served in
+  arrival order and the wait itself happens wherever the engine can afford it: `time.sleep` in a
+  branch driver, `asyncio.sleep` in the async engine, or a delayed dispatch in the dataflow scheduler.
+  """
+
+  def __init__(self, rate: float, capacity: Optional[float] = None):
+    """
+    Args:
+        rate: Tokens added per second (sustained calls per second)
+        capacity: Maximum burst size. Defaults to max(1, rate)
+    """
+    self.rate, self.capacity = self._checked(rate, capacity)
+    self._tokens = self.capacity
+    self._updated_at = time.monotonic()
+    self._lock = threading.Lock()
+    self._acquired = 0
+    self._throttled = 0
+    self._throttled_seconds = 0.0
+
+  @staticmethod
+  def _checked(rate: float, capacity: Optional[float]) -> Tuple[float, float]:
+    if rate <= 0:
+      raise ValueError("Rate limiter rate must be positive")
+    capacity = capacity if capacity is not None else max(1.0, rate)
+    if capacity < 1:
+      raise ValueError("Rate limiter capacity must be at least 1")
+    return rate, capacity
+
+  def configure(self, rate: float, capacity: Optional[float] = None) -> None:
+    """Change the rate and capacity in place, for the nodes already bound to this bucket too."""
+    rate, capacity = self._checked(rate, capacity)
+    with self._lock:
+      self._refill(time.monotonic())
+      self.rate, self.capacity = rate, capacity
+      self._tokens = min(self._tokens, capacity)
+
+  def _refill(self, now: float) -> None:
+    self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+    self._updated_at = now
+
+  def reserve(self, tokens: float = 1) -> float:
+    """Take `tokens` from the bucket and return how many seconds the caller must wait before using them."""
+    with self._lock:
+      self._refill(time.monotonic())
+      self._tokens -= tokens
+      wait = max(0.0, -self._tokens / self.rate)
+
+      self._acquired += 1
+      if wait:
+        self._throttled += 1
+        self._throttled_seconds += wait
+      return wait
+
+  def acquire(self) -> float:
+    """Block the calling thread until a token is available. Returns the time spent throttled."""
+    wait = self.reserve()
+    if wait:
+      time.sleep(wait)
+    return wait
+
+  async def acquire_async(self) -> float:
+    """Wait for a token without blocking the event loop. Returns the time spent throttled."""
+    wait = self.reserve()
+    if wait:
+      await asyncio.sleep(wait)
+    return wait
+
+  def stats(self) -> RateLimiterStats:
+    with self._lock:
+      return RateLimiterStats(self._acquired, self._throttled, self._throttled_seconds)
+
+
+_rate_limiters: Dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def register_rate_limiter(name: str, rate: float, capacity: Optional[float] = None) -> TokenBucket:
+  """Create the process-wide limiter nodes bind to with `@graph.node(rate_limit=name)`.
+
+  Registering an existing name reconfigures its bucket in place, so graphs compiled against it follow the new
+  rate and capacity (and its stats are kept).
+  """
+  with _rate_limiters_lock:
+    bucket = _rate_limiters.get(name)
+    if bucket is None:
+      bucket = _rate_limiters[name] = TokenBucket(rate, capacity)
+      return bucket
+  bucket.configure(rate, capacity)
+  return bucket
+
+
+def get_rate_limiter(name: str) -> TokenBucket:
+  with _rate_limiters_lock:
+    bucket = _rate_limiters.get(name)
+  if bucket is None:
+    raise ValueError(f"Rate limiter '{name}' is not registered. Call register_rate_limiter first")
+  return bucket
+
+
+def rate_limiter_stats() -> Dict[str, RateLimiterStats]:
+  """Throttling metrics of every registered limiter."""
+  with _rate_limiters_lock:
+    buckets = dict(_rate_limiters)
+  return {name: bucket.stats() for name, bucket in buckets.items()}
@@ -0,0 +1,57 @@
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from primeGraph.graph.cancellation import CancellationToken
+
+
+class Speculation(NamedTuple):
+  """A route node started while its router was still deciding. Its raw result is only applied if chosen."""
+
+  future: Any  # concurrent.futures.Future (sync engine) or asyncio.Task (async engine)
+  token: CancellationToken
+  started_at: float  # time.perf_counter() of the speculative start
+
+
+class SpeculationStats(NamedTuple):
+  route_counts: Dict[str, int]  # observed decisions of the router
+  hits: int  # decisions whose route had been started speculatively
+  misses: int  # decisions whose route had not been started
+  wasted: int  # speculative runs discarded because their route was not taken
+
+
+class RouteStatistics:
+  """Observed route frequencies of one speculative router, shared by every chain of the graph.
+
+  Static hints act as prior counts, so they decide the first guesses and observed decisions take over.
+  """
+
+  def __init__(self, candidates: Sequence[str], width: int, hints: Optional[Dict[str, float]] = None):
+    self.candidates = tuple(sorted(candidates))
+    self.width = width
+    self._hints = dict(hints or {})
+    self._counts: Counter = Counter()
+    self._hits = 0
+    self._misses = 0
+    self._wasted = 0
+    self._lock = threading.Lock()
+
+  def likely_routes(self) -> List[str]:
+    with self._lock:
+      scores = {route: self._counts[route] + self._hints.get(route, 0.0) for route in self.candidates}
+    return sorted(self.candidates, key=lambda route: -scores[route])[: self.width]
+
+  def record(self, route: str, speculated: Iterable[str]) -> None:
+    speculated = set(speculated)
+    with self._lock:
+      self._counts[route] += 1
+      if route in speculated:
+        self._hits += 1
+        self._wasted += len(speculated) - 1
+      else:
+        self._misses += 1
+        self._wasted += len(speculated)
+
+  def stats(self) -> SpeculationStats:
+    with self._lock:
+      return SpeculationStats(dict(self._counts), self._hits, self._misses, self._wasted)
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+from typing import Any, FrozenSet, Tuple
+
+
+class StateView:
+  """Read-only projection of a chain's state onto the fields a node declared in `reads`.
+
+  Attribute reads go straight to the underlying state (nothing is copied). Pickling a view, e.g. to ship it
+  to a process worker, only serializes the declared fields.
+  """
+
+  __slots__ = ("_fields", "_state")
+
+  def __init__(self, state: Any, fields: FrozenSet[str]):
+    object.__setattr__(self, "_state", state)
+    object.__setattr__(self, "_fields", fields)
+
+  def __getattr__(self, name: str) -> Any:
+    if name in self._fields:
+      return getattr(self._state, name)
+    raise AttributeError(f"Field '{name}' is not in the node's declared reads")
+
+  def __setattr__(self, name: str, value: Any) -> None:
+    raise AttributeError("State views are read-only. Return updates from the node instead")
+
+  def __reduce__(self) -> Tuple[Any, ...]:
+    values = SimpleNamespace(**{name: getattr(self._state, name) for name in self._fields})
+    return (StateView, (values, self._fields))
+
+  def __repr__(self) -> str:
+    fields = ", ".join(f"{name}={getattr(self._state, name)!r}" for name in sorted(self._fields))
+    return f"StateView({fields})"
@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, ContextManager, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# returned by the span helpers when tracing is off, so a disabled tracer costs one attribute check per span
+NO_SPAN: ContextManager[None] = contextlib.nullcontext()
+
+
+class TraceEvent(NamedTuple):
+  name: str
+  category: str  # node, action, buffers, checkpoint, router or group
+  start: float  # time.perf_counter() of the start
+  duration: Optional[float]  # None for instant events
+  lane: int  # thread ident, or id() of the asyncio task that recorded the event
+  lane_name: str
+  args: Dict[str, Any]
+
+
+class Tracer:
+  """Opt-in recorder of what a chain spends its time on, attached with `graph.new_context(tracer=Tracer())`.
+
+  Spans are recorded for node runs (from scheduling to their updates being applied), the node actions
+  themselves, buffer merges, checkpoint serialization and storage writes and parallel group joins, plus an
+  instant event per router decision. Each event is tagged with the thread or asyncio task that recorded it.
+  A tracer can be shared by several chains. `export_chrome_trace` writes a file for chrome://tracing or
+  https://ui.perfetto.dev.
+  """
+
+  def __init__(self) -> None:
+    self._events: List[TraceEvent] = []
+    self._lock = threading.Lock()
+    self._origin = time.perf_counter()
+
+  @contextlib.contextmanager
+  def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.add_span(name, category, start, time.perf_counter() - start, **args)
+
+  def add_span(self, name: str, category: str, start: float, duration: float, **args: Any) -> None:
+    """Record a span measured by the caller, e.g. from a time.perf_counter() taken on another thread."""
+    self._add(TraceEvent(name, category, start, duration, *self._lane(), args))
+
+  def instant(self, name: str, category: str, **args: Any) -> None:
+    self._add(TraceEvent(name, category, time.perf_counter(), None, *self._lane(), args))
+
+  def events(self) -> List[TraceEvent]:
+    with self._lock:
+      return list(self._events)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._events.clear()
+
+  def to_chrome_trace(self) -> Dict[str, Any]:
+    """The recorded events in the Chrome trace event format (timestamps in microseconds)."""
+    pid = os.getpid()
+    trace_events: List[Dict[str, Any]] = []
+    lanes: Dict[int, str] = {}
+    for event in self.events():
+      lanes.setdefault(event.lane, event.lane_name)
+      entry = {
+        "name": event.name,
+        "cat": event.category,
+        "ts": (event.start - self._origin) * 1e6,
+        "pid": pid,
+        "tid": event.lane,
+        "args": event.args,
+      }
+      if event.duration is None:
+        entry.update(ph="i", s="t")
+      else:
+        entry.update(ph="X", dur=event.duration * 1e6)
+      trace_events.append(entry)
+    for lane, lane_name in lanes.items():
+      trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": lane, "args": {"name": lane_name}})
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+  def export_chrome_trace(self, path: str) -> None:
+    with open(path, "w") as f:
+      json.dump(self.to_chrome_trace(), f, default=repr)
+
+  def _add(self, event: TraceEvent) -> None:
+    with self._lock:
+      self._events.append(event)
+
+  @staticmethod
+  def _lane() -> Tuple[int, str]:
+    # concurrent tasks of one event loop get lanes of their own, so their spans nest properly in a viewer
+    try:
+      task = asyncio.current_task()
+    except RuntimeError:
+      task = None
+    if task is not None:
+      return id(task), task.get_name()
+    thread = threading.current_thread()
+    return thread.ident or 0, thread.name
+
+
+_active_tracer: ContextVar[Optional[Tracer]] = ContextVar("primeGraph_active_tracer", default=None)
+
+
+@contextlib.contextmanager
+def activate(tracer: Optional[Tracer]) -> Iterator[None]:
+  """Make `tracer` the one `trace_span` records into, e.g. inside checkpoint storage backends."""
+  reset = _active_tracer.set(tracer)
+  try:
+    yield
+  finally:
+    _active_tracer.reset(reset)
+
+
+def trace_span(name: str, category: str, **args: Any) -> ContextManager[None]:
+  """A span of the active tracer (see `activate`), for code that has no execution context at hand."""
+  tracer = _active_tracer.get()
+  return tracer.span(name, category, **args) if tracer is not None else NO_SPAN
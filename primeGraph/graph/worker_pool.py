@@ -0,0 +1,233 @@
+import functools
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class WorkerPool:
+  """Long-lived thread pool used by the sync engine (and by the async engine for sync nodes).
+
+  Node actions are submitted to a bounded task executor. Parallel branches are driven by a second,
+  bounded branch executor: they are queued and drained by the calling thread and by as many branch workers as
+  there are free branch slots. The caller always takes part, so branch drivers never wait on work that nobody
+  runs, which keeps nested fan-outs deadlock free and the total thread count bounded.
+
+  Nodes declared with `executor="process"` run on `max_processes` worker processes, each behind an executor of
+  its own (created on first use) so that a call that times out can be killed without failing the calls other
+  chains run on the other workers. Process calls wait in a queue of the pool until a worker is free.
+
+  A pool can be shared by any number of `Graph` instances.
+  """
+
+  def __init__(
+    self,
+    max_workers: Optional[int] = None,
+    max_branch_workers: Optional[int] = None,
+    max_processes: Optional[int] = None,
+  ):
+    self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+    self.max_branch_workers = max_branch_workers or self.max_workers
+    self.max_processes = max_processes or os.cpu_count() or 1
+    if self.max_workers < 1 or self.max_branch_workers < 1 or self.max_processes < 1:
+      raise ValueError("Worker pool sizes must be at least 1")
+
+    self._executor: Optional[ThreadPoolExecutor] = None
+    self._branch_executor: Optional[ThreadPoolExecutor] = None
+    # one single-process executor per worker, the call it runs, and the calls waiting for a free worker
+    self._process_slots: List[Optional[ProcessPoolExecutor]] = [None] * self.max_processes
+    self._process_calls: List[Optional[Future]] = [None] * self.max_processes
+    self._process_queue: Deque[Tuple[Future, Callable[..., Any], Tuple[Any, ...], Any]] = deque()
+    self._branch_slots = threading.BoundedSemaphore(self.max_branch_workers)
+    self._lock = threading.Lock()
+
+  @property
+  def executor(self) -> ThreadPoolExecutor:
+    """The executor node actions run on. Created on first use."""
+    if self._executor is None:
+      with self._lock:
+        if self._executor is None:
+          self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="primeGraph-task")
+    return self._executor
+
+  @property
+  def branch_executor(self) -> ThreadPoolExecutor:
+    if self._branch_executor is None:
+      with self._lock:
+        if self._branch_executor is None:
+          self._branch_executor = ThreadPoolExecutor(
+            max_workers=self.max_branch_workers, thread_name_prefix="primeGraph-branch"
+          )
+    return self._branch_executor
+
+  @property
+  def queue_depth(self) -> int:
+    """Node actions submitted to the task executor and still waiting for a free worker."""
+    executor = self._executor
+    # ThreadPoolExecutor has no public accessor for its work queue
+    return executor._work_queue.qsize() if executor is not None else 0
+
+  def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """Schedule a node action on the task executor."""
+    return self.executor.submit(fn, *args, **kwargs)
+
+  def submit_process(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """Schedule a picklable call on a worker process."""
+    future: Future = Future()
+    with self._lock:
+      self._process_queue.append((future, fn, args, kwargs))
+      started = self._dispatch_processes()
+    self._watch_processes(started)
+    return future
+
+  def kill_process(self, future: Future) -> None:
+    """Hard-stop the worker process running the call of `future`, e.g. after a node timeout.
+
+    Unlike threads, process workers can actually be stopped. Only that worker is killed (and replaced on next
+    use): calls running on the other workers are unaffected. A call still waiting for a worker is just dropped.
+    """
+    with self._lock:
+      if future not in self._process_calls:
+        future.cancel()
+        return
+      slot = self._process_calls.index(future)
+      executor = self._process_slots[slot]
+      self._process_slots[slot] = self._process_calls[slot] = None
+      started = self._dispatch_processes()
+    self._watch_processes(started)
+    if not future.done():
+      future.set_exception(BrokenProcessPool("The worker process was killed"))
+    if executor is not None:
+      # no public API to reach the worker processes before Python 3.14
+      for process in list(getattr(executor, "_processes", {}).values()):
+        process.kill()
+      executor.shutdown(wait=False, cancel_futures=True)
+
+  def _dispatch_processes(self) -> List[Tuple[int, Future, Future]]:
+    """Start queued process calls on the free workers, with the lock held. Returns (slot, call, worker future)
+    triples to pass to `_watch_processes` once the lock is released.
+    """
+    started: List[Tuple[int, Future, Future]] = []
+    free = [slot for slot, call in enumerate(self._process_calls) if call is None]
+    while free and self._process_queue:
+      future, fn, args, kwargs = self._process_queue.popleft()
+      if not future.set_running_or_notify_cancel():
+        continue  # cancelled while waiting
+      slot = free.pop(0)
+      executor = self._process_slots[slot]
+      if executor is None:
+        executor = self._process_slots[slot] = ProcessPoolExecutor(max_workers=1)
+      self._process_calls[slot] = future
+      started.append((slot, future, executor.submit(fn, *args, **kwargs)))
+    return started
+
+  def _watch_processes(self, started: List[Tuple[int, Future, Future]]) -> None:
+    # callbacks of calls that already finished run right away, so they are never added with the lock held
+    for slot, future, done in started:
+      done.add_done_callback(functools.partial(self._process_done, slot, future))
+
+  def _process_done(self, slot: int, future: Future, done: Future) -> None:
+    started: List[Tuple[int, Future, Future]] = []
+    with self._lock:
+      running = self._process_calls[slot] is future
+      if running:
+        self._process_calls[slot] = None
+        started = self._dispatch_processes()
+    self._watch_processes(started)
+    if not running:
+      return  # killed, `kill_process` settles the call
+    error = done.exception()
+    if error is not None:
+      future.set_exception(error)
+    else:
+      future.set_result(done.result())
+
+  def run_branches(self, branches: List[Callable[[], Any]]) -> List[Future]:
+    """Run parallel branches, returning one future per branch (in the same order).
+
+    The branches are queued and drained by the calling thread together with one branch worker per free
+    branch slot. Before each branch it runs, the caller starts workers on the slots freed in the meantime, so
+    it only runs branches itself while no worker is free. Returns once every branch has been started and the
+    caller's share has finished; a branch cancelled through its future before it starts is skipped.
+    """
+    futures: List[Future] = [Future() for _ in branches]
+    pending: Deque[Tuple[Callable[[], Any], Future]] = deque(zip(branches, futures, strict=True))
+    lock = threading.Lock()
+
+    def drain() -> None:
+      while True:
+        with lock:
+          if not pending:
+            return
+          branch, future = pending.popleft()
+        if future.set_running_or_notify_cancel():
+          self._run_into(future, branch)
+
+    def worker() -> None:
+      try:
+        drain()
+      finally:
+        self._branch_slots.release()
+
+    while True:
+      with lock:
+        if not pending:
+          break
+        branch, future = pending.popleft()
+        # the caller takes this branch: start workers for the others while branch slots are free
+        wanted = len(pending)
+      while wanted and self._branch_slots.acquire(blocking=False):
+        self.branch_executor.submit(worker)
+        wanted -= 1
+      if future.set_running_or_notify_cancel():
+        self._run_into(future, branch)
+
+    return futures
+
+  @staticmethod
+  def _run_into(future: Future, fn: Callable[[], Any]) -> None:
+    try:
+      future.set_result(fn())
+    except BaseException as e:
+      future.set_exception(e)
+
+  def shutdown(self, wait: bool = True) -> None:
+    with self._lock:
+      if self._executor is not None:
+        self._executor.shutdown(wait=wait)
+        self._executor = None
+      if self._branch_executor is not None:
+        self._branch_executor.shutdown(wait=wait)
+        self._branch_executor = None
+      # calls still running settle (and free their slot) when their executor finishes them
+      executors = [executor for executor in self._process_slots if executor is not None]
+      self._process_slots = [None] * self.max_processes
+      queued, self._process_queue = self._process_queue, deque()
+    for future, *_ in queued:
+      future.cancel()
+    for executor in executors:
+      executor.shutdown(wait=wait)
+
+  def __enter__(self) -> "WorkerPool":
+    return self
+
+  def __exit__(self, *_: Any) -> None:
+    self.shutdown()
+
+
+_default_pool: Optional[WorkerPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_worker_pool() -> WorkerPool:
+  """Process-wide pool used by every `Graph` that is not given its own."""
+  global _default_pool  # noqa: PLW0603
+  if _default_pool is None:
+    with _default_pool_lock:
+      if _default_pool is None:
+        _default_pool = WorkerPool()
+  return _default_pool
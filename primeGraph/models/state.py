@@ -1,9 +1,59 @@
 import hashlib
-from typing import Any, Dict, Type, get_args, get_origin, get_type_hints
+import threading
+import weakref
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Type, get_args, get_origin, get_type_hints
 
 from pydantic import BaseModel, ConfigDict, model_validator
 
 from primeGraph.buffer.factory import BufferTypeMarker, History
+from primeGraph.buffer.history_types import HistoryView
+from primeGraph.buffer.validation import Validator, compile_items_validator, compile_validator
+
+
+class StateSchema(NamedTuple):
+  """What a GraphState class needs at run time, derived once from its type hints."""
+
+  fingerprint: str  # md5 of the field names and types, stored in checkpoints as the state version
+  buffer_types: Dict[str, Any]  # buffer annotation of each field, e.g. History[str]
+  unbuffered: Tuple[str, ...]  # fields declared without a buffer type
+  validators: Dict[str, Validator]  # value checks of the buffer fields with a checkable inner type
+
+
+def _history_validator(field_name: str, validate_items: Optional[Validator]) -> Validator:
+  def validate_history(value: Any) -> None:
+    if not isinstance(value, (list, HistoryView)):
+      raise TypeError(f"Field {field_name} must be a list")
+    if validate_items is not None:
+      validate_items(value)
+
+  return validate_history
+
+
+def _build_schema(cls: Type["GraphState"]) -> StateSchema:
+  hints = {name: hint for name, hint in get_type_hints(cls).items() if name != "version"}
+  signature = sorted((name, repr(hint)) for name, hint in hints.items())
+  buffer_types: Dict[str, Any] = {}
+  validators: Dict[str, Validator] = {}
+  unbuffered = []
+  for field_name, field_type in hints.items():
+    origin = get_origin(field_type)
+    if not (isinstance(origin, type) and issubclass(origin, BufferTypeMarker)):
+      unbuffered.append(field_name)
+      continue
+    buffer_types[field_name] = field_type
+    inner_type = get_args(field_type)[0]
+    if origin is History:
+      validators[field_name] = _history_validator(field_name, compile_items_validator(inner_type))
+    else:
+      validate_value = compile_validator(inner_type)
+      if validate_value is not None:
+        validators[field_name] = validate_value
+  fingerprint = hashlib.md5(str(signature).encode()).hexdigest()
+  return StateSchema(fingerprint, buffer_types, tuple(unbuffered), validators)
+
+
+_schemas: "weakref.WeakKeyDictionary[type, StateSchema]" = weakref.WeakKeyDictionary()
+_schemas_lock = threading.Lock()
 
 
 class GraphState(BaseModel):
@@ -21,83 +71,36 @@ class GraphState(BaseModel):
     if name != "version":
       self.update_version()
 
+  @classmethod
+  def state_schema(cls) -> StateSchema:
+    """The fingerprint, buffer types and validators of this class, built on first use."""
+    schema = _schemas.get(cls)
+    if schema is None:
+      with _schemas_lock:
+        schema = _schemas.get(cls)
+        if schema is None:
+          schema = _schemas[cls] = _build_schema(cls)
+    return schema
+
   def update_version(self) -> None:
-    """Update the version based only on the model's attribute names."""
-    # Get only the field names, ignoring their values
-    field_names = sorted([field_name for field_name in self.model_fields if field_name != "version"])
-    state_str = str(field_names)
-    super().__setattr__("version", hashlib.md5(state_str.encode()).hexdigest())
+    """Set the version to the fingerprint of the model's field names and types (values are ignored)."""
+    fingerprint = self.state_schema().fingerprint
+    if self.__dict__.get("version") != fingerprint:
+      super().__setattr__("version", fingerprint)
 
   @model_validator(mode="before")
   @classmethod
   def wrap_buffer_types(cls, values: Dict[str, Any]) -> Dict[str, Any]:
-    hints = get_type_hints(cls)
-
-    def validate_dict_contents(value: dict, key_type: Type, value_type: Type) -> None:
-      for k, v in value.items():
-        if not isinstance(k, key_type):
-          raise TypeError(f"Dict key must be {key_type}, got {type(k)}")
-        validate_value(v, value_type)
-
-    def validate_list_contents(value: list, item_type: Type) -> None:
-      for item in value:
-        validate_value(item, item_type)
-
-    def validate_value(value: Any, expected_type: Type) -> None:
-      # Special case: Any accepts everything
-      if expected_type is Any:
-        return
-
-      origin = get_origin(expected_type)
-      if origin is None:
-        if not isinstance(value, expected_type):
-          raise TypeError(f"Value must be {expected_type}, got {type(value)}")
-        return
-
-      if origin is dict:
-        if not isinstance(value, dict):
-          raise TypeError(f"Value must be dict, got {type(value)}")
-        key_type, value_type = get_args(expected_type)
-        validate_dict_contents(value, key_type, value_type)
-      elif origin is list:
-        if not isinstance(value, list):
-          raise TypeError(f"Value must be list, got {type(value)}")
-        item_type = get_args(expected_type)[0]
-        validate_list_contents(value, item_type)
-
-    for field_name, field_type in hints.items():
-      if field_name not in values:
-        continue
-
-      origin = get_origin(field_type)
-      if origin is not None and issubclass(origin, BufferTypeMarker):
-        inner_type = get_args(field_type)[0]
-        value = values[field_name]
-
-        if origin is History:
-          if not isinstance(value, list):
-            raise TypeError(f"Field {field_name} must be a list")
-          for item in value:
-            validate_value(item, inner_type)
-        else:
-          validate_value(value, inner_type)
-
+    for field_name, validate in cls.state_schema().validators.items():
+      if field_name in values:
+        validate(values[field_name])
     return values
 
   @classmethod
   def get_buffer_types(cls) -> Dict[str, Any]:
     """Returns a mapping of field names to their buffer types"""
-    annotations = get_type_hints(cls)
-    buffer_types = {}
-
-    for field_name, field_type in annotations.items():
-      if field_name == "version":
-        continue
-
-      origin = get_origin(field_type)
-      if origin is not None and issubclass(origin, BufferTypeMarker):
-        buffer_types[field_name] = field_type
-      else:
-        raise ValueError(f"Field {field_name} is not using a buffer type (History, Incremental, LastValue, etc)")
-
-    return buffer_types
+    schema = cls.state_schema()
+    if schema.unbuffered:
+      field_name = schema.unbuffered[0]
+      raise ValueError(f"Field {field_name} is not using a buffer type (History, Incremental, LastValue, etc)")
+    return dict(schema.buffer_types)
@@ -1,37 +1,40 @@
 import inspect
+import sys
 from functools import wraps
-from typing import Any, Callable, TypeVar
-
-# Minimum stack depth needed for internal method check
-MIN_STACK_DEPTH = 2
+from types import FrameType
+from typing import Any, Callable, Optional, TypeVar
 
 T = TypeVar("T")  # Define a generic type variable
 
 
+def _caller_frame() -> Optional[FrameType]:
+  """The frame calling the function that called this one, or None without frame support."""
+  if hasattr(sys, "_getframe"):
+    return sys._getframe(2)
+  frame = inspect.currentframe()
+  return frame.f_back.f_back if frame is not None and frame.f_back is not None else None
+
+
 def internal_only(func: Callable[..., T]) -> Callable[..., T]:
+  """Only let other methods of the same instance call the decorated method.
+
+  The check looks at the calling frame alone, so its cost does not depend on the stack depth. It is skipped
+  entirely when Python runs with -O, like assertions.
+  """
+  if not __debug__:
+    return func
+
   @wraps(func)
   def wrapper(*args: Any, **kwargs: Any) -> T:
-    # Get the call stack
-    stack = inspect.stack()
-
-    # We need at least the wrapper frame and the caller frame
-    if len(stack) >= MIN_STACK_DEPTH:
-      # Get the caller frame (the method that called our decorated method)
-      caller_frame = stack[1]
-
-      # Get the instance that's calling the method (self in the caller's context)
-      caller_self = caller_frame.frame.f_locals.get("self", None)
-      # Get the current instance (self in our decorated method)
-      current_self = args[0] if args else None
-
-      # Check if both instances exist and are the same class
-      if (
-        caller_self is not None
-        and current_self is not None
-        and isinstance(caller_self, current_self.__class__)
-        and caller_self is current_self
-      ):
-        return func(*args, **kwargs)
+    caller_frame = _caller_frame()
+    if caller_frame is None:
+      return func(*args, **kwargs)
+
+    # the instance calling the method (self in the caller's context) must be the decorated method's instance
+    caller_self = caller_frame.f_locals.get("self", None)
+    current_self = args[0] if args else None
+    if caller_self is not None and caller_self is current_self:
+      return func(*args, **kwargs)
 
     raise RuntimeError(
       f"Method {func.__name__} can only be called internally by other methods of {args[0].__class__.__name__}"
@@ -1,6 +1,8 @@
 import asyncio
 from asyncio import Task
+from typing import Optional
 
+from primeGraph.graph.context import ExecutionContext
 from primeGraph.graph.executable import Graph
 
 from .service import GraphService
@@ -12,22 +14,23 @@ def wrap_graph_with_websocket(graph: Graph, service: GraphService) -> Graph:
   # Store original methods
   original_save_checkpoint = graph._save_checkpoint
 
-  def sync_broadcast_node_completion() -> Task[None]:
-    if hasattr(graph, "chain_id"):
+  def sync_broadcast_node_completion(chain_id: str) -> Task[None]:
+    if chain_id:
       loop = asyncio.get_event_loop()
-      task = loop.create_task(service.broadcast_status_update(graph.chain_id))
+      task = loop.create_task(service.broadcast_status_update(chain_id))
       return task  # Optionally store or handle the task reference
     else:
-      raise ValueError("Graph instance does not have a chain_id attribute")
+      raise ValueError("Execution context does not have a chain_id")
 
   async def async_broadcast_node_completion() -> None:
     if hasattr(graph, "chain_id"):
       await service.broadcast_status_update(graph.chain_id)
 
   # Override checkpoint method to include broadcasting
-  def new_save_checkpoint(node_name: str) -> None:
-    original_save_checkpoint(node_name)
-    sync_broadcast_node_completion()
+  def new_save_checkpoint(node_name: str, ctx: Optional[ExecutionContext] = None) -> None:
+    ctx = ctx or graph.context
+    original_save_checkpoint(node_name, ctx)
+    sync_broadcast_node_completion(ctx.chain_id)
 
   # Replace the method
   graph._save_checkpoint = new_save_checkpoint  # type: ignore
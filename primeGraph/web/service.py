@@ -1,16 +1,21 @@
 import logging
 from datetime import datetime
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 
 from primeGraph.checkpoint.base import StorageBackend
+from primeGraph.graph.context import ExecutionContext
 from primeGraph.graph.executable import Graph
+from primeGraph.types import ChainStatus
 
 from .models import ExecutionRequest, ExecutionResponse, GraphStatus
 
 logger = logging.getLogger(__name__)
 
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 # TODO: Add support for sharing graph metadata
 class GraphService:
@@ -24,6 +29,8 @@ class GraphService:
     self.graph = graph
     self.checkpoint_storage = checkpoint_storage
     self.active_websockets: Dict[str, Set[WebSocket]] = {}
+    # One execution context per chain, so concurrent requests never share execution state
+    self.contexts: Dict[str, ExecutionContext] = {}
 
     self._setup_routes()
     self._setup_websocket()
@@ -32,18 +39,26 @@ class GraphService:
   def _setup_routes(self) -> None:
     @self.router.post("/start")
     async def start_execution(request: ExecutionRequest) -> ExecutionResponse:
+      ctx: Optional[ExecutionContext] = None
       try:
-        chain_id = await self.graph.start_async(chain_id=request.chain_id, timeout=request.timeout)
-        return self._create_response(chain_id)
+        ctx = self.graph.new_context(chain_id=request.chain_id)
+        self.contexts[ctx.chain_id] = ctx
+        await self.graph.start_async(chain_id=ctx.chain_id, timeout=request.timeout, context=ctx)
+        return self._create_response(ctx)
       except Exception as e:
+        if ctx is not None:
+          self.contexts.pop(ctx.chain_id, None)
         logger.error(f"Error starting execution: {e!s}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
     @self.router.post("/resume")
     async def resume_execution(request: ExecutionRequest) -> ExecutionResponse:
       try:
-        await self.graph.resume_async(start_from=request.start_from)
-        return self._create_response(self.graph.chain_id)
+        if not request.chain_id:
+          raise ValueError("chain_id is required to resume an execution")
+        ctx = self.contexts.get(request.chain_id) or self._load_context(request.chain_id)
+        await self.graph.resume_async(start_from=request.start_from, context=ctx)
+        return self._create_response(ctx)
       except Exception as e:
         logger.error(f"Error resuming execution: {e!s}")
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -74,6 +89,11 @@ class GraphService:
         logger.error(f"Error getting status: {e!s}")
         raise HTTPException(status_code=404, detail=str(e)) from e
 
+    @self.router.get("/metrics", response_class=PlainTextResponse)
+    async def get_metrics() -> PlainTextResponse:
+      """Node, chain and checkpoint metrics of the graph's registry in the Prometheus text format."""
+      return PlainTextResponse(self.graph.metrics.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
   def _setup_websocket(self) -> None:
     @self.router.websocket("/ws/{chain_id}")
     async def websocket_endpoint(websocket: WebSocket, chain_id: str) -> None:
@@ -96,25 +116,43 @@ class GraphService:
         if not self.active_websockets[chain_id]:
           del self.active_websockets[chain_id]
 
-  def _create_response(self, chain_id: str) -> ExecutionResponse:
-    return ExecutionResponse(
-      chain_id=chain_id,
-      status=self.graph.chain_status,
-      next_execution_node=self.graph.next_execution_node,
-      executed_nodes=self.graph.executed_nodes,
+  def _load_context(self, chain_id: str) -> ExecutionContext:
+    """Rebuild the execution context of a chain from its last checkpoint."""
+    ctx = self.graph.load_from_checkpoint(chain_id, context=self.graph.new_context(chain_id=chain_id))
+    self.contexts[chain_id] = ctx
+    return ctx
+
+  def _get_context(self, chain_id: str) -> Optional[ExecutionContext]:
+    if chain_id in self.contexts:
+      return self.contexts[chain_id]
+    if self.graph.chain_id == chain_id:
+      return self.graph.context
+    return None
+
+  def _create_response(self, ctx: ExecutionContext) -> ExecutionResponse:
+    response = ExecutionResponse(
+      chain_id=ctx.chain_id,
+      status=ctx.chain_status,
+      next_execution_node=ctx.next_execution_node,
+      executed_nodes=ctx.executed_nodes,
       timestamp=datetime.now(),
     )
+    # only paused chains can be resumed, finished ones no longer need their context
+    if ctx.chain_status != ChainStatus.PAUSE:
+      self.contexts.pop(ctx.chain_id, None)
+    return response
 
   async def broadcast_status_update(self, chain_id: str) -> None:
     """Broadcast status updates to all connected WebSocket clients"""
-    if chain_id in self.active_websockets:
+    ctx = self._get_context(chain_id)
+    if ctx and chain_id in self.active_websockets:
       # Convert all data to JSON-serializable format
       status_data = {
         "type": "status",
         "chain_id": chain_id,
-        "status": self.graph.chain_status.value,  # Convert enum to string
-        "current_node": self.graph.next_execution_node,
-        "executed_nodes": list(self.graph.executed_nodes) if self.graph.executed_nodes else [],  # Convert set to list
+        "status": ctx.chain_status.value,  # Convert enum to string
+        "current_node": ctx.next_execution_node,
+        "executed_nodes": list(ctx.executed_nodes) if ctx.executed_nodes else [],  # Convert set to list
         "last_update": datetime.now().isoformat(),  # Convert datetime to string
       }
 
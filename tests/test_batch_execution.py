@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+
+
+class BatchState(GraphState):
+  value: LastValue[int]
+  steps: History[str]
+
+
+class PeakTracker:
+  def __init__(self):
+    self.current = 0
+    self.peak = 0
+    self._lock = threading.Lock()
+
+  def enter(self):
+    with self._lock:
+      self.current += 1
+      self.peak = max(self.peak, self.current)
+
+  def exit(self):
+    with self._lock:
+      self.current -= 1
+
+
+def build_graph(tracker: PeakTracker, use_async: bool = False) -> Graph:
+  graph = Graph(state=BatchState(value=0, steps=[]))
+
+  if use_async:
+
+    @graph.node()
+    async def double(state):
+      tracker.enter()
+      await asyncio.sleep(0.02)
+      tracker.exit()
+      if state.value < 0:
+        raise RuntimeError("negative value")
+      return {"value": state.value * 2, "steps": "double"}
+  else:
+
+    @graph.node()
+    def double(state):
+      tracker.enter()
+      time.sleep(0.02)
+      tracker.exit()
+      if state.value < 0:
+        raise RuntimeError("negative value")
+      return {"value": state.value * 2, "steps": "double"}
+
+  @graph.node()
+  def increment(state):
+    return {"value": state.value + 1, "steps": "increment"}
+
+  graph.add_edge(START, "double")
+  graph.add_edge("double", "increment")
+  graph.add_edge("increment", END)
+  return graph.compile()
+
+
+def test_start_many_runs_every_chain_with_bounded_concurrency():
+  tracker = PeakTracker()
+  graph = build_graph(tracker)
+
+  results = list(graph.start_many((BatchState(value=i, steps=[]) for i in range(12)), max_concurrency=3))
+
+  assert sorted(result.position for result in results) == list(range(12))
+  assert all(result.error is None for result in results)
+  assert {result.position: result.state.value for result in results} == {i: i * 2 + 1 for i in range(12)}
+  assert len({result.chain_id for result in results}) == 12  # noqa: PLR2004
+  assert tracker.peak == 3  # noqa: PLR2004
+  # the graph's default context is untouched
+  assert graph.state.value == 0
+
+
+def test_start_many_reports_failures_without_aborting_the_batch():
+  graph = build_graph(PeakTracker())
+  states = [BatchState(value=v, steps=[]) for v in (1, -1, 2)]
+
+  results = {result.position: result for result in graph.start_many(states, return_exceptions=True)}
+
+  assert isinstance(results[1].error, RuntimeError)
+  assert results[0].state.value == 3  # noqa: PLR2004
+  assert results[2].state.value == 5  # noqa: PLR2004
+
+  with pytest.raises(RuntimeError, match="negative value"):
+    list(graph.start_many(states))
+
+
+@pytest.mark.asyncio
+async def test_astart_many_streams_results_as_chains_complete():
+  tracker = PeakTracker()
+  graph = build_graph(tracker, use_async=True)
+  states = [BatchState(value=v, steps=[]) for v in range(10)] + [BatchState(value=-1, steps=[])]
+
+  results = [result async for result in graph.astart_many(states, max_concurrency=4, return_exceptions=True)]
+
+  assert len(results) == 11  # noqa: PLR2004
+  failed = [result for result in results if result.error is not None]
+  assert [result.position for result in failed] == [10]
+  assert {result.position: result.state.value for result in results if result.error is None} == {
+    i: i * 2 + 1 for i in range(10)
+  }
+  assert tracker.peak == 4  # noqa: PLR2004
@@ -0,0 +1,33 @@
+import json
+
+from primeGraph.bench import QUICK_SIZES, find_regressions, main, run_benchmark
+
+
+def test_benchmarks_count_the_nodes_each_scenario_runs():
+  loop = run_benchmark("router_loop", "sync", "noop", size=3, runs=2)
+  # setup, then increment and check 3 times (the last check routing out), then finish
+  assert loop["nodes_per_run"] == 8  # noqa: PLR2004
+  assert loop["nodes_per_sec"] > 0
+  assert loop["p99_ms"] >= loop["p50_ms"] > 0
+
+  subgraphs = run_benchmark("subgraphs", "async", "sleep", size=2, runs=1, checkpoints=True)
+  assert subgraphs["nodes_per_run"] == 4  # noqa: PLR2004
+  assert subgraphs["checkpoint_save_p50_us"] > 0
+
+
+def test_main_writes_a_report_and_gates_on_a_baseline(tmp_path, capsys):
+  output = tmp_path / "report.json"
+  argv = ["--quick", "--runs", "1", "--scenario", "parallel", "--workload", "noop", "-o", str(output)]
+  assert main(argv) == 0
+  report = json.loads(output.read_text())
+  assert [(r["engine"], r["size"]) for r in report["results"]] == [
+    ("sync", QUICK_SIZES["parallel"]),
+    ("async", QUICK_SIZES["parallel"]),
+  ]
+  assert json.loads(capsys.readouterr().out) == report
+
+  faster = json.loads(output.read_text())
+  for result in faster["results"]:
+    result["nodes_per_sec"] *= 10
+  assert len(find_regressions(report, faster, tolerance=0.25)) == 2  # noqa: PLR2004
+  assert find_regressions(report, report, tolerance=0.25) == []
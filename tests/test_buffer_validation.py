@@ -0,0 +1,87 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from primeGraph.buffer.factory import BufferFactory, History, LastValue
+from primeGraph.buffer.history import HistoryBuffer
+from primeGraph.buffer.last_value import LastValueBuffer
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+
+
+class RowsState(GraphState):
+  rows: LastValue[List[int]]
+  log: History[str]
+
+
+def rows_with_bad_item(index: int, size: int = 50_000) -> List[Any]:
+  rows: List[Any] = list(range(size))
+  rows[index] = "bad"
+  return rows
+
+
+def test_validation_modes_check_lists_to_their_depth():
+  for mode in ("full", "sampled", "shallow", "off"):
+    buffer = LastValueBuffer("rows", List[int], mode)
+    buffer.update(list(range(50_000)), "exec")
+
+  full = LastValueBuffer("rows", List[int], "full")
+  with pytest.raises(TypeError, match="Value must be <class 'int'>"):
+    full.update(rows_with_bad_item(25_001), "exec")
+
+  sampled = LastValueBuffer("rows", List[int], "sampled")
+  sampled.update(rows_with_bad_item(25_001), "exec")  # between two sampled items
+  with pytest.raises(TypeError, match="Value must be <class 'int'>"):
+    sampled.update(rows_with_bad_item(-1), "exec")  # the last item is always checked
+
+  sampled_dict = LastValueBuffer("scores", Dict[str, int], "sampled")
+  scores: Dict[str, Any] = {str(i): i for i in range(50_000)}
+  scores["49999"] = "bad"
+  with pytest.raises(TypeError, match="Value must be <class 'int'>"):
+    sampled_dict.update(scores, "exec")  # dicts have their last item checked too
+
+  shallow = LastValueBuffer("rows", List[int], "shallow")
+  shallow.update(rows_with_bad_item(0), "exec")
+  with pytest.raises(TypeError, match="Value must be list"):
+    shallow.update((1, 2), "exec")
+
+  LastValueBuffer("rows", List[int], "off").update("not a list", "exec")
+
+
+def test_invalid_updates_leave_the_buffer_unchanged():
+  history = HistoryBuffer("log", Dict[str, int])
+  history.update({"a": 1}, "exec-1")
+  with pytest.raises(TypeError, match="Dict key must be <class 'str'>"):
+    history.update({1: 1}, "exec-2")
+  with pytest.raises(TypeError, match="Value must be dict"):
+    history.extend([{"b": 2}, "c"], "exec-3")
+  history.extend([{"b": 2}, None], "exec-4")  # None items are accepted, as before
+  assert history.value == [{"a": 1}, {"b": 2}, None]
+
+  # unparameterized buffers accept anything
+  BufferFactory.create_buffer("anything", LastValue).update(object(), "exec")
+
+
+def test_graph_passes_its_validation_mode_to_the_buffers():
+  graph = Graph(state=RowsState(rows=[], log=[]), buffer_validation="off")
+
+  @graph.node()
+  def load(state):
+    return {"rows": ["not", "ints"]}
+
+  @graph.node()
+  def report(state):
+    return {"log": "done"}
+
+  graph.add_edge(START, "load")
+  graph.add_edge("load", "report")
+  graph.add_edge("report", END)
+  graph.compile()
+  graph.start()
+
+  assert all(buffer.validation == "off" for buffer in graph.context.buffers.values())
+  assert graph.state.rows == ["not", "ints"]
+
+  with pytest.raises(ValueError, match="Unknown buffer validation mode"):
+    Graph(state=RowsState(rows=[], log=[]), buffer_validation="partial")  # type: ignore[arg-type]
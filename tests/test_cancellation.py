@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History
+from primeGraph.constants import END, START
+from primeGraph.graph.cancellation import CancellationToken, ChainCancelledError
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+
+
+class BranchState(GraphState):
+  steps: History[str]
+
+
+class Sibling:
+  """Records when a long-running sibling branch noticed it had to stop."""
+
+  def __init__(self):
+    self.stopped_at = None
+    self.stopped = threading.Event()
+
+  def stop(self):
+    self.stopped_at = time.monotonic()
+    self.stopped.set()
+
+
+def build_graph(sibling: Sibling, use_async: bool = False) -> Graph:
+  graph = Graph(state=BranchState(steps=[]))
+
+  @graph.node()
+  def fan_out(state):
+    return {"steps": "fan_out"}
+
+  @graph.node()
+  def fail(state):
+    time.sleep(0.05)
+    raise RuntimeError("boom")
+
+  if use_async:
+
+    @graph.node()
+    async def slow(state):
+      try:
+        await asyncio.sleep(5)
+      finally:
+        sibling.stop()
+      return {"steps": "slow"}
+  else:
+
+    @graph.node()
+    def slow(state, context):
+      context.cancellation.wait(5)
+      sibling.stop()
+      context.cancellation.raise_if_cancelled()
+      return {"steps": "slow"}
+
+  @graph.node()
+  def fan_in(state):
+    return {"steps": "fan_in"}
+
+  graph.add_edge(START, "fan_out")
+  graph.add_edge("fan_out", "fail")
+  graph.add_edge("fan_out", "slow")
+  graph.add_edge("fail", "fan_in")
+  graph.add_edge("slow", "fan_in")
+  graph.add_edge("fan_in", END)
+  return graph.compile()
+
+
+def test_failing_branch_cancels_running_siblings():
+  sibling = Sibling()
+  graph = build_graph(sibling)
+
+  started = time.monotonic()
+  with pytest.raises(RuntimeError, match="boom"):
+    graph.start()
+
+  assert sibling.stopped.wait(1)
+  assert sibling.stopped_at - started < 1
+  assert "fan_in" not in graph.state.steps
+
+
+@pytest.mark.asyncio
+async def test_failing_branch_cancels_sibling_tasks_async():
+  sibling = Sibling()
+  graph = build_graph(sibling, use_async=True)
+
+  started = time.monotonic()
+  with pytest.raises(RuntimeError, match="boom"):
+    await graph.start_async()
+
+  # the sibling task was cancelled (and awaited) before the error surfaced
+  assert sibling.stopped.is_set()
+  assert sibling.stopped_at - started < 1
+  assert "slow" not in graph.state.steps
+
+
+@pytest.mark.asyncio
+async def test_failing_branch_cancels_sync_siblings_in_async_engine():
+  sibling = Sibling()
+  graph = build_graph(sibling)
+
+  with pytest.raises(RuntimeError, match="boom"):
+    await graph.start_async()
+
+  assert sibling.stopped.wait(1)
+
+
+def test_timed_out_node_sees_the_chain_cancelled():
+  stopped = threading.Event()
+  graph = Graph(state=BranchState(steps=[]))
+
+  @graph.node()
+  def prepare(state):
+    return {"steps": "prepare"}
+
+  @graph.node()
+  def hang(state, context):
+    if context.cancellation.wait(5):
+      stopped.set()
+    return {"steps": "hang"}
+
+  graph.add_edge(START, "prepare")
+  graph.add_edge("prepare", "hang")
+  graph.add_edge("hang", END)
+  graph.compile()
+
+  with pytest.raises(TimeoutError):
+    graph.start(timeout=0.2)
+  assert stopped.wait(1)
+
+
+def test_chain_can_be_cancelled_from_another_thread():
+  graph = Graph(state=BranchState(steps=[]))
+  running = threading.Event()
+
+  @graph.node()
+  def poll(state, context):
+    running.set()
+    context.cancellation.wait(5)
+    return {"steps": "poll"}
+
+  @graph.node()
+  def after(state):
+    return {"steps": "after"}
+
+  graph.add_edge(START, "poll")
+  graph.add_edge("poll", "after")
+  graph.add_edge("after", END)
+  graph.compile()
+
+  ctx = graph.new_context()
+  errors = []
+
+  def run():
+    try:
+      graph.start(context=ctx)
+    except ChainCancelledError as e:
+      errors.append(e)
+
+  thread = threading.Thread(target=run)
+  thread.start()
+  assert running.wait(1)
+  ctx.cancellation.cancel("user abort")
+  thread.join(1)
+
+  assert len(errors) == 1
+  assert "user abort" in str(errors[0])
+  assert "after" not in ctx.state.steps
+
+
+def test_cancelling_a_token_cancels_its_children():
+  chain = CancellationToken()
+  group = chain.child()
+  nested = group.child()
+
+  group.cancel("branch failed")
+  assert nested.cancelled
+  assert not chain.cancelled
+
+  chain.cancel()
+  assert chain.child().cancelled
+  with pytest.raises(ChainCancelledError):
+    chain.child().raise_if_cancelled()
+
+
+@pytest.mark.asyncio
+async def test_wait_async_wakes_up_on_cancellation_from_another_thread():
+  token = CancellationToken()
+  assert not await token.wait_async(0.01)
+
+  threading.Timer(0.05, token.cancel).start()
+  start = time.perf_counter()
+  assert await token.wait_async(5)
+  assert time.perf_counter() - start < 1
+  assert await token.wait_async(5)  # already cancelled: returns at once
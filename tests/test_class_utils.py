@@ -0,0 +1,40 @@
+import pytest
+
+from primeGraph.utils.class_utils import internal_only
+
+
+class Counter:
+  def __init__(self):
+    self.count = 0
+
+  @internal_only
+  def _increment(self, amount: int = 1) -> int:
+    self.count += amount
+    return self.count
+
+  def increment(self) -> int:
+    return self._increment(2)
+
+  def increment_from_closure(self) -> int:
+    def run() -> int:
+      return self._increment()
+
+    return run()
+
+  def increment_other(self, other: "Counter") -> int:
+    return other._increment()
+
+
+def test_internal_methods_run_when_called_by_the_same_instance():
+  counter = Counter()
+  assert counter.increment() == 2  # noqa: PLR2004
+  assert counter.increment_from_closure() == 3  # noqa: PLR2004
+
+
+def test_internal_methods_reject_outside_callers():
+  counter = Counter()
+  with pytest.raises(RuntimeError, match="_increment can only be called internally by other methods of Counter"):
+    counter._increment()
+  with pytest.raises(RuntimeError, match="can only be called internally"):
+    Counter().increment_other(counter)
+  assert counter.count == 0
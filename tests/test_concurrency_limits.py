@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+
+
+class FanOutState(GraphState):
+  calls: History[str]
+
+
+class PeakTracker:
+  def __init__(self):
+    self.current = 0
+    self.peak = 0
+    self._lock = threading.Lock()
+
+  def enter(self):
+    with self._lock:
+      self.current += 1
+      self.peak = max(self.peak, self.current)
+
+  def exit(self):
+    with self._lock:
+      self.current -= 1
+
+
+def build_fan_out(
+  tracker: PeakTracker,
+  use_async: bool = False,
+  node_limit=None,
+  group_limit=None,
+  execution_mode: str = "plan",
+) -> Graph:
+  graph = Graph(state=FanOutState(calls=[]), execution_mode=execution_mode)
+
+  @graph.node()
+  def fan_out(state):
+    return {}
+
+  @graph.node()
+  def fan_in(state):
+    return {}
+
+  if use_async:
+
+    @graph.node(max_concurrency=node_limit)
+    async def call_api(state):
+      tracker.enter()
+      await asyncio.sleep(0.02)
+      tracker.exit()
+      return {"calls": "call_api"}
+  else:
+
+    @graph.node(max_concurrency=node_limit)
+    def call_api(state):
+      tracker.enter()
+      time.sleep(0.02)
+      tracker.exit()
+      return {"calls": "call_api"}
+
+  graph.add_edge(START, "fan_out")
+  graph.add_repeating_edge("fan_out", "call_api", "fan_in", repeat=12, parallel=True, max_concurrency=group_limit)
+  graph.add_edge("fan_in", END)
+  return graph.compile()
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_group_limit_caps_parallel_repetitions(execution_mode):
+  tracker = PeakTracker()
+  graph = build_fan_out(tracker, group_limit=3, execution_mode=execution_mode)
+  graph.start()
+
+  assert len(graph.state.calls) == 12  # noqa: PLR2004
+  assert tracker.peak == 3  # noqa: PLR2004
+
+
+def test_node_limit_applies_to_repeated_copies():
+  tracker = PeakTracker()
+  graph = build_fan_out(tracker, node_limit=2)
+  graph.start()
+
+  assert len(graph.state.calls) == 12  # noqa: PLR2004
+  assert tracker.peak == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+async def test_limits_queue_coroutines_in_async_engine(execution_mode):
+  tracker = PeakTracker()
+  graph = build_fan_out(tracker, use_async=True, node_limit=4, group_limit=2, execution_mode=execution_mode)
+  await graph.start_async()
+
+  assert len(graph.state.calls) == 12  # noqa: PLR2004
+  assert tracker.peak == 2  # the tighter of the two caps wins  # noqa: PLR2004
+
+
+def test_limits_are_validated():
+  graph = Graph()
+
+  with pytest.raises(ValueError, match="max_concurrency"):
+
+    @graph.node(max_concurrency=0)
+    def invalid(state):
+      pass
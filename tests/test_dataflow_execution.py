@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.checkpoint.local_storage import LocalStorage
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+
+
+class DataflowState(GraphState):
+  execution_order: History[str]
+  route: LastValue[str]
+
+
+def build_uneven_graph(execution_mode: str, use_async: bool = False) -> Graph:
+  """slow_branch runs 0.3s while fast_branch -> after_fast run 0.3s in total; both join in `join`."""
+  graph = Graph(state=DataflowState(execution_order=[], route=""), execution_mode=execution_mode)
+
+  def make_node(name: str, duration: float) -> None:
+    if use_async:
+
+      async def action(state):
+        await asyncio.sleep(duration)
+        return {"execution_order": name}
+    else:
+
+      def action(state):
+        time.sleep(duration)
+        return {"execution_order": name}
+
+    graph.node(name=name)(action)
+
+  make_node("slow_branch", 0.3)
+  make_node("fast_branch", 0.05)
+  make_node("after_fast", 0.25)
+  make_node("join", 0)
+
+  graph.add_edge(START, "slow_branch")
+  graph.add_edge(START, "fast_branch")
+  graph.add_edge("fast_branch", "after_fast")
+  graph.add_edge("slow_branch", "join")
+  graph.add_edge("after_fast", "join")
+  graph.add_edge("join", END)
+  return graph.compile()
+
+
+def test_dataflow_dispatches_nodes_as_soon_as_predecessors_finish():
+  graph = build_uneven_graph("dataflow")
+
+  started = time.time()
+  graph.start()
+  elapsed = time.time() - started
+
+  order = graph.state.execution_order
+  assert set(order) == {"slow_branch", "fast_branch", "after_fast", "join"}
+  assert order.index("fast_branch") < order.index("after_fast")
+  assert order[-1] == "join"
+  # after_fast overlaps slow_branch instead of waiting for the whole level
+  assert elapsed < 0.5  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_dataflow_dispatches_nodes_as_soon_as_predecessors_finish_async():
+  graph = build_uneven_graph("dataflow", use_async=True)
+
+  started = time.time()
+  await graph.start_async()
+  elapsed = time.time() - started
+
+  order = graph.state.execution_order
+  assert order.index("fast_branch") < order.index("after_fast")
+  assert order[-1] == "join"
+  assert elapsed < 0.5  # noqa: PLR2004
+
+
+def test_dataflow_skips_branches_not_taken_by_router():
+  graph = Graph(state=DataflowState(execution_order=[], route=""), execution_mode="dataflow")
+
+  @graph.node()
+  def choose(state):
+    return "path_b"
+    return "path_a"
+
+  @graph.node()
+  def path_a(state):
+    return {"execution_order": "path_a"}
+
+  @graph.node()
+  def path_a_followup(state):
+    return {"execution_order": "path_a_followup"}
+
+  @graph.node()
+  def path_b(state):
+    return {"execution_order": "path_b", "route": "b"}
+
+  @graph.node()
+  def join(state):
+    return {"execution_order": "join"}
+
+  graph.add_router_edge(START, "choose")
+  graph.add_edge("path_a", "path_a_followup")
+  graph.add_edge("path_a_followup", "join")
+  graph.add_edge("path_b", "join")
+  graph.add_edge("join", END)
+  graph.compile()
+
+  graph.start()
+  assert graph.state.execution_order == ["path_b", "join"]
+  assert graph.state.route == "b"
+
+
+def test_dataflow_rejects_cycles_and_interrupts():
+  graph = Graph(execution_mode="dataflow")
+
+  @graph.node()
+  def step():
+    pass
+
+  @graph.node()
+  def loop():
+    return "step"
+    return "done"
+
+  @graph.node()
+  def done():
+    pass
+
+  graph.add_edge(START, "step")
+  graph.add_router_edge("step", "loop")
+  graph.add_edge("done", END)
+  with pytest.raises(ValueError, match="acyclic"):
+    graph.compile()
+
+  graph = Graph(execution_mode="dataflow")
+
+  @graph.node()
+  def first():
+    pass
+
+  @graph.node(interrupt="before")
+  def paused():
+    pass
+
+  graph.add_edge(START, "first")
+  graph.add_edge("first", "paused")
+  graph.add_edge("paused", END)
+  with pytest.raises(ValueError, match="interrupts"):
+    graph.compile()
+
+
+def test_plan_mode_is_the_default():
+  assert Graph().execution_mode == "plan"
+
+  graph = build_uneven_graph("plan")
+  graph.start()
+  assert graph.state.execution_order[-1] == "join"
+
+
+def test_dataflow_resume_with_every_node_already_executed():
+  graph = Graph(
+    state=DataflowState(execution_order=[], route=""), checkpoint_storage=LocalStorage(), execution_mode="dataflow"
+  )
+
+  @graph.node()
+  def a(state):
+    return {"execution_order": "a"}
+
+  @graph.node()
+  def b(state):
+    return {"execution_order": "b"}
+
+  graph.add_edge(START, "a")
+  graph.add_edge("a", "b")
+  graph.add_edge("b", END)
+  graph.compile()
+
+  chain_id = graph.start()
+  graph.load_from_checkpoint(chain_id)
+  graph.resume(start_from="b")
+  assert graph.state.execution_order == ["a", "b"]
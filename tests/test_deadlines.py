@@ -0,0 +1,237 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History
+from primeGraph.constants import END, START
+from primeGraph.graph.cancellation import ChainCancelledError, DeadlineExceededError
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.rate_limit import register_rate_limiter
+from primeGraph.models.state import GraphState
+from primeGraph.types import ChainStatus
+
+
+class StepState(GraphState):
+  steps: History[str]
+
+
+def build_graph(calls: list, delay: float = 0.3, execution_mode: str = "plan", use_async: bool = False) -> Graph:
+  graph = Graph(state=StepState(steps=[]), execution_mode=execution_mode)
+
+  def make_step(name: str):
+    if use_async:
+
+      async def step(state, context):
+        calls.append((name, context.remaining))
+        await asyncio.sleep(delay)
+        return {"steps": name}
+    else:
+
+      def step(state, context):
+        calls.append((name, context.remaining))
+        time.sleep(delay)  # ignores cancellation, like a blocking HTTP call
+        return {"steps": name}
+
+    graph.node(name=name)(step)
+
+  for name in ("fetch", "enrich", "store"):
+    make_step(name)
+  graph.add_edge(START, "fetch")
+  graph.add_edge("fetch", "enrich")
+  graph.add_edge("enrich", "store")
+  graph.add_edge("store", END)
+  return graph.compile()
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_chain_fails_when_its_budget_runs_out(execution_mode):
+  calls = []
+  graph = build_graph(calls, execution_mode=execution_mode)
+
+  start = time.perf_counter()
+  with pytest.raises(DeadlineExceededError, match="enrich"):
+    graph.start(deadline=0.45)
+
+  assert time.perf_counter() - start < 0.6  # noqa: PLR2004
+  assert graph.context.chain_status == ChainStatus.FAILED
+  assert graph.state.steps == ["fetch"]
+  # nodes see the budget shrink
+  assert [name for name, _ in calls] == ["fetch", "enrich"]
+  assert 0.4 < calls[0][1] <= 0.45  # noqa: PLR2004
+  assert 0.1 < calls[1][1] < 0.2  # noqa: PLR2004
+
+
+def test_chain_pauses_at_its_deadline_and_resumes():
+  calls = []
+  graph = build_graph(calls)
+
+  graph.start(deadline=0.45, on_deadline="pause")
+  assert graph.context.chain_status == ChainStatus.PAUSE
+  assert graph.context.next_execution_node == "enrich"
+  assert graph.state.steps == ["fetch"]
+
+  graph.resume(deadline=5)
+  assert graph.state.steps == ["fetch", "enrich", "store"]
+  assert [name for name, _ in calls] == ["fetch", "enrich", "enrich", "store"]
+
+
+def test_cooperative_nodes_are_woken_by_the_deadline():
+  graph = Graph(state=StepState(steps=[]))
+  reasons = []
+
+  @graph.node()
+  def poll(state, context):
+    if context.cancellation.wait(5):
+      reasons.append(context.cancellation.reason)
+      context.cancellation.raise_if_cancelled()
+    return {"steps": "poll"}
+
+  @graph.node()
+  def store(state):
+    return {"steps": "store"}
+
+  graph.add_edge(START, "poll")
+  graph.add_edge("poll", "store")
+  graph.add_edge("store", END)
+  graph.compile()
+
+  start = time.perf_counter()
+  with pytest.raises(DeadlineExceededError):
+    graph.start(deadline=0.1)
+  assert time.perf_counter() - start < 1
+  time.sleep(0.05)  # the node wakes up concurrently with the chain giving up on it
+  assert reasons == ["deadline exceeded"]
+
+
+@pytest.mark.asyncio
+async def test_async_chain_fails_when_its_budget_runs_out():
+  calls = []
+  graph = build_graph(calls, use_async=True)
+
+  with pytest.raises(DeadlineExceededError, match="enrich"):
+    await graph.start_async(deadline=0.45)
+  assert graph.state.steps == ["fetch"]
+  assert graph.context.chain_status == ChainStatus.FAILED
+
+  # without a deadline nodes see no budget
+  await graph.start_async()
+  assert calls[-1] == ("store", None)
+
+
+def test_pausing_at_the_deadline_requires_plan_mode():
+  graph = build_graph([], execution_mode="dataflow")
+  with pytest.raises(ValueError, match="execution_mode='plan'"):
+    graph.start(deadline=1, on_deadline="pause")
+
+
+def build_capped_graph(use_async: bool = False) -> Graph:
+  graph = Graph(state=StepState(steps=[]))
+
+  if use_async:
+
+    async def load(state):
+      await asyncio.sleep(1)
+      return {"steps": "load"}
+  else:
+
+    def load(state):
+      time.sleep(1)
+      return {"steps": "load"}
+
+  graph.node(max_concurrency=1)(load)
+
+  @graph.node()
+  def report(state):
+    return {"steps": "report"}
+
+  graph.add_edge(START, "load")
+  graph.add_edge("load", "report")
+  graph.add_edge("report", END)
+  return graph.compile()
+
+
+def test_waiting_for_a_concurrency_slot_is_bounded_by_the_budget():
+  graph = build_capped_graph()
+  holder = threading.Thread(target=graph.start, kwargs={"context": graph.new_context()})
+  holder.start()
+  time.sleep(0.1)  # the other chain holds load's only slot
+
+  start = time.perf_counter()
+  with pytest.raises(DeadlineExceededError, match="concurrency slot of node load"):
+    graph.start(deadline=0.3, context=graph.new_context())
+  assert time.perf_counter() - start < 0.6  # noqa: PLR2004
+  holder.join()
+
+
+@pytest.mark.asyncio
+async def test_async_waiting_for_a_concurrency_slot_is_bounded_by_the_budget():
+  graph = build_capped_graph(use_async=True)
+  holder = asyncio.ensure_future(graph.start_async(context=graph.new_context()))
+  await asyncio.sleep(0.1)
+
+  start = time.perf_counter()
+  with pytest.raises(DeadlineExceededError, match="load"):
+    await graph.start_async(deadline=0.3, context=graph.new_context())
+  assert time.perf_counter() - start < 0.6  # noqa: PLR2004
+  await holder
+
+
+def build_throttled_graph(execution_mode: str, use_async: bool = False) -> Graph:
+  limiter = f"deadline-api-{execution_mode}-{use_async}"
+  register_rate_limiter(limiter, rate=0.5, capacity=1).reserve()  # the next call waits 2s
+  graph = Graph(state=StepState(steps=[]), execution_mode=execution_mode)
+
+  if use_async:
+
+    async def fetch(state):
+      return {"steps": "fetch"}
+  else:
+
+    def fetch(state):
+      return {"steps": "fetch"}
+
+  graph.node(rate_limit=limiter)(fetch)
+
+  @graph.node()
+  def store(state):
+    return {"steps": "store"}
+
+  graph.add_edge(START, "fetch")
+  graph.add_edge("fetch", "store")
+  graph.add_edge("store", END)
+  return graph.compile()
+
+
+def test_rate_limited_dataflow_nodes_fail_at_the_deadline():
+  graph = build_throttled_graph("dataflow")
+
+  start = time.perf_counter()
+  with pytest.raises(DeadlineExceededError, match="Deadline exceeded in node fetch"):
+    graph.start(deadline=0.2)
+  assert 0.15 < time.perf_counter() - start < 0.6  # noqa: PLR2004
+  assert graph.state.steps == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+async def test_async_rate_limit_waits_are_bounded_by_the_budget(execution_mode):
+  graph = build_throttled_graph(execution_mode, use_async=True)
+
+  start = time.perf_counter()
+  with pytest.raises(DeadlineExceededError, match="fetch"):
+    await graph.start_async(deadline=0.2)
+  assert 0.15 < time.perf_counter() - start < 0.6  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_async_rate_limit_waits_end_on_cancellation():
+  graph = build_throttled_graph("plan", use_async=True)
+  ctx = graph.new_context()
+  threading.Timer(0.1, lambda: ctx.cancellation.cancel("user abort")).start()
+
+  start = time.perf_counter()
+  with pytest.raises(ChainCancelledError, match="user abort"):
+    await graph.start_async(context=ctx)
+  assert time.perf_counter() - start < 0.5  # noqa: PLR2004
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+from primeGraph.types import ChainStatus
+
+
+class CounterState(GraphState):
+  label: LastValue[str]
+  execution_order: History[str]
+
+
+def build_graph(interrupt: bool = False) -> Graph:
+  graph = Graph(state=CounterState(label="", execution_order=[]))
+
+  @graph.node()
+  def first(state):
+    time.sleep(0.05)
+    return {"execution_order": f"{state.label}:first"}
+
+  @graph.node(interrupt="before" if interrupt else None)
+  def second(state):
+    time.sleep(0.05)
+    return {"execution_order": f"{state.label}:second"}
+
+  graph.add_edge(START, "first")
+  graph.add_edge("first", "second")
+  graph.add_edge("second", END)
+  return graph.compile()
+
+
+def test_contexts_run_concurrently_in_threads():
+  graph = build_graph()
+  contexts = [graph.new_context(state=CounterState(label=f"run{i}", execution_order=[])) for i in range(4)]
+
+  threads = [threading.Thread(target=graph.start, kwargs={"context": ctx}) for ctx in contexts]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  for i, ctx in enumerate(contexts):
+    assert ctx.state.execution_order == [f"run{i}:first", f"run{i}:second"]
+  assert len({ctx.chain_id for ctx in contexts}) == 4
+
+  # the default context is untouched
+  assert graph.state.execution_order == []
+  assert graph.chain_status == ChainStatus.IDLE
+
+
+def test_contexts_run_concurrently_with_asyncio():
+  graph = build_graph()
+  contexts = [graph.new_context(state=CounterState(label=f"run{i}", execution_order=[])) for i in range(4)]
+
+  async def run_all():
+    started = time.time()
+    await asyncio.gather(*(graph.start_async(context=ctx) for ctx in contexts))
+    return time.time() - started
+
+  elapsed = asyncio.run(run_all())
+
+  for i, ctx in enumerate(contexts):
+    assert ctx.state.execution_order == [f"run{i}:first", f"run{i}:second"]
+  assert elapsed < 0.4  # the four chains overlap instead of running one after the other
+
+
+def test_contexts_pause_and_resume_independently():
+  graph = build_graph(interrupt=True)
+  ctx_a = graph.new_context(state=CounterState(label="a", execution_order=[]))
+  ctx_b = graph.new_context(state=CounterState(label="b", execution_order=[]))
+
+  graph.start(context=ctx_a)
+  graph.start(context=ctx_b)
+  assert ctx_a.chain_status == ChainStatus.PAUSE
+  assert ctx_a.next_execution_node == "second"
+
+  graph.resume(context=ctx_b)
+  assert ctx_b.state.execution_order == ["b:first", "b:second"]
+  assert ctx_a.state.execution_order == ["a:first"]
+  assert ctx_a.chain_status == ChainStatus.PAUSE
+
+  graph.resume(context=ctx_a)
+  assert ctx_a.state.execution_order == ["a:first", "a:second"]
+
+
+def test_new_context_copies_initial_state():
+  graph = build_graph()
+  ctx = graph.new_context()
+
+  assert ctx.state is not graph.state
+  assert ctx.state == graph.state
+  assert ctx.detailed_execution_path is graph.detailed_execution_path
+
+
+def test_new_contexts_start_from_the_initial_state_after_default_runs():
+  graph = build_graph()
+  graph.start()
+  assert graph.state.execution_order == [":first", ":second"]
+
+  assert graph.new_context().state.execution_order == []
+  results = list(graph.start_many([None, None]))
+  assert [result.state.execution_order for result in results] == [[":first", ":second"]] * 2
@@ -6,7 +6,7 @@ from pydantic import ValidationError
 
 from primeGraph.buffer.factory import History, Incremental, LastValue
 from primeGraph.constants import END, START
-from primeGraph.graph.executable import ExecutableNode, Graph
+from primeGraph.graph.executable import ExecutableNode, Graph, NodeTask
 from primeGraph.models.state import GraphState
 
 
@@ -169,6 +169,45 @@ def test_execution_plan_conversion(basic_graph):
     assert len(result[1].task_list) == 3
 
 
+def test_execution_plan_carries_node_identities(basic_graph):
+    plan = basic_graph._convert_execution_plan()
+
+    def leaves(node):
+        for task in node.task_list:
+            if isinstance(task, ExecutableNode):
+                yield from leaves(task)
+            else:
+                yield task
+
+    for node in plan:
+        for task in leaves(node):
+            assert isinstance(task, NodeTask)
+            assert basic_graph.node_table[task.node_id].name == task.node_name
+            assert basic_graph.node_index[task.node_name] == task.node_id
+
+
+def test_nodes_sharing_an_action_execute_under_their_own_names():
+    state = StateForTestWithHistory(execution_order=[])
+    graph = Graph(state=state)
+    calls = []
+
+    def shared_action(state):
+        calls.append("shared")
+        return {"execution_order": f"call_{len(calls)}"}
+
+    graph.node(name="first")(shared_action)
+    graph.node(name="second")(shared_action)
+
+    graph.add_edge(START, "first")
+    graph.add_edge("first", "second")
+    graph.add_edge("second", END)
+    graph.compile()
+    graph.start()
+
+    assert len(calls) == 2
+    assert graph.executed_nodes == {"first", "second"}
+
+
 def test_execution_plan_invalid_input(basic_graph):
     # Test invalid input
     basic_graph.detailed_execution_path = [None]
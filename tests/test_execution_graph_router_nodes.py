@@ -1,3 +1,4 @@
+import sys
 import time
 
 import pytest
@@ -273,3 +274,123 @@ def test_cyclical_router():
         "route_b",
         "route_b",
     ]
+
+
+def build_router_graph():
+    state = RouterState(result={}, execution_order=[])
+    graph = Graph(state=state)
+
+    @graph.node()
+    def process_data(state):
+        if state.result.get("path") == "A":
+            return "route_b"
+        return "route_a"
+
+    @graph.node()
+    def route_a(state):
+        return {"result": {"path": "A"}, "execution_order": "route_a"}
+
+    @graph.node()
+    def route_b(state):
+        return {"result": {"path": "B"}, "execution_order": "route_b"}
+
+    graph.add_router_edge(START, "process_data")
+    graph.add_edge("route_a", END)
+    graph.add_edge("route_b", END)
+    return graph.compile()
+
+
+def test_plan_is_compiled_once_and_reused_across_runs(monkeypatch):
+    graph = build_router_graph()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("path analysis should not run after compile")
+
+    monkeypatch.setattr(graph, "_find_execution_paths", fail)
+    monkeypatch.setattr(graph, "_analyze_router_paths", fail)
+
+    graph.start()
+    first_run_plan = graph.execution_plan
+    assert graph.state.execution_order == ["route_a"]
+
+    # second run takes the other route, third run the first one again
+    graph.start()
+    graph.start()
+    assert graph.state.execution_order == ["route_a"]
+    assert graph.execution_plan is first_run_plan
+
+
+def test_graphs_with_same_topology_share_path_analysis(monkeypatch):
+    first = build_router_graph()
+
+    calls = []
+    original = Graph._find_execution_paths
+
+    def counting(self):
+        calls.append(self)
+        return original(self)
+
+    monkeypatch.setattr(Graph, "_find_execution_paths", counting)
+    second = build_router_graph()
+
+    assert calls == []
+    assert second.topology_fingerprint == first.topology_fingerprint
+    assert second.detailed_execution_path == first.detailed_execution_path
+    assert second.detailed_execution_path is not first.detailed_execution_path
+
+
+class LoopState(GraphState):
+    iterations: LastValue[int]
+
+
+ROUTER_LOOP_ITERATIONS = 300  # deep enough to exceed the recursion limit with recursive dispatch
+
+
+def build_router_loop_graph():
+    graph = Graph(state=LoopState(iterations=0))
+
+    @graph.node()
+    def setup(state):
+        return {}
+
+    @graph.node()
+    def increment(state):
+        return {"iterations": state.iterations + 1}
+
+    @graph.node()
+    def check(state):
+        if state.iterations < ROUTER_LOOP_ITERATIONS:
+            return "increment"
+        return "finish"
+
+    @graph.node()
+    def finish(state):
+        return {}
+
+    graph.add_edge(START, "setup")
+    graph.add_edge("setup", "increment")
+    graph.add_router_edge("increment", "check")
+    graph.add_edge("finish", END)
+    return graph.compile()
+
+
+def test_router_loop_runs_in_constant_stack_depth():
+    graph = build_router_loop_graph()
+    depths = []
+
+    original = graph._route_to
+
+    def recording_route_to(*args, **kwargs):
+        frame, depth = sys._getframe(), 0
+        while frame:
+            frame, depth = frame.f_back, depth + 1
+        depths.append(depth)
+        return original(*args, **kwargs)
+
+    graph._route_to = recording_route_to
+    graph.start()
+
+    assert graph.state.iterations == ROUTER_LOOP_ITERATIONS
+    assert len(depths) == ROUTER_LOOP_ITERATIONS
+    assert max(depths) == min(depths)
+    assert graph.last_executed_node == "finish"
@@ -275,3 +275,44 @@ async def test_cyclical_router():
         "route_b",
         "route_b",
     ]
+
+
+class LoopState(GraphState):
+    iterations: LastValue[int]
+
+
+ROUTER_LOOP_ITERATIONS = 300  # deep enough to exceed the recursion limit with recursive dispatch
+
+
+@pytest.mark.asyncio
+async def test_router_loop_runs_in_constant_stack_depth_async():
+    graph = Graph(state=LoopState(iterations=0))
+
+    @graph.node()
+    async def setup(state):
+        return {}
+
+    @graph.node()
+    async def increment(state):
+        return {"iterations": state.iterations + 1}
+
+    @graph.node()
+    async def check(state):
+        if state.iterations < ROUTER_LOOP_ITERATIONS:
+            return "increment"
+        return "finish"
+
+    @graph.node()
+    async def finish(state):
+        return {}
+
+    graph.add_edge(START, "setup")
+    graph.add_edge("setup", "increment")
+    graph.add_router_edge("increment", "check")
+    graph.add_edge("finish", END)
+    graph.compile()
+
+    await graph.start_async()
+
+    assert graph.state.iterations == ROUTER_LOOP_ITERATIONS
+    assert graph.last_executed_node == "finish"
@@ -0,0 +1,173 @@
+import pickle
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.cache import CachePolicy
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.state_view import StateView
+from primeGraph.graph.worker_pool import WorkerPool
+from primeGraph.models.state import GraphState
+
+
+class TicketState(GraphState):
+  query: LastValue[str]
+  label: LastValue[str]
+  summary: LastValue[str]
+  notes: History[str]
+
+
+def new_state(query: str = "refund", label: str = "") -> TicketState:
+  return TicketState(query=query, label=label, summary="", notes=[])
+
+
+def count_words(state):
+  return {"summary": str(len(state.query.split()))}
+
+
+def test_nodes_get_a_read_only_view_of_their_reads():
+  graph = Graph(state=new_state("refund my order"))
+  seen = {}
+
+  @graph.node(reads=["query"], writes=["label"])
+  def classify(state):
+    seen["view"] = state
+    seen["query"] = state.query
+    with pytest.raises(AttributeError, match="declared reads"):
+      state.summary  # noqa: B018
+    with pytest.raises(AttributeError, match="read-only"):
+      state.query = "changed"
+    return {"label": "billing"}
+
+  @graph.node()
+  def respond(state):
+    return {"notes": state.label}
+
+  graph.add_edge(START, "classify")
+  graph.add_edge("classify", "respond")
+  graph.add_edge("respond", END)
+  graph.compile()
+  graph.start()
+
+  assert isinstance(seen["view"], StateView)
+  assert seen["query"] == "refund my order"
+  assert graph.state.notes == ["billing"]
+
+
+def test_undeclared_writes_are_rejected():
+  graph = Graph(state=new_state())
+
+  @graph.node(writes=["label"])
+  def classify(state):
+    return {"label": "billing", "summary": "sneaky"}
+
+  @graph.node()
+  def respond(state):
+    return {}
+
+  graph.add_edge(START, "classify")
+  graph.add_edge("classify", "respond")
+  graph.add_edge("respond", END)
+  graph.compile()
+
+  with pytest.raises(RuntimeError, match="undeclared write"):
+    graph.start()
+  assert graph.state.summary == ""
+
+
+def build_fan_out(first_writes, second_writes, execution_mode: str = "plan") -> Graph:
+  graph = Graph(state=new_state(), execution_mode=execution_mode)
+
+  @graph.node()
+  def fan_out(state):
+    return {}
+
+  @graph.node(writes=first_writes)
+  def first(state):
+    return {}
+
+  @graph.node(writes=second_writes)
+  def second(state):
+    return {}
+
+  @graph.node()
+  def fan_in(state):
+    return {}
+
+  graph.add_edge(START, "fan_out")
+  graph.add_edge("fan_out", "first")
+  graph.add_edge("fan_out", "second")
+  graph.add_edge("first", "fan_in")
+  graph.add_edge("second", "fan_in")
+  graph.add_edge("fan_in", END)
+  return graph
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_parallel_last_value_writes_are_rejected_at_compile(execution_mode):
+  with pytest.raises(ValueError, match=r"'first' and 'second'.*label"):
+    build_fan_out(["label"], ["label", "notes"], execution_mode).compile()
+
+  # History fields merge concurrent writes, and disjoint writes cannot conflict
+  build_fan_out(["notes"], ["notes"], execution_mode).compile()
+  build_fan_out(["label"], ["summary"], execution_mode).compile()
+
+
+def test_declared_fields_must_exist():
+  graph = build_fan_out(["label"], ["missing"])
+  with pytest.raises(ValueError, match="unknown state fields: missing"):
+    graph.compile()
+
+
+def test_views_pickle_only_the_declared_fields():
+  state = TicketState(query="refund my order", label="", summary="x" * 10_000, notes=[])
+  view = StateView(state, frozenset({"query"}))
+
+  payload = pickle.dumps(view)
+  restored = pickle.loads(payload)
+
+  assert restored.query == "refund my order"
+  assert len(payload) < len(pickle.dumps(state))
+  with pytest.raises(AttributeError):
+    restored.summary  # noqa: B018
+
+  pool = WorkerPool(max_processes=1)
+  graph = Graph(state=new_state("refund my order"), worker_pool=pool)
+  graph.node(executor="process", reads=["query"], writes=["summary"])(count_words)
+
+  @graph.node()
+  def respond(state):
+    return {}
+
+  graph.add_edge(START, "count_words")
+  graph.add_edge("count_words", "respond")
+  graph.add_edge("respond", END)
+  graph.compile()
+  with pool:
+    graph.start()
+  assert graph.state.summary == "3"
+
+
+def test_cache_keys_default_to_declared_reads():
+  graph = Graph(state=new_state())
+  calls = []
+
+  @graph.node(reads=["query"], writes=["summary"], cache=CachePolicy())
+  def summarize(state):
+    calls.append(state.query)
+    return {"summary": state.query.upper()}
+
+  @graph.node()
+  def respond(state):
+    return {}
+
+  graph.add_edge(START, "summarize")
+  graph.add_edge("summarize", "respond")
+  graph.add_edge("respond", END)
+  graph.compile()
+
+  for label in ("a", "b"):
+    graph.start(context=graph.new_context(state=new_state("refund", label=label)))
+
+  assert calls == ["refund"]
@@ -0,0 +1,57 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from primeGraph.buffer.factory import History
+from primeGraph.checkpoint.local_storage import LocalStorage
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+from primeGraph.web.service import GraphService
+
+
+class StepState(GraphState):
+  steps: History[str]
+
+
+def build_service(fail: bool = False, interrupt: bool = False) -> GraphService:
+  storage = LocalStorage()
+  graph = Graph(state=StepState(steps=[]), checkpoint_storage=storage)
+
+  @graph.node()
+  def load(state):
+    return {"steps": "load"}
+
+  @graph.node(interrupt="before" if interrupt else None)
+  async def save(state):
+    if fail:
+      raise ValueError("save failed")
+    return {"steps": "save"}
+
+  graph.add_edge(START, "load")
+  graph.add_edge("load", "save")
+  graph.add_edge("save", END)
+  graph.compile()
+  return GraphService(graph, storage)
+
+
+def test_start_runs_each_chain_from_the_initial_state():
+  service = build_service(interrupt=True)
+  service.graph.start()  # runs on the graph's default context
+  app = FastAPI()
+  app.include_router(service.router)
+  client = TestClient(app)
+
+  chain_ids = [client.post("/graph/start", json={}).json()["chain_id"] for _ in range(2)]
+  assert [service.contexts[chain_id].state.steps for chain_id in chain_ids] == [["load"]] * 2
+
+
+def test_failed_starts_do_not_keep_their_context():
+  service = build_service(fail=True)
+  app = FastAPI()
+  app.include_router(service.router)
+  client = TestClient(app)
+
+  response = client.post("/graph/start", json={"chain_id": "failing"})
+  assert response.status_code == 500  # noqa: PLR2004
+  assert "save failed" in response.json()["detail"]
+  assert service.contexts == {}
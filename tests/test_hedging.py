@@ -0,0 +1,130 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.hedging import HedgePolicy, NodeHedger
+from primeGraph.models.state import GraphState
+
+
+class LookupState(GraphState):
+  answer: LastValue[str]
+  attempts: History[str]
+
+
+def build_graph(policy: HedgePolicy, events: list, use_async: bool = False, execution_mode: str = "plan") -> Graph:
+  graph = Graph(state=LookupState(answer="", attempts=[]), execution_mode=execution_mode)
+  calls = itertools.count()
+
+  # the first call hangs on a flaky upstream until cancelled, later calls answer quickly
+  if use_async:
+
+    @graph.node(hedge=policy)
+    async def lookup(state, context):
+      attempt = next(calls)
+      if attempt == 0:
+        try:
+          await asyncio.sleep(2)
+        except asyncio.CancelledError:
+          events.append("cancelled")
+          raise
+      return {"answer": f"attempt {attempt}", "attempts": str(attempt)}
+  else:
+
+    @graph.node(hedge=policy)
+    def lookup(state, context):
+      attempt = next(calls)
+      if attempt == 0 and context.cancellation.wait(2):
+        events.append(context.cancellation.reason)
+      return {"answer": f"attempt {attempt}", "attempts": str(attempt)}
+
+  @graph.node()
+  def respond(state):
+    return {"attempts": "respond"}
+
+  graph.add_edge(START, "lookup")
+  graph.add_edge("lookup", "respond")
+  graph.add_edge("respond", END)
+  return graph.compile()
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_hedge_wins_and_only_its_result_is_applied(execution_mode):
+  events = []
+  graph = build_graph(HedgePolicy(delay=0.05), events, execution_mode=execution_mode)
+
+  start = time.perf_counter()
+  graph.start()
+
+  assert time.perf_counter() - start < 1
+  assert graph.state.answer == "attempt 1"
+  assert graph.state.attempts == ["1", "respond"]
+  time.sleep(0.05)
+  assert events == ["hedged node 'lookup' finished"]
+  stats = graph.hedge_stats()["lookup"]
+  assert stats == (1, 1, 1)
+  assert (stats.hedge_rate, stats.win_rate) == (1.0, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_async_engine_hedges():
+  events = []
+  graph = build_graph(HedgePolicy(delay=0.05), events, use_async=True)
+
+  start = time.perf_counter()
+  await graph.start_async()
+
+  assert time.perf_counter() - start < 1
+  assert graph.state.attempts == ["1", "respond"]
+  assert events == ["cancelled"]
+  assert graph.hedge_stats()["lookup"] == (1, 1, 1)
+
+
+def test_fast_calls_are_not_hedged():
+  graph = Graph(state=LookupState(answer="", attempts=[]))
+
+  @graph.node(hedge=HedgePolicy(delay=1))
+  def lookup(state):
+    return {"attempts": "lookup"}
+
+  @graph.node()
+  def respond(state):
+    return {"attempts": "respond"}
+
+  graph.add_edge(START, "lookup")
+  graph.add_edge("lookup", "respond")
+  graph.add_edge("respond", END)
+  graph.compile()
+  graph.start()
+
+  assert graph.state.attempts == ["lookup", "respond"]
+  stats = graph.hedge_stats()["lookup"]
+  assert stats == (1, 0, 0)
+  assert stats.win_rate == 0.0
+
+
+def test_percentile_delay_uses_observed_latencies():
+  hedger = NodeHedger(HedgePolicy(delay=0.5, percentile=50, min_samples=3, window=4))
+  assert hedger.delay() == 0.5  # noqa: PLR2004
+
+  for latency in (0.1, 0.4, 0.2, 0.3, 0.9):
+    hedger.record(latency, hedged=False, hedge_won=False)
+
+  # only the last 4 latencies are kept
+  assert hedger.delay() == 0.3  # noqa: PLR2004
+  assert NodeHedger(HedgePolicy(percentile=90)).delay() is None
+
+
+def test_invalid_hedge_policies_are_rejected():
+  with pytest.raises(ValueError, match="delay or a percentile"):
+    NodeHedger(HedgePolicy())
+  with pytest.raises(ValueError, match="between 0 and 100"):
+    NodeHedger(HedgePolicy(percentile=100))
+
+  graph = Graph(state=LookupState(answer="", attempts=[]))
+  with pytest.raises(ValueError, match="cannot be hedged"):
+    graph.node(executor="process", hedge=HedgePolicy(delay=1))(time.sleep)
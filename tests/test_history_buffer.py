@@ -0,0 +1,135 @@
+import copy
+import json
+import pickle
+from typing import List
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.buffer.history import HistoryBuffer
+from primeGraph.buffer.history_types import HistoryList, HistoryView
+from primeGraph.checkpoint.local_storage import LocalStorage
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+
+
+class LogState(GraphState):
+  log: History[str]
+  snapshot: LastValue[List[str]]
+
+
+def test_appends_share_one_list_and_keep_snapshots():
+  buffer = HistoryBuffer("log", str)
+  buffer.update("a", "exec-1")
+  consumed = buffer.consume_last_value()
+  buffer.extend(["b", "c"], "exec-2")
+
+  assert buffer.value_history["exec-1"]._items is buffer.value._items  # no copy of the history on append
+  assert buffer.value_history == {"exec-1": ["a"], "exec-2": ["a", "b", "c"]}
+  assert consumed == ["a"]  # the state's list only changes when the buffer is consumed
+
+  latest = buffer.consume_last_value()
+  assert isinstance(latest, HistoryList)
+  assert (latest, consumed) == (["a", "b", "c"], ["a"])  # lists handed out before never change
+
+
+def test_edited_lists_and_views_are_copied():
+  buffer = HistoryBuffer("log", str)
+  buffer.extend(["a", "b"], "exec-1")
+  consumed = buffer.consume_last_value()
+  consumed.append("local")  # e.g. a paused chain's state edited by hand
+  buffer.update("c", "exec-2")
+
+  fresh = buffer.consume_last_value()
+  assert fresh is not consumed
+  assert (fresh, consumed) == (["a", "b", "c"], ["a", "b", "local"])
+
+  view = buffer.get()
+  view.append("local")
+  assert buffer.get() == ["a", "b", "c"]
+
+  # going back to an older snapshot forks the history instead of overwriting newer views
+  newest = buffer.get()
+  buffer.set_value(buffer.value_history["exec-1"])
+  buffer.update("d", "exec-3")
+  assert buffer.get() == ["a", "b", "d"]
+  assert newest == ["a", "b", "c"]
+
+  restored = pickle.loads(pickle.dumps(newest))
+  assert isinstance(restored, HistoryView)
+  assert restored == newest == copy.deepcopy(newest)
+  assert type(copy.deepcopy(fresh)) is list
+
+
+def test_lists_read_from_the_state_keep_their_items():
+  graph = Graph(state=LogState(log=[], snapshot=[]))
+  seen = []
+
+  @graph.node()
+  def first(state):
+    return {"log": "first"}
+
+  @graph.node()
+  def second(state):
+    seen.append(state.log)
+    return {"log": "second"}
+
+  @graph.node(interrupt="before")
+  def third(state):
+    return {"log": "third"}
+
+  graph.add_edge(START, "first")
+  graph.add_edge("first", "second")
+  graph.add_edge("second", "third")
+  graph.add_edge("third", END)
+  graph.compile()
+  graph.start()
+  paused = graph.state.log
+  graph.resume()
+
+  assert seen == [["first"]]
+  assert paused == ["first", "second"]
+  assert graph.state.log == ["first", "second", "third"]
+
+
+def test_state_histories_are_lists():
+  storage = LocalStorage()
+  graph = Graph(state=LogState(log=[], snapshot=[]), checkpoint_storage=storage)
+
+  @graph.node()
+  def first(state):
+    return {"log": "first"}
+
+  @graph.node()
+  def second(state):
+    return {"log": "second", "snapshot": state.log}
+
+  @graph.node()
+  def third(state):
+    return {"log": "third"}
+
+  graph.add_edge(START, "first")
+  graph.add_edge("first", "second")
+  graph.add_edge("second", "third")
+  graph.add_edge("third", END)
+  graph.compile()
+  chain_id = graph.start()
+
+  assert isinstance(graph.state.log, list)
+  assert json.dumps(graph.state.log) == '["first", "second", "third"]'
+  assert graph.state.snapshot == ["first"]  # a copy, not the growing history
+  assert LogState.model_validate_json(graph.state.model_dump_json()).log == ["first", "second", "third"]
+
+  graph.load_from_checkpoint(chain_id)
+  assert graph.state.log == ["first", "second", "third"]
+
+
+def test_list_fields_accept_history_snapshots():
+  history = HistoryBuffer("log", str)
+  history.extend(["a", "b"], "exec-1")
+  state = LogState(log=history.get(), snapshot=history.get())
+  assert state.model_dump()["snapshot"] == ["a", "b"]
+
+  with pytest.raises(TypeError, match="Value must be <class 'str'>"):
+    LogState(log=[], snapshot=HistoryView([1]))
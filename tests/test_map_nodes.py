@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.mapping import MapSpec
+from primeGraph.models.state import GraphState
+
+
+class DocumentState(GraphState):
+  documents: LastValue[list]
+  summaries: History[str]
+  title: LastValue[str]
+
+
+def new_state(count: int) -> DocumentState:
+  return DocumentState(documents=[f"doc {i}" for i in range(count)], summaries=["intro"], title="")
+
+
+class Peak:
+  def __init__(self):
+    self.running = 0
+    self.peak = 0
+    self._lock = threading.Lock()
+
+  def __enter__(self):
+    with self._lock:
+      self.running += 1
+      self.peak = max(self.peak, self.running)
+
+  def __exit__(self, *_):
+    with self._lock:
+      self.running -= 1
+
+
+def build_graph(spec: MapSpec, summarize, execution_mode: str = "plan") -> Graph:
+  graph = Graph(state=new_state(0), execution_mode=execution_mode)
+  graph.node(name="summarize", map=spec)(summarize)
+
+  @graph.node()
+  def finish(state):
+    return {"title": f"{len(state.summaries)} entries"}
+
+  graph.add_edge(START, "summarize")
+  graph.add_edge("summarize", "finish")
+  graph.add_edge("finish", END)
+  return graph.compile()
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_results_are_collected_in_item_order(execution_mode):
+  peak = Peak()
+
+  def summarize(state, item):
+    with peak:
+      time.sleep(0.01 if item.endswith("0") else 0.001)
+      return item.upper()
+
+  spec = MapSpec(over="documents", into="summaries", max_concurrency=2, chunk_size=3)
+  graph = build_graph(spec, summarize, execution_mode)
+  ctx = graph.new_context(state=new_state(10))
+  graph.start(context=ctx)
+
+  assert ctx.state.summaries == ["intro"] + [f"DOC {i}" for i in range(10)]
+  assert ctx.state.title == "11 entries"
+  assert 1 < peak.peak <= 2  # noqa: PLR2004
+  # the fan-out is not materialized as graph nodes
+  assert set(graph.nodes) == {START, END, "summarize", "finish"}
+
+
+@pytest.mark.asyncio
+async def test_async_engine_maps_sync_and_async_functions():
+  async def summarize(state, item):
+    await asyncio.sleep(0.01 if item == "doc 0" else 0)
+    return item.upper()
+
+  graph = build_graph(MapSpec(over="documents", into="summaries", max_concurrency=3), summarize)
+  ctx = graph.new_context(state=new_state(5))
+  await graph.start_async(context=ctx)
+  assert ctx.state.summaries == ["intro", "DOC 0", "DOC 1", "DOC 2", "DOC 3", "DOC 4"]
+
+  def shout(state, item):
+    return item.upper()
+
+  graph = build_graph(MapSpec(over="documents", into="summaries", chunk_size=2), shout)
+  ctx = graph.new_context(state=new_state(3))
+  await graph.start_async(context=ctx)
+  assert ctx.state.summaries == ["intro", "DOC 0", "DOC 1", "DOC 2"]
+
+
+def test_empty_lists_map_to_nothing():
+  graph = build_graph(MapSpec(over="documents", into="summaries"), lambda state, item: item)
+  ctx = graph.new_context(state=new_state(0))
+  graph.start(context=ctx)
+  assert ctx.state.summaries == ["intro"]
+  assert ctx.state.title == "1 entries"
+
+
+def test_failing_item_stops_the_remaining_chunks():
+  seen = []
+
+  def summarize(state, item):
+    seen.append(item)
+    if item == "doc 2":
+      raise ValueError("bad document")
+    return item
+
+  graph = build_graph(MapSpec(over="documents", into="summaries", max_concurrency=1), summarize)
+  ctx = graph.new_context(state=new_state(50))
+  with pytest.raises(RuntimeError, match="bad document"):
+    graph.start(context=ctx)
+
+  assert seen == ["doc 0", "doc 1", "doc 2"]
+  assert ctx.state.summaries == ["intro"]
+
+
+def test_map_nodes_are_validated():
+  with pytest.raises(ValueError, match="History field"):
+    build_graph(MapSpec(over="documents", into="title"), lambda state, item: item)
+  with pytest.raises(ValueError, match="unknown state field 'pages'"):
+    build_graph(MapSpec(over="pages", into="summaries"), lambda state, item: item)
+
+  graph = Graph(state=new_state(0))
+  with pytest.raises(ValueError, match="'item' parameter"):
+    graph.node(map=MapSpec(over="documents", into="summaries"))(lambda state: None)
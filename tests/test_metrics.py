@@ -0,0 +1,175 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from primeGraph.buffer.factory import History
+from primeGraph.checkpoint.local_storage import LocalStorage
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.metrics import MetricsRegistry
+from primeGraph.models.state import GraphState
+from primeGraph.web.service import GraphService
+
+
+class StepState(GraphState):
+  steps: History[str]
+
+
+def build_graph(registry: MetricsRegistry, use_async: bool = False, fail: bool = False) -> Graph:
+  graph = Graph(state=StepState(steps=[]), checkpoint_storage=LocalStorage(), metrics=registry)
+
+  def add_node(name: str) -> None:
+    if use_async:
+
+      async def action(state):
+        return {"steps": name}
+    else:
+
+      def action(state):
+        if fail and name == "merge":
+          raise ValueError("merge failed")
+        return {"steps": name}
+
+    graph.node(name=name)(action)
+
+  for name in ("load", "left", "right", "merge"):
+    add_node(name)
+  graph.add_edge(START, "load")
+  graph.add_edge("load", "left")
+  graph.add_edge("load", "right")
+  graph.add_edge("left", "merge")
+  graph.add_edge("right", "merge")
+  graph.add_edge("merge", END)
+  return graph.compile()
+
+
+def test_registry_metrics_and_prometheus_text():
+  registry = MetricsRegistry()
+  requests = registry.counter("requests_total", "Requests served", ("route",))
+  in_flight = registry.gauge("in_flight", "Requests in flight")
+  latency = registry.histogram("latency_seconds", "Request latency", buckets=(0.1, 1))
+
+  started = threading.Barrier(4)  # keeps the threads (and their cells) apart
+
+  def serve() -> None:
+    started.wait()
+    for i in range(500):
+      requests.labels("/start").inc()
+      in_flight.inc()
+      latency.observe((i % 100) / 50)
+      in_flight.dec()
+
+  threads = [threading.Thread(target=serve) for _ in range(4)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  assert requests.labels("/start").value == 2000  # noqa: PLR2004
+  assert in_flight.value == 0
+  assert latency.count == 2000  # noqa: PLR2004
+  percentiles = latency.percentiles()
+  assert percentiles[0.5] == pytest.approx(0.98)
+  assert percentiles[0.99] == pytest.approx(1.96)
+
+  text = registry.render_prometheus()
+  assert "# TYPE requests_total counter" in text
+  assert 'requests_total{route="/start"} 2000' in text
+  assert 'latency_seconds_bucket{le="0.1"} 120' in text
+  assert 'latency_seconds_bucket{le="+Inf"} 2000' in text
+  assert "latency_seconds_count 2000" in text
+  assert 'latency_seconds_quantile{quantile="0.95"} 1.88' in text
+
+  # names are registered once, with one type and one set of labels
+  assert registry.counter("requests_total", "Requests served", ("route",)) is requests
+  with pytest.raises(ValueError, match="already registered"):
+    registry.gauge("requests_total", "Requests served")
+  with pytest.raises(ValueError, match="expects labels"):
+    requests.labels("/start", "GET")
+
+
+def test_engines_record_node_chain_and_checkpoint_metrics():
+  registry = MetricsRegistry()
+  graph = build_graph(registry)
+  chain_id = graph.start()
+  graph.load_from_checkpoint(chain_id, context=graph.new_context())
+
+  node_duration = registry.histogram("primegraph_node_duration_seconds", "", ("node",))
+  assert {name: child.count for (name,), child in node_duration._children.items()} == {
+    "load": 1,
+    "left": 1,
+    "right": 1,
+    "merge": 1,
+  }
+  chain_duration = registry.histogram("primegraph_chain_duration_seconds", "", ("status",))
+  assert chain_duration.labels("completed").count == 1
+  assert registry.gauge("primegraph_active_chains", "").value == 0
+  assert registry.histogram("primegraph_checkpoint_save_seconds", "", ("backend",)).labels("LocalStorage").count > 0
+  assert registry.histogram("primegraph_checkpoint_load_seconds", "", ("backend",)).labels("LocalStorage").count == 1
+  group_width = registry.histogram("primegraph_parallel_group_width", "", buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+  assert (group_width.count, group_width.sum) == (1, 2)
+  assert registry.gauge("primegraph_worker_queue_depth", "").value == 0
+
+  with pytest.raises(RuntimeError, match="merge failed"):
+    build_graph(registry, fail=True).start()
+  assert chain_duration.labels("failed").count == 1
+  assert registry.gauge("primegraph_active_chains", "").value == 0
+
+
+def test_repeated_nodes_are_measured_under_their_original_name():
+  registry = MetricsRegistry()
+  graph = Graph(state=StepState(steps=[]), metrics=registry)
+
+  @graph.node()
+  def fan_out(state):
+    return {}
+
+  @graph.node()
+  def call_api(state):
+    return {"steps": "call_api"}
+
+  @graph.node()
+  def fan_in(state):
+    return {}
+
+  graph.add_edge(START, "fan_out")
+  graph.add_repeating_edge("fan_out", "call_api", "fan_in", repeat=5, parallel=True)
+  graph.add_edge("fan_in", END)
+  graph.compile()
+  graph.start()
+
+  node_duration = registry.histogram("primegraph_node_duration_seconds", "", ("node",))
+  assert {name: child.count for (name,), child in node_duration._children.items()} == {
+    "fan_out": 1,
+    "call_api": 5,
+    "fan_in": 1,
+  }
+
+
+@pytest.mark.asyncio
+async def test_async_chains_are_measured():
+  registry = MetricsRegistry()
+  graph = build_graph(registry, use_async=True)
+  await graph.start_async()
+  await graph.start_async()
+
+  chain_duration = registry.histogram("primegraph_chain_duration_seconds", "", ("status",))
+  assert chain_duration.labels("completed").count == 2  # noqa: PLR2004
+  node_duration = registry.histogram("primegraph_node_duration_seconds", "", ("node",))
+  assert node_duration.labels("merge").count == 2  # noqa: PLR2004
+
+
+def test_service_exposes_metrics_route():
+  registry = MetricsRegistry()
+  graph = build_graph(registry)
+  graph.start()
+  app = FastAPI()
+  app.include_router(GraphService(graph, LocalStorage()).router)
+
+  response = TestClient(app).get("/graph/metrics")
+  assert response.status_code == 200  # noqa: PLR2004
+  assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+  assert 'primegraph_node_duration_seconds_count{node="merge"} 1' in response.text
+  assert 'primegraph_chain_duration_seconds_quantile{status="completed",quantile="0.99"}' in response.text
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.cache import CachePolicy
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+
+
+class QueryState(GraphState):
+  query: LastValue[str]
+  label: LastValue[str]
+  documents: LastValue[list]
+  labels: History[str]
+
+
+def build_graph(calls: list, policy: CachePolicy, use_async: bool = False, execution_mode: str = "plan") -> Graph:
+  graph = Graph(state=QueryState(query="", label="", documents=[], labels=[]), execution_mode=execution_mode)
+
+  if use_async:
+
+    @graph.node(cache=policy)
+    async def classify(state):
+      calls.append(state.query)
+      return {"label": state.query.upper(), "labels": state.query.upper(), "documents": [state.query]}
+  else:
+
+    @graph.node(cache=policy)
+    def classify(state):
+      calls.append(state.query)
+      return {"label": state.query.upper(), "labels": state.query.upper(), "documents": [state.query]}
+
+  @graph.node()
+  def respond(state):
+    return {"labels": "respond"}
+
+  graph.add_edge(START, "classify")
+  graph.add_edge("classify", "respond")
+  graph.add_edge("respond", END)
+  return graph.compile()
+
+
+def run(graph: Graph, query: str) -> QueryState:
+  ctx = graph.new_context(state=QueryState(query=query, label="", documents=[], labels=[]))
+  graph.start(context=ctx)
+  return ctx.state
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_cached_updates_are_replayed_through_the_buffers(execution_mode):
+  calls = []
+  graph = build_graph(calls, CachePolicy(key_fields=("query",)), execution_mode=execution_mode)
+
+  first = run(graph, "refund")
+  second = run(graph, "refund")
+  run(graph, "upgrade")
+
+  assert calls == ["refund", "upgrade"]
+  assert second.label == "REFUND"
+  # History fields see the cached value appended like a fresh result
+  assert first.labels == second.labels == ["REFUND", "respond"]
+  stats = graph.cache_stats()["classify"]
+  assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_async_engine_uses_the_cache():
+  calls = []
+  graph = build_graph(calls, CachePolicy(key_fields=("query",)), use_async=True)
+
+  for _ in range(3):
+    ctx = graph.new_context(state=QueryState(query="refund", label="", documents=[], labels=[]))
+    await graph.start_async(context=ctx)
+
+  assert calls == ["refund"]
+  assert ctx.state.label == "REFUND"
+  assert graph.cache_stats()["classify"].hits == 2  # noqa: PLR2004
+
+
+def test_lru_and_ttl_eviction():
+  calls = []
+  graph = build_graph(calls, CachePolicy(key_fields=("query",), max_size=1))
+  for query in ("a", "b", "a"):
+    run(graph, query)
+  assert calls == ["a", "b", "a"]
+  assert graph.cache_stats()["classify"].evictions == 2  # noqa: PLR2004
+
+  calls.clear()
+  graph = build_graph(calls, CachePolicy(key_fields=("query",), ttl=0.5))
+  run(graph, "a")
+  run(graph, "a")
+  time.sleep(0.6)
+  run(graph, "a")
+  assert calls == ["a", "a"]
+
+
+def test_cached_values_are_not_shared_between_chains():
+  graph = build_graph([], CachePolicy(key_fields=("query",)))
+
+  first = run(graph, "refund")
+  first.documents.append("mutated")
+
+  assert run(graph, "refund").documents == ["refund"]
+
+
+def test_cache_key_fields_must_be_state_fields():
+  graph = Graph(state=QueryState(query="", label="", documents=[], labels=[]))
+
+  @graph.node(cache=CachePolicy(key_fields=("missing",)))
+  def classify(state):
+    return {}
+
+  @graph.node()
+  def respond(state):
+    return {}
+
+  graph.add_edge(START, "classify")
+  graph.add_edge("classify", "respond")
+  graph.add_edge("respond", END)
+  with pytest.raises(ValueError, match="missing"):
+    graph.compile()
@@ -0,0 +1,138 @@
+import concurrent.futures
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.worker_pool import WorkerPool
+from primeGraph.models.state import GraphState
+
+
+class ProcessState(GraphState):
+  numbers: LastValue[list]
+  total: LastValue[int]
+  worker_pids: History[int]
+
+
+def sum_of_squares(state):
+  return {"total": sum(n * n for n in state.numbers), "worker_pids": os.getpid()}
+
+
+def squares_in_worker(state):
+  return {"worker_pids": os.getpid()}
+
+
+def hang(state):
+  time.sleep(30)
+  return {"worker_pids": os.getpid()}
+
+
+def medium(state):
+  time.sleep(1)
+  return {"worker_pids": os.getpid()}
+
+
+def build_single_node_graph(worker_pool: WorkerPool, action) -> Graph:
+  graph = Graph(state=ProcessState(numbers=[], total=0, worker_pids=[]), worker_pool=worker_pool)
+  graph.node(executor="process")(squares_in_worker)
+  graph.node(executor="process")(action)
+  graph.add_edge(START, "squares_in_worker")
+  graph.add_edge("squares_in_worker", action.__name__)
+  graph.add_edge(action.__name__, END)
+  return graph.compile()
+
+
+def build_graph(worker_pool: WorkerPool, execution_mode: str = "plan") -> Graph:
+  graph = Graph(
+    state=ProcessState(numbers=[1, 2, 3], total=0, worker_pids=[]),
+    worker_pool=worker_pool,
+    execution_mode=execution_mode,
+  )
+  graph.node(executor="process")(sum_of_squares)
+  graph.node(name="first_worker", executor="process")(squares_in_worker)
+  graph.node(name="second_worker", executor="process")(squares_in_worker)
+
+  graph.add_edge(START, "sum_of_squares")
+  graph.add_edge("sum_of_squares", "first_worker")
+  graph.add_edge("sum_of_squares", "second_worker")
+  graph.add_edge("first_worker", END)
+  graph.add_edge("second_worker", END)
+  return graph.compile()
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_process_nodes_run_in_worker_processes(execution_mode):
+  with WorkerPool(max_processes=2) as pool:
+    graph = build_graph(pool, execution_mode)
+    graph.start()
+
+  assert graph.state.total == 14  # noqa: PLR2004
+  assert len(graph.state.worker_pids) == 3  # noqa: PLR2004
+  assert os.getpid() not in graph.state.worker_pids
+
+
+@pytest.mark.asyncio
+async def test_process_nodes_run_in_worker_processes_async():
+  with WorkerPool(max_processes=2) as pool:
+    graph = build_graph(pool)
+    await graph.start_async()
+
+  assert graph.state.total == 14  # noqa: PLR2004
+  assert os.getpid() not in graph.state.worker_pids
+
+
+def test_process_node_is_killed_on_timeout():
+  pool = WorkerPool(max_processes=1)
+  graph = Graph(state=ProcessState(numbers=[], total=0, worker_pids=[]), worker_pool=pool)
+  graph.node(executor="process")(squares_in_worker)
+  graph.node(executor="process")(hang)
+  graph.add_edge(START, "squares_in_worker")
+  graph.add_edge("squares_in_worker", "hang")
+  graph.add_edge("hang", END)
+  graph.compile()
+
+  # warm up the process pool so the timeout only covers the node itself
+  pool.submit_process(os.getpid).result()
+  worker_pids = {process.pid for process in multiprocessing.active_children()}
+
+  started = time.time()
+  with pytest.raises(TimeoutError):
+    graph.start(timeout=0.5)
+  assert time.time() - started < 5  # noqa: PLR2004
+
+  time.sleep(0.2)
+  assert worker_pids.isdisjoint(process.pid for process in multiprocessing.active_children())
+  pool.shutdown()
+
+
+def test_timeouts_only_kill_their_own_worker():
+  pool = WorkerPool(max_processes=2)
+  hanging, healthy = build_single_node_graph(pool, hang), build_single_node_graph(pool, medium)
+
+  with concurrent.futures.ThreadPoolExecutor(max_workers=1) as runner:
+    healthy_run = runner.submit(healthy.start)
+    time.sleep(0.3)  # medium is running on one worker
+    with pytest.raises(TimeoutError):
+      hanging.start(timeout=0.5)
+    healthy_run.result()
+
+  assert len(healthy.state.worker_pids) == 2  # noqa: PLR2004
+  healthy.start()  # the killed worker is replaced
+  pool.shutdown()
+
+
+def test_process_nodes_must_be_module_level_functions():
+  graph = Graph()
+
+  def local_action():
+    pass
+
+  with pytest.raises(ValueError, match="module-level"):
+    graph.node(executor="process")(local_action)
+
+  with pytest.raises(ValueError, match="Unknown node executor"):
+    graph.node(executor="fiber")(sum_of_squares)
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.rate_limit import TokenBucket, rate_limiter_stats, register_rate_limiter
+from primeGraph.models.state import GraphState
+
+CALLS_PER_SECOND = 20
+
+
+class CallState(GraphState):
+  call_times: History[float]
+
+
+def build_graph(limiter_name: str, use_async: bool = False, execution_mode: str = "plan") -> Graph:
+  graph = Graph(state=CallState(call_times=[]), execution_mode=execution_mode)
+
+  @graph.node()
+  def fan_out(state):
+    return {}
+
+  @graph.node()
+  def fan_in(state):
+    return {}
+
+  if use_async:
+
+    @graph.node(rate_limit=limiter_name)
+    async def call_api(state):
+      return {"call_times": time.monotonic()}
+  else:
+
+    @graph.node(rate_limit=limiter_name)
+    def call_api(state):
+      return {"call_times": time.monotonic()}
+
+  graph.add_edge(START, "fan_out")
+  graph.add_repeating_edge("fan_out", "call_api", "fan_in", repeat=5, parallel=True)
+  graph.add_edge("fan_in", END)
+  return graph.compile()
+
+
+def assert_rate_respected(call_times):
+  call_times = sorted(call_times)
+  # one token of burst, then one call every 1 / CALLS_PER_SECOND seconds
+  assert call_times[-1] - call_times[0] >= (len(call_times) - 1) / CALLS_PER_SECOND * 0.9
+
+
+def test_token_bucket_reserves_in_arrival_order():
+  bucket = TokenBucket(rate=10, capacity=1)
+
+  waits = [bucket.reserve() for _ in range(3)]
+  assert waits[0] == 0
+  assert waits[1] == pytest.approx(0.1, abs=0.01)
+  assert waits[2] == pytest.approx(0.2, abs=0.01)
+  assert bucket.stats().throttled == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_rate_limit_is_shared_across_chains(execution_mode):
+  register_rate_limiter(f"shared-api-{execution_mode}", rate=CALLS_PER_SECOND, capacity=1)
+  graphs = [build_graph(f"shared-api-{execution_mode}", execution_mode=execution_mode) for _ in range(2)]
+
+  threads = [threading.Thread(target=graph.start) for graph in graphs]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  call_times = [t for graph in graphs for t in graph.state.call_times]
+  assert len(call_times) == 10  # noqa: PLR2004
+  assert_rate_respected(call_times)
+
+  stats = rate_limiter_stats()[f"shared-api-{execution_mode}"]
+  assert stats.acquired == 10  # noqa: PLR2004
+  assert stats.throttled == 9  # noqa: PLR2004
+  assert stats.throttled_seconds > 0
+
+
+def test_registering_again_retunes_compiled_graphs():
+  bucket = register_rate_limiter("retuned-api", rate=2, capacity=1)
+  graph = build_graph("retuned-api")
+
+  assert register_rate_limiter("retuned-api", rate=100, capacity=5) is bucket
+  start = time.perf_counter()
+  graph.start()
+
+  assert time.perf_counter() - start < 0.5  # at 2 calls per second, 5 calls take 2s  # noqa: PLR2004
+  assert (bucket.rate, bucket.capacity) == (100, 5)
+  with pytest.raises(ValueError, match="positive"):
+    register_rate_limiter("retuned-api", rate=0)
+
+
+def test_dataflow_scheduler_sleeps_while_only_throttled_nodes_are_pending():
+  register_rate_limiter("idle-api", rate=4, capacity=1)
+  graph = build_graph("idle-api", execution_mode="dataflow")
+
+  wall, cpu = time.perf_counter(), time.process_time()
+  graph.start()
+  wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+  assert len(graph.state.call_times) == 5  # noqa: PLR2004
+  assert wall >= 0.9  # noqa: PLR2004
+  assert cpu < wall / 4  # no busy loop between the throttled starts
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+async def test_async_engine_waits_without_blocking_the_loop(execution_mode):
+  register_rate_limiter(f"async-api-{execution_mode}", rate=CALLS_PER_SECOND, capacity=1)
+  graph = build_graph(f"async-api-{execution_mode}", use_async=True, execution_mode=execution_mode)
+  ticks = []
+
+  async def ticker():
+    while True:
+      ticks.append(time.monotonic())
+      await asyncio.sleep(0.01)
+
+  ticker_task = asyncio.create_task(ticker())
+  await graph.start_async()
+  ticker_task.cancel()
+
+  assert_rate_respected(graph.state.call_times)
+  # the loop kept running while calls were throttled
+  assert len(ticks) >= 10  # noqa: PLR2004
+
+
+def test_unknown_rate_limiter_fails_at_compile():
+  graph = Graph()
+
+  @graph.node(rate_limit="not-registered")
+  def call_api():
+    pass
+
+  @graph.node()
+  def done():
+    pass
+
+  graph.add_edge(START, "call_api")
+  graph.add_edge("call_api", "done")
+  graph.add_edge("done", END)
+  with pytest.raises(ValueError, match="not-registered"):
+    graph.compile()
@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+
+
+class TicketState(GraphState):
+  query: LastValue[str]
+  answer: LastValue[str]
+  visited: History[str]
+
+
+def new_state(query: str = "refund") -> TicketState:
+  return TicketState(query=query, answer="", visited=[])
+
+
+def build_graph(started: list, width: int = 2, hints=None, delay: float = 0.3, use_async: bool = False) -> Graph:
+  graph = Graph(state=new_state())
+
+  @graph.node()
+  def intake(state):
+    return {"visited": "intake"}
+
+  if use_async:
+
+    @graph.node()
+    async def triage(state):
+      await asyncio.sleep(delay)
+      if state.query == "refund":
+        return "billing"
+      return "support"
+
+    @graph.node()
+    async def billing(state, context):
+      started.append("billing")
+      await asyncio.sleep(delay)
+      return {"answer": "refund issued", "visited": "billing"}
+
+    @graph.node()
+    async def support(state, context):
+      started.append("support")
+      await asyncio.sleep(delay)
+      return {"answer": "ticket opened", "visited": "support"}
+  else:
+
+    @graph.node()
+    def triage(state):
+      time.sleep(delay)
+      if state.query == "refund":
+        return "billing"
+      return "support"
+
+    @graph.node()
+    def billing(state, context):
+      started.append("billing")
+      context.cancellation.wait(delay)
+      return {"answer": "refund issued", "visited": "billing"}
+
+    @graph.node()
+    def support(state, context):
+      started.append("support")
+      context.cancellation.wait(delay)
+      return {"answer": "ticket opened", "visited": "support"}
+
+  @graph.node()
+  def respond(state):
+    return {"visited": "respond"}
+
+  graph.add_edge(START, "intake")
+  graph.add_router_edge("intake", "triage", speculate=width, route_hints=hints)
+  graph.add_edge("billing", "respond")
+  graph.add_edge("support", "respond")
+  graph.add_edge("respond", END)
+  return graph.compile()
+
+
+def test_chosen_route_is_committed_and_others_are_discarded():
+  started = []
+  graph = build_graph(started)
+
+  ctx = graph.new_context(state=new_state("refund"))
+  start = time.perf_counter()
+  graph.start(context=ctx)
+  elapsed = time.perf_counter() - start
+
+  assert sorted(started) == ["billing", "support"]
+  # the route overlapped the router, and the discarded one never touched the state
+  assert elapsed < 0.55  # noqa: PLR2004
+  assert ctx.state.answer == "refund issued"
+  assert ctx.state.visited == ["intake", "billing", "respond"]
+  assert graph.speculation_stats()["triage"] == ({"billing": 1}, 1, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_async_engine_speculates():
+  started = []
+  graph = build_graph(started, use_async=True)
+
+  ctx = graph.new_context(state=new_state("upgrade"))
+  start = time.perf_counter()
+  await graph.start_async(context=ctx)
+
+  assert time.perf_counter() - start < 0.55  # noqa: PLR2004
+  assert ctx.state.answer == "ticket opened"
+  assert ctx.state.visited == ["intake", "support", "respond"]
+  assert graph.speculation_stats()["triage"].hits == 1
+
+
+def test_observed_route_frequencies_override_hints():
+  started = []
+  graph = build_graph(started, width=1, hints={"support": 1.5}, delay=0.05)
+
+  for _ in range(3):
+    ctx = graph.new_context(state=new_state("refund"))
+    graph.start(context=ctx)
+
+  # support is guessed until billing has been seen more often than its hint; misses run billing afterwards
+  assert started == ["support", "billing", "support", "billing", "billing"]
+  stats = graph.speculation_stats()["triage"]
+  assert (stats.route_counts, stats.hits, stats.misses, stats.wasted) == ({"billing": 3}, 1, 2, 2)
+  assert ctx.state.visited == ["intake", "billing", "respond"]
+
+
+def test_speculation_is_validated():
+  graph = Graph(state=new_state(), execution_mode="dataflow")
+
+  @graph.node()
+  def triage(state):
+    if state.query:
+      return "billing"
+    return "support"
+
+  @graph.node()
+  def billing(state):
+    return {}
+
+  @graph.node()
+  def support(state):
+    return {}
+
+  with pytest.raises(ValueError, match="unknown routes: sales"):
+    graph.add_router_edge(START, "triage", speculate=1, route_hints={"sales": 1.0})
+  graph.add_router_edge(START, "triage", speculate=1)
+  graph.add_edge("billing", END)
+  graph.add_edge("support", END)
+  with pytest.raises(ValueError, match="execution_mode='plan'"):
+    graph.compile()
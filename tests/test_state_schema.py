@@ -0,0 +1,78 @@
+from typing import Dict, List, Literal, Optional
+
+import pytest
+
+import primeGraph.models.state as state_module
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.models.state import GraphState
+
+
+class OrderState(GraphState):
+  order_id: LastValue[str]
+  items: History[Dict[str, int]]
+
+
+def test_version_fingerprints_field_names_and_types():
+  class SameOrderState(GraphState):
+    order_id: LastValue[str]
+    items: History[Dict[str, int]]
+
+  class RetypedOrderState(GraphState):
+    order_id: LastValue[int]
+    items: History[Dict[str, int]]
+
+  state = OrderState(order_id="a", items=[])
+  assert state.version == SameOrderState(order_id="b", items=[{"x": 1}]).version
+  assert state.version != RetypedOrderState(order_id=1, items=[]).version
+
+  # values do not matter, and the version cannot drift from the schema
+  state.version = "edited"
+  state.order_id = "b"
+  assert state.version == OrderState.state_schema().fingerprint
+
+
+def test_schema_is_built_once_per_class(monkeypatch):
+  OrderState(order_id="a", items=[])
+  calls = []
+  original = state_module.get_type_hints
+
+  def counting(*args, **kwargs):
+    calls.append(args)
+    return original(*args, **kwargs)
+
+  monkeypatch.setattr(state_module, "get_type_hints", counting)
+  for i in range(10):
+    state = OrderState(order_id=str(i), items=[{"count": i}])
+    state.order_id = "changed"
+    OrderState.model_validate_json(state.model_dump_json())
+  assert OrderState.get_buffer_types() == {"order_id": LastValue[str], "items": History[Dict[str, int]]}
+  assert calls == []
+
+
+def test_compiled_validators_reject_bad_values():
+  class ListState(GraphState):
+    rows: LastValue[List[List[int]]]
+    log: History[str]
+
+  ListState(rows=[[1, 2], []], log=["a"])
+  with pytest.raises(TypeError, match="Value must be <class 'int'>"):
+    ListState(rows=[[1, "2"]], log=[])
+  with pytest.raises(TypeError, match="Value must be list"):
+    ListState(rows=[1], log=[])
+  with pytest.raises(TypeError, match="Field log must be a list"):
+    ListState(rows=[], log="a")
+  with pytest.raises(TypeError, match="Dict key must be <class 'str'>"):
+    OrderState(order_id="a", items=[{1: 1}])
+
+
+def test_fields_without_a_class_origin_are_unbuffered():
+  class OptionalState(GraphState):
+    order_id: LastValue[str]
+    note: Optional[int] = None
+    status: Literal["open", "closed"] = "open"
+
+  state = OptionalState(order_id="a")
+  assert state.note is None
+  assert OptionalState.state_schema().unbuffered == ("note", "status")
+  with pytest.raises(ValueError, match="Field note is not using a buffer type"):
+    OptionalState.get_buffer_types()
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from primeGraph.buffer.factory import History, LastValue
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.models.state import GraphState
+from primeGraph.types import ChainStatus
+
+
+class StreamState(GraphState):
+  value: LastValue[int]
+  steps: History[str]
+
+
+def build_graph(use_async: bool = False, execution_mode: str = "plan") -> Graph:
+  graph = Graph(state=StreamState(value=1, steps=[]), execution_mode=execution_mode)
+
+  if use_async:
+
+    @graph.node()
+    async def fetch(state):
+      await asyncio.sleep(0.02)
+      return {"value": state.value + 1, "steps": "fetch"}
+  else:
+
+    @graph.node()
+    def fetch(state):
+      time.sleep(0.02)
+      return {"value": state.value + 1, "steps": "fetch"}
+
+  @graph.node()
+  def left(state):
+    return {"steps": "left"}
+
+  @graph.node()
+  def right(state):
+    return {"steps": "right"}
+
+  @graph.node()
+  def finish(state):
+    return {"value": state.value * 10}
+
+  graph.add_edge(START, "fetch")
+  graph.add_edge("fetch", "left")
+  graph.add_edge("fetch", "right")
+  graph.add_edge("left", "finish")
+  graph.add_edge("right", "finish")
+  graph.add_edge("finish", END)
+  return graph.compile()
+
+
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+def test_stream_yields_one_event_per_node(execution_mode):
+  graph = build_graph(execution_mode=execution_mode)
+
+  events = list(graph.stream())
+
+  assert events[0].node == "fetch"
+  assert sorted(event.node for event in events[1:3]) == ["left", "right"]
+  assert events[-1].node == "finish"
+  assert events[0].updates == {"value": 2, "steps": "fetch"}
+  assert events[-1].updates == {"value": 20}
+  assert events[0].duration >= 0.02  # noqa: PLR2004
+  assert {event.chain_id for event in events} == {graph.chain_id}
+  assert graph.state.value == 20  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution_mode", ["plan", "dataflow"])
+async def test_astream_yields_events_while_the_chain_runs(execution_mode):
+  graph = build_graph(use_async=True, execution_mode=execution_mode)
+  ctx = graph.new_context()
+
+  seen = []
+  async for event in graph.astream(context=ctx):
+    seen.append((event.node, ctx.chain_status))
+
+  assert [node for node, _ in seen][-1] == "finish"
+  assert len(seen) == 4  # noqa: PLR2004
+  assert all(status == ChainStatus.RUNNING for _, status in seen)
+  assert ctx.state.value == 20  # noqa: PLR2004
+  assert ctx.event_sink is None
+
+
+def test_stream_reports_router_choices_and_errors():
+  graph = Graph(state=StreamState(value=1, steps=[]))
+
+  @graph.node()
+  def prepare(state):
+    return {"steps": "prepare"}
+
+  @graph.node()
+  def route(state):
+    if state.value < 0:
+      return "fail"
+    return "done"
+
+  @graph.node()
+  def done(state):
+    return {"steps": "done"}
+
+  @graph.node()
+  def fail(state):
+    raise RuntimeError("boom")
+
+  graph.add_edge(START, "prepare")
+  graph.add_router_edge("prepare", "route")
+  graph.add_edge("done", END)
+  graph.add_edge("fail", END)
+  graph.compile()
+
+  events = list(graph.stream())
+  assert [(event.node, event.route) for event in events] == [("prepare", None), ("route", "done"), ("done", None)]
+
+  graph.state.value = -1
+  with pytest.raises(RuntimeError, match="boom"):
+    list(graph.stream())
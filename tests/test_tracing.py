@@ -0,0 +1,99 @@
+import json
+import threading
+
+import pytest
+
+from primeGraph.buffer.factory import History
+from primeGraph.checkpoint.local_storage import LocalStorage
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.tracing import Tracer
+from primeGraph.models.state import GraphState
+
+
+class TraceState(GraphState):
+  steps: History[str]
+
+
+def build_graph(use_async: bool = False) -> Graph:
+  graph = Graph(state=TraceState(steps=[]), checkpoint_storage=LocalStorage())
+
+  def add_node(name: str) -> None:
+    if use_async:
+
+      async def action(state):
+        return {"steps": name}
+    else:
+
+      def action(state):
+        return {"steps": name}
+
+    graph.node(name=name)(action)
+
+  for name in ("load", "left", "right", "merge", "done", "retry"):
+    add_node(name)
+
+  @graph.node()
+  def check(state):
+    if len(state.steps) > 1:
+      return "done"
+    return "retry"
+
+  graph.add_edge(START, "load")
+  graph.add_edge("load", "left")
+  graph.add_edge("load", "right")
+  graph.add_edge("left", "merge")
+  graph.add_edge("right", "merge")
+  graph.add_router_edge("merge", "check")
+  graph.add_edge("done", END)
+  graph.add_edge("retry", END)
+  return graph.compile()
+
+
+def test_sync_chain_spans_export_as_chrome_trace(tmp_path):
+  graph = build_graph()
+  tracer = Tracer()
+  ctx = graph.new_context(tracer=tracer)
+  graph.start(context=ctx)
+
+  events = tracer.events()
+  assert {event.category for event in events} == {"node", "action", "buffers", "checkpoint", "router", "group"}
+  nodes = [event.name for event in events if event.category == "node"]
+  assert sorted(nodes) == ["check", "done", "left", "load", "merge", "right"]
+  assert [event.name for event in events if event.category == "router"] == ["check -> done"]
+  checkpoint_spans = {event.name for event in events if event.category == "checkpoint"}
+  assert checkpoint_spans == {"checkpoint", "serialize", "write"}
+  # actions run on pool threads while the scheduler joins the parallel group on the calling thread
+  assert threading.get_ident() not in {event.lane for event in events if event.category == "action"}
+  assert [event.lane for event in events if event.category == "group"] == [threading.get_ident()]
+
+  path = tmp_path / "trace.json"
+  tracer.export_chrome_trace(str(path))
+  trace = json.loads(path.read_text())["traceEvents"]
+  spans = [event for event in trace if event["ph"] == "X"]
+  assert all(event["dur"] >= 0 and event["ts"] >= 0 for event in spans)
+  assert {event["args"]["chain_id"] for event in spans if event["cat"] == "node"} == {ctx.chain_id}
+  assert any(event["ph"] == "i" and event["cat"] == "router" for event in trace)
+  assert {event["tid"] for event in trace if event["ph"] == "M"} == {event["tid"] for event in spans}
+
+
+@pytest.mark.asyncio
+async def test_async_spans_get_a_lane_per_task():
+  graph = build_graph(use_async=True)
+  tracer = Tracer()
+  await graph.start_async(context=graph.new_context(tracer=tracer))
+
+  actions = [event for event in tracer.events() if event.category == "action"]
+  assert sorted(event.name for event in actions) == ["check", "done", "left", "load", "merge", "right"]
+  # the parallel branches ran as separate tasks on the event loop thread
+  branch_lanes = {event.lane for event in actions if event.name in ("left", "right")}
+  assert len(branch_lanes) == 2  # noqa: PLR2004
+  assert "group" in {event.category for event in tracer.events()}
+
+
+def test_chains_without_a_tracer_record_nothing():
+  graph = build_graph()
+  tracer = Tracer()
+  graph.new_context(tracer=tracer)
+  graph.start()
+  assert tracer.events() == []
@@ -0,0 +1,139 @@
+import threading
+import time
+
+from primeGraph.buffer.factory import History
+from primeGraph.constants import END, START
+from primeGraph.graph.executable import Graph
+from primeGraph.graph.worker_pool import WorkerPool, get_default_worker_pool
+from primeGraph.models.state import GraphState
+
+
+class StateWithHistory(GraphState):
+  execution_order: History[str]
+
+
+def build_nested_parallel_graph(worker_pool: WorkerPool) -> Graph:
+  state = StateWithHistory(execution_order=[])
+  graph = Graph(state=state, worker_pool=worker_pool)
+
+  @graph.node()
+  def start_task(state):
+    return {"execution_order": "start_task"}
+
+  @graph.node()
+  def branch_a(state):
+    time.sleep(0.05)
+    return {"execution_order": "branch_a"}
+
+  @graph.node()
+  def branch_b(state):
+    return {"execution_order": "branch_b"}
+
+  @graph.node()
+  def nested_a(state):
+    time.sleep(0.05)
+    return {"execution_order": "nested_a"}
+
+  @graph.node()
+  def nested_b(state):
+    time.sleep(0.05)
+    return {"execution_order": "nested_b"}
+
+  @graph.node()
+  def join_nested(state):
+    return {"execution_order": "join_nested"}
+
+  @graph.node()
+  def end_task(state):
+    return {"execution_order": "end_task"}
+
+  graph.add_edge(START, "start_task")
+  graph.add_edge("start_task", "branch_a")
+  graph.add_edge("start_task", "branch_b")
+  graph.add_edge("branch_b", "nested_a")
+  graph.add_edge("branch_b", "nested_b")
+  graph.add_edge("nested_a", "join_nested")
+  graph.add_edge("nested_b", "join_nested")
+  graph.add_edge("branch_a", "end_task")
+  graph.add_edge("join_nested", "end_task")
+  graph.add_edge("end_task", END)
+  graph.compile()
+  return graph
+
+
+def test_graphs_share_default_worker_pool():
+  graph_a = Graph()
+  graph_b = Graph()
+
+  assert graph_a.worker_pool is get_default_worker_pool()
+  assert graph_b.worker_pool is graph_a.worker_pool
+
+
+def test_nested_parallel_groups_on_single_worker_pool():
+  # one task worker and one branch worker must still complete nested fan-outs
+  with WorkerPool(max_workers=1, max_branch_workers=1) as pool:
+    graph = build_nested_parallel_graph(pool)
+    graph.start()
+
+    order = graph.state.execution_order
+    assert order[0] == "start_task"
+    assert order[-1] == "end_task"
+    assert set(order) == {"start_task", "branch_a", "branch_b", "nested_a", "nested_b", "join_nested", "end_task"}
+    assert order.index("join_nested") > order.index("nested_a")
+
+
+def test_worker_pool_reuses_threads_across_runs():
+  with WorkerPool(max_workers=2) as pool:
+    graph = build_nested_parallel_graph(pool)
+    graph.start()
+    threads_after_first_run = threading.active_count()
+
+    for _ in range(5):
+      graph.start()
+
+    assert threading.active_count() <= threads_after_first_run
+
+
+def test_run_branches_runs_overflow_in_caller():
+  pool = WorkerPool(max_workers=1, max_branch_workers=1)
+  caller = threading.get_ident()
+  futures = pool.run_branches([threading.get_ident for _ in range(3)])
+
+  thread_ids = [future.result() for future in futures]
+  assert thread_ids[0] == caller
+  assert len(set(thread_ids)) <= 2  # noqa: PLR2004
+  pool.shutdown()
+
+
+def build_wide_graph(worker_pool: WorkerPool, width: int) -> Graph:
+  graph = Graph(state=StateWithHistory(execution_order=[]), worker_pool=worker_pool)
+
+  @graph.node()
+  def fan_out(state):
+    return {}
+
+  @graph.node()
+  def fan_in(state):
+    return {}
+
+  def call_api(state):
+    time.sleep(0.1)
+    return {"execution_order": "call_api"}
+
+  graph.node(name="call_api")(call_api)
+  graph.add_edge(START, "fan_out")
+  graph.add_repeating_edge("fan_out", "call_api", "fan_in", repeat=width, parallel=True)
+  graph.add_edge("fan_in", END)
+  return graph.compile()
+
+
+def test_fan_outs_wider_than_the_pool_run_at_pool_width():
+  with WorkerPool(max_workers=4, max_branch_workers=4) as pool:
+    graph = build_wide_graph(pool, 16)
+
+    start = time.perf_counter()
+    graph.start()
+
+    assert len(graph.state.execution_order) == 16  # noqa: PLR2004
+    # 4 task workers: 4 rounds of 0.1s, where running the overflow in the caller alone takes 13
+    assert time.perf_counter() - start < 0.9  # noqa: PLR2004